@@ -0,0 +1,72 @@
+"""Microbenchmark of the closest RSU lookups as the number of RSUs M grows.
+
+Run from the root of the repository:
+    python -m benchmarks.closest_rsu
+"""
+import timeit
+
+import numpy as np
+
+from utils.main import RSUIndex, get_closest_rsu
+from utils.objects import RSU, Task
+
+
+def make_rsus(size: int, rng: np.random.Generator) -> list:
+    """Creates RSUs with random coordinates."""
+    coordinates = rng.integers(0, 10 * size, size=(size, 2))
+    return [RSU(ID=i, X=x, Y=y, DTR=1) for i, (x, y) in enumerate(coordinates)]
+
+
+def benchmark(size: int, history: int = 5, number: int = 200, seed: int = 0) -> dict:
+    """Times the lookups of a task on an RSU with a history, and of a task on new coordinates.
+
+    Args:
+        size (int): number of RSUs M.
+        history (int): number of RSUs excluded from the search.
+        number (int): number of lookups timed.
+        seed (int): seed of the random coordinates.
+
+    Returns:
+        dict: time per lookup in microseconds, for each method.
+    """
+    rng = np.random.default_rng(seed)
+    rsus = make_rsus(size, rng)
+
+    build = timeit.timeit(lambda: RSUIndex(rsus), number=1)
+    index = RSUIndex(rsus)
+
+    # a task on an RSU, which has already visited `history` RSUs
+    task = Task(ID=0, LENGTH=1, FILE_SIZE=1, TYPE="COMPUTATION", X=0, Y=0)
+    task.X, task.Y = rsus[0].X, rsus[0].Y
+    exclude_list = [rsus[i] for i in range(min(history, size - 1))]
+    exclude = index.positions(exclude_list)
+
+    # a task on new coordinates, which has not visited any RSU
+    new_task = Task(ID=1, LENGTH=1, FILE_SIZE=1, TYPE="COMPUTATION", X=-1, Y=-1)
+
+    def per_lookup(statement):
+        return timeit.timeit(statement, number=number) / number * 1e6
+
+    return {
+        "M": size,
+        "build_ms": build * 1e3,
+        "list_rsu_us": per_lookup(lambda: get_closest_rsu(rsus, task, exclude_list)),
+        "index_rsu_us": per_lookup(lambda: index.closest(task, exclude)),
+        "list_first_us": per_lookup(lambda: get_closest_rsu(rsus, new_task, [])),
+        "index_first_us": per_lookup(lambda: index.closest(new_task)),
+    }
+
+
+def main(sizes=(10, 20, 50, 100, 500, 1000, 2000)):
+    columns = ["M", "build_ms", "list_rsu_us", "index_rsu_us", "list_first_us", "index_first_us"]
+    print("".join(f"{column:>16}" for column in columns))
+    for size in sizes:
+        result = benchmark(size)
+        print(
+            f"{result['M']:>16}"
+            + "".join(f"{result[column]:>16.2f}" for column in columns[1:])
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Benchmark of the loaders of the data files: the former row by row `populate_tasks`
+against the bulk loaders, on a tasks file drawn like in `datagen.ipynb`, and the parsing
+of the data files against the memory-mapped scenario format.
+
+Run from the root of the repository:
+    python -m benchmarks.loaders
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from utils.objects import (
+    TASK_DTYPES,
+    Scenario,
+    Task,
+    convert_scenario,
+    load_scenario,
+    load_tasks,
+    populate_tasks,
+    read_columns,
+)
+
+
+def write_tasks(path: str, n_tasks: int, rng: np.random.Generator):
+    """Writes a tasks file with the distributions of `datagen.ipynb`."""
+    pd.DataFrame(
+        {
+            "ID": np.arange(n_tasks),
+            "LENGTH": rng.integers(1, 100, n_tasks),
+            "FILE_SIZE": rng.integers(1, 500, n_tasks),
+            "TYPE": rng.choice(["DATA TRANSFER", "COMPUTATION"], n_tasks, p=[0.2, 0.8]),
+            "X": rng.integers(0, 100, n_tasks),
+            "Y": rng.integers(0, 100, n_tasks),
+        }
+    ).to_csv(path, index=False)
+
+
+def row_by_row(path: str) -> list:
+    """Former loader: a scalar lookup in the dataframe for each field of each row."""
+    data = pd.read_csv(path)
+    tasks = []
+    for i in range(len(data)):
+        task = Task(
+            ID=data["ID"][i],
+            LENGTH=data["LENGTH"][i],
+            FILE_SIZE=data["FILE_SIZE"][i],
+            TYPE=data["TYPE"][i],
+            X=data["X"][i],
+            Y=data["Y"][i],
+        )
+        tasks.append(task)
+
+    return tasks
+
+
+def measure(loader, path: str) -> tuple:
+    """Returns the duration in seconds and the peak memory in MiB of a loader."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = loader(path)
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return duration, peak / 2**20
+
+
+def main(n_tasks=50_000, chunksize=10_000):
+    loaders = {
+        "row by row": row_by_row,
+        "populate_tasks": lambda path: populate_tasks(pd.read_csv(path)),
+        "load_tasks": load_tasks,
+        "load_tasks chunked": lambda path: load_tasks(path, chunksize),
+        "read_columns": lambda path: read_columns(path, TASK_DTYPES),
+        "read_columns chunked": lambda path: read_columns(path, TASK_DTYPES, chunksize),
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.csv")
+        write_tasks(path, n_tasks, np.random.default_rng(0))
+
+        print(f"{n_tasks} tasks")
+        print(f"{'loader':>22}{'s':>10}{'speedup':>10}{'peak MiB':>12}")
+        baseline = None
+        for name, loader in loaders.items():
+            duration, peak = measure(loader, path)
+            baseline = baseline or duration
+            print(
+                f"{name:>22}{duration:>10.2f}{baseline / duration:>10.1f}{peak:>12.1f}"
+            )
+
+        # a scenario with the RSUs and ESs of `datagen.ipynb`
+        rsu_path = os.path.join(directory, "rsu.csv")
+        es_path = os.path.join(directory, "es.csv")
+        pd.DataFrame({"ID": range(20), "X": range(20), "Y": range(20), "DTR": 1}).to_csv(
+            rsu_path, index=False
+        )
+        pd.DataFrame({"ID": range(5), "VM_NB": 1, "VM_CP": 1}).to_csv(
+            es_path, index=False
+        )
+        scenario_path = os.path.join(directory, "scenario")
+        convert_scenario(path, rsu_path, es_path, scenario_path)
+
+        print(f"{'scenario':>22}{'s':>10}{'speedup':>10}{'peak MiB':>12}")
+        scenarios = {
+            "Scenario.from_csv": lambda path: Scenario.from_csv(path, rsu_path, es_path),
+            "load_scenario": load_scenario,
+        }
+        baseline = None
+        for name, loader in scenarios.items():
+            source = path if name == "Scenario.from_csv" else scenario_path
+            duration, peak = measure(loader, source)
+            baseline = baseline or duration
+            print(
+                f"{name:>22}{duration:>10.4f}{baseline / duration:>10.1f}{peak:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark of the migration policies: latency of the always migrate policy against
+waiting queues of growing size, on scenarios drawn like in `datagen.ipynb`.
+
+Run from the root of the repository:
+    python -m benchmarks.migration_policies
+"""
+import numpy as np
+
+from utils.objects import RSU, Task, get_random_network
+from utils.offloading import offloading_metrics, task_offloading
+from utils.policies import AlwaysMigrate, WaitIfFaster
+
+from .offloading import make_scenario
+
+
+def run(policy, scenario: tuple, seed: int, servers: str = "single") -> dict:
+    """Runs one offloading process on a fresh copy of a scenario.
+
+    Returns:
+        dict: metrics of the offloading, see `offloading_metrics`.
+    """
+    tasks, rsus, ess = scenario
+    tasks_bank = [
+        Task(ID=t.ID, LENGTH=t.LENGTH, FILE_SIZE=t.FILE_SIZE, TYPE=t.TYPE, X=t.X, Y=t.Y)
+        for t in tasks
+    ]
+    rsu_bank = [RSU(ID=r.ID, X=r.X, Y=r.Y, DTR=r.DTR) for r in rsus]
+
+    rng = np.random.default_rng(seed)
+    network = get_random_network(rsu_bank, list(ess), rng)
+    tasks_bank = task_offloading(
+        tasks_bank, network, backend="event", servers=servers, policy=policy, rng=rng
+    )
+
+    return offloading_metrics(tasks_bank, network, servers)
+
+
+def main(
+    policies=(
+        AlwaysMigrate(),
+        WaitIfFaster(1),
+        WaitIfFaster(2),
+        WaitIfFaster(4),
+        WaitIfFaster(8),
+    ),
+    n_tasks=100,
+    n_rsus=20,
+    n_ess=5,
+    seeds=range(20),
+    servers="single",
+):
+    columns = ["migration", "makespan", "queueing_delay", "mean_queueing_delay"]
+    print(f"server model: {servers}, mean over {len(seeds)} networks")
+    print(f"{'policy':>28}" + "".join(f"{column:>21}" for column in columns))
+
+    scenario = make_scenario(n_tasks, n_rsus, n_ess, np.random.default_rng(0))
+    for policy in policies:
+        results = [run(policy, scenario, seed, servers) for seed in seeds]
+        print(
+            f"{repr(policy):>28}"
+            + "".join(
+                f"{np.mean([result[column] for result in results]):>21.1f}"
+                for column in columns
+            )
+        )
+
+
+if __name__ == "__main__":
+    for servers in ("single", "multi"):
+        main(servers=servers)
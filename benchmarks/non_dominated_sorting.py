@@ -0,0 +1,113 @@
+"""Benchmark of the non-dominated sorting, against the previous pairwise implementation.
+
+Run from the root of the repository:
+    python -m benchmarks.non_dominated_sorting
+"""
+import time
+
+import numpy as np
+
+from utils.nsgaii import Individual, non_dominated_ranks, non_dominated_sorting
+
+
+def pairwise_non_dominated_sorting(population):
+    """Previous implementation of `non_dominated_sorting`, which compares every pair
+    of individuals with `Individual.dominates`, kept as the reference of the benchmark.
+    It also puts every freed individual in its own front.
+    """
+    fronts = []
+    front_1 = []
+
+    for individual in population:
+        individual.number_of_dominating_individuals = 0
+        individual.dominated_individuals = []
+
+        for other_individual in population:
+            if individual.dominates(other_individual):
+                individual.dominated_individuals.append(other_individual)
+            elif other_individual.dominates(individual):
+                individual.number_of_dominating_individuals += 1
+
+        if individual.number_of_dominating_individuals == 0:
+            front_1.append(individual)
+
+    fronts.append(front_1)
+
+    for front in fronts:
+        for individual in front:
+            for dominated_individual in individual.dominated_individuals:
+                dominated_individual.number_of_dominating_individuals -= 1
+                if dominated_individual.number_of_dominating_individuals == 0:
+                    fronts.append([dominated_individual])
+
+    for i in range(len(fronts)):
+        for individual in fronts[i]:
+            individual.rank = i + 1
+
+    return fronts
+
+
+def timed(function, *args, **kwargs) -> float:
+    """Returns the wall time of a call, in milliseconds."""
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return (time.perf_counter() - start) * 1e3
+
+
+def benchmark(size: int, n_objectives: int = 2, reference_limit: int = 2000, seed: int = 0):
+    """Times the sorting of a random population.
+
+    Args:
+        size (int): size of the population.
+        n_objectives (int): number of objectives.
+        reference_limit (int): largest population sorted with the pairwise implementation.
+        seed (int): seed of the random fitness values.
+
+    Returns:
+        dict: wall time of each implementation in milliseconds, None if it was skipped.
+    """
+    rng = np.random.default_rng(seed)
+    # integer fitness values, like the max computation and migration times, with ties
+    fitness_values = rng.integers(0, 10 * size, size=(size, n_objectives))
+    population = [
+        Individual(chromosome=[], fitness_values=tuple(values))
+        for values in fitness_values.tolist()
+    ]
+
+    sweep = None
+    if n_objectives == 2:
+        sweep = timed(non_dominated_ranks, fitness_values, method="sweep")
+        assert (
+            non_dominated_ranks(fitness_values, method="sweep")
+            == non_dominated_ranks(fitness_values, method="matrix")
+        ).all()
+
+    return {
+        "N": size,
+        "pairwise_ms": (
+            timed(pairwise_non_dominated_sorting, population)
+            if size <= reference_limit
+            else None
+        ),
+        "sorting_ms": timed(non_dominated_sorting, population),
+        "sweep_ms": sweep,
+        "matrix_ms": timed(non_dominated_ranks, fitness_values, method="matrix"),
+    }
+
+
+def main(sizes=(100, 200, 500, 1000, 2000, 5000, 10000)):
+    columns = ["N", "pairwise_ms", "sorting_ms", "sweep_ms", "matrix_ms"]
+    print("".join(f"{column:>14}" for column in columns))
+    for size in sizes:
+        result = benchmark(size)
+        print(
+            f"{result['N']:>14}"
+            + "".join(
+                f"{result[column]:>14.2f}" if result[column] is not None else f"{'-':>14}"
+                for column in columns[1:]
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
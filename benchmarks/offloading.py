@@ -0,0 +1,144 @@
+"""Benchmark of the offloading backends, with a parity check against the tick loop.
+
+The scenarios are drawn like in `datagen.ipynb`: 100 tasks, 20 RSUs and 5 ESs.
+For each seed, every backend must give the same histories, the same order of the
+tasks bank and leave the generator in the same state as the tick loop, both with the
+global generator and with an explicit `np.random.Generator`.
+
+Run from the root of the repository:
+    python -m benchmarks.offloading
+"""
+import time
+
+import numpy as np
+
+from utils.compiled import COMPILED
+from utils.objects import ES, RSU, Task, get_random_network
+from utils.offloading import task_offloading
+
+
+def make_scenario(n_tasks: int, n_rsus: int, n_ess: int, rng: np.random.Generator) -> tuple:
+    """Creates tasks, RSUs and ESs with the distributions of `datagen.ipynb`."""
+    tasks = [
+        Task(
+            ID=i,
+            LENGTH=int(rng.integers(1, 100)),
+            FILE_SIZE=int(rng.integers(1, 500)),
+            TYPE=str(rng.choice(["DATA TRANSFER", "COMPUTATION"], p=[0.2, 0.8])),
+            X=int(rng.integers(0, 100)),
+            Y=int(rng.integers(0, 100)),
+        )
+        for i in range(n_tasks)
+    ]
+    # the RSUs are spread on a grid, so that no two RSUs share coordinates
+    cells = rng.choice(100 * 100, size=n_rsus, replace=False)
+    rsus = [
+        RSU(ID=i, X=int(cell // 100), Y=int(cell % 100), DTR=int(rng.integers(1, 60)))
+        for i, cell in enumerate(cells)
+    ]
+    ess = [
+        ES(ID=i, VM_NB=int(rng.integers(1, 6)), VM_CP=int(rng.integers(1, 11)))
+        for i in range(n_ess)
+    ]
+
+    return tasks, rsus, ess
+
+
+def run(
+    backend: str,
+    scenario: tuple,
+    seed: int,
+    servers: str = "single",
+    generator: bool = False,
+) -> tuple:
+    """Runs one offloading process on a fresh copy of a scenario, drawing the ready tasks
+    from the global generator, or from an explicit generator if `generator` is True.
+
+    Returns:
+        tuple: duration in seconds, and the outcome compared between the backends.
+    """
+    tasks, rsus, ess = scenario
+    tasks_bank = [
+        Task(ID=t.ID, LENGTH=t.LENGTH, FILE_SIZE=t.FILE_SIZE, TYPE=t.TYPE, X=t.X, Y=t.Y)
+        for t in tasks
+    ]
+    rsu_bank = [RSU(ID=r.ID, X=r.X, Y=r.Y, DTR=r.DTR) for r in rsus]
+
+    np.random.seed(seed)
+    network = get_random_network(rsu_bank, list(ess))
+    rng = np.random.default_rng(seed) if generator else None
+
+    start = time.perf_counter()
+    tasks_bank = task_offloading(
+        tasks_bank, network, backend=backend, servers=servers, rng=rng
+    )
+    duration = time.perf_counter() - start
+
+    outcome = (
+        [
+            (
+                task.ID,
+                task.COMPUTATION_HISTORY,
+                task.MIGRATION_HISTORY,
+                task.START_TIME,
+                task.MIGRATIONS,
+                task.RSU.ID,
+                [rsu.ID for rsu in task.RSU_HISTORY],
+            )
+            for task in tasks_bank
+        ],
+        [(rsu.ID, rsu.STATE, rsu.END_TIME, rsu.SLOTS) for rsu in network],
+        np.random.randint(2**32, dtype=np.uint64),
+        None if rng is None else rng.integers(2**32, dtype=np.uint64),
+    )
+
+    return duration, outcome
+
+
+def main(
+    backends=("tick", "event", "vectorized", "compiled"),
+    n_tasks=100,
+    n_rsus=20,
+    n_ess=5,
+    seeds=range(5),
+    servers="single",
+    generator=False,
+):
+    print(
+        f"compiled kernels: {COMPILED}, server model: {servers}, "
+        f"generator: {'explicit' if generator else 'global'}"
+    )
+    scenario = make_scenario(n_tasks, n_rsus, n_ess, np.random.default_rng(0))
+
+    # first run of each backend, which compiles the kernels
+    for backend in backends:
+        run(backend, scenario, 0, servers, generator)
+
+    durations = {backend: [] for backend in backends}
+    parity = {backend: True for backend in backends}
+    for seed in seeds:
+        reference = None
+        for backend in backends:
+            duration, outcome = run(backend, scenario, seed, servers, generator)
+            durations[backend].append(duration)
+            if reference is None:
+                reference = outcome
+            parity[backend] &= outcome == reference
+
+    print(f"{'backend':>12}{'ms':>12}{'speedup':>12}{'parity':>12}")
+    baseline = np.median(durations[backends[0]])
+    for backend in backends:
+        duration = np.median(durations[backend])
+        print(
+            f"{backend:>12}{duration * 1e3:>12.2f}"
+            f"{baseline / duration:>12.1f}{str(parity[backend]):>12}"
+        )
+
+    if not all(parity.values()):
+        raise SystemExit("the backends do not give the same results")
+
+
+if __name__ == "__main__":
+    for servers in ("single", "multi"):
+        for generator in (False, True):
+            main(servers=servers, generator=generator)
@@ -0,0 +1,75 @@
+"""Benchmark of the online offloading: throughput and peak memory when the tasks of a
+large trace are streamed from a CSV file, see `stream_tasks`.
+
+The trace is drawn like in `datagen.ipynb`, with a few tasks arriving at each time unit.
+
+Run from the root of the repository:
+    python -m benchmarks.online
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from utils.objects import get_random_network, stream_tasks
+from utils.offloading import online_offloading
+
+from .offloading import make_scenario
+
+
+def write_trace(path: str, n_tasks: int, rate: float, rng: np.random.Generator):
+    """Writes a trace of tasks with their arrival times to a CSV file.
+
+    Args:
+        path (str): path of the CSV file.
+        n_tasks (int): number of tasks.
+        rate (float): mean number of tasks arriving per time unit.
+        rng (np.random.Generator): generator of the trace.
+    """
+    data = pd.DataFrame(
+        {
+            "ID": np.arange(n_tasks),
+            "LENGTH": rng.integers(1, 100, n_tasks),
+            "FILE_SIZE": rng.integers(1, 500, n_tasks),
+            "TYPE": rng.choice(["DATA TRANSFER", "COMPUTATION"], n_tasks, p=[0.2, 0.8]),
+            "X": rng.integers(0, 100, n_tasks),
+            "Y": rng.integers(0, 100, n_tasks),
+            # poisson arrivals
+            "ARRIVAL": np.cumsum(rng.exponential(1 / rate, n_tasks)).astype(int),
+        }
+    )
+    data.to_csv(path, index=False)
+
+
+def main(n_tasks=20_000, rate=0.05, n_rsus=20, n_ess=5, servers="multi", policy="queue"):
+    rng = np.random.default_rng(0)
+    _, rsus, ess = make_scenario(0, n_rsus, n_ess, rng)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "trace.csv")
+        write_trace(path, n_tasks, rate, rng)
+
+        np.random.seed(0)
+        network = get_random_network(rsus, list(ess))
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        n_records = 0
+        delay = 0
+        for record in online_offloading(stream_tasks(path), network, servers, policy):
+            n_records += 1
+            delay += record["START_TIME"] - record["ARRIVAL"]
+        duration = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"server model: {servers}, migration policy: {policy}")
+    print(f"{n_records} tasks in {duration:.2f} s, {n_records / duration:.0f} tasks/s")
+    print(f"mean delay: {delay / n_records:.1f}, peak memory: {peak / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""Benchmark suite of the hot paths of the simulation and of the optimizer, on a grid of
+scenario sizes with fixed seeds, saved as JSON to compare commits.
+
+Each benchmark reports its wall time (the best of a few repeats, and their median), its
+peak memory traced by `tracemalloc` (in a separate run, tracing slows the code down), and
+for the offloading the simulated ticks per second.
+
+Run from the root of the repository:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --output new.json --compare results.json
+"""
+import argparse
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from utils.compiled import COMPILED
+from utils.generator import generate
+from utils.instrumentation import Instrumentation
+from utils.main import get_closest_rsu
+from utils.nsgaii import (
+    Individual,
+    chromosome_to_network,
+    crowding_distance,
+    non_dominated_sorting,
+    nsga2,
+    random_chromosome,
+)
+from utils.offloading import simulated_ticks, task_offloading
+
+# scenario sizes, as numbers of tasks, RSUs and ESs
+GRID = {"tasks": (100, 1000, 5000), "rsus": (20, 100), "ess": (5,)}
+
+# offloading backends, the compiled one only with numba (its fallback is the slowest),
+# and the tick loop being skipped above `TICK_LIMIT` tasks
+BACKENDS = ("tick", "event", "vectorized") + (("compiled",) if COMPILED else ())
+TICK_LIMIT = 1000
+
+# settings of the nsga2 generation, which runs on the fastest backend without numba
+POPULATION_SIZE = 20
+GENERATION_BACKEND = "compiled" if COMPILED else "event"
+TOURNAMENT_SIZE = 4
+CROSSOVER_PROBABILITY = 0.9
+MUTATION_PROBABILITY = 0.1
+
+
+def measure(function, repeat: int) -> dict:
+    """Times a function, then runs it once more to trace its peak memory.
+
+    Args:
+        function (function): benchmark without arguments, which returns a dict of
+            measures, or None. A "wall_time" measure replaces the time of the call.
+        repeat (int): number of timed runs.
+
+    Returns:
+        dict: best and median wall time in seconds, peak memory in MiB, and the
+            measures of the last timed run.
+    """
+    wall_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        measures = function() or {}
+        wall_times.append(measures.pop("wall_time", time.perf_counter() - start))
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "wall_time": min(wall_times),
+        "wall_time_median": statistics.median(wall_times),
+        "peak_mib": peak / 2**20,
+        **measures,
+    }
+
+
+def offloading_benchmark(scenario, chromosome, backend: str, seed: int):
+    """Returns a benchmark of one offloading process on the network of a chromosome."""
+
+    def run():
+        tasks_bank = scenario.new_tasks()
+        network = chromosome_to_network(chromosome, scenario)
+        rng = np.random.default_rng(seed)
+        start = time.perf_counter()
+        tasks_bank = task_offloading(tasks_bank, network, backend=backend, rng=rng)
+        wall_time = time.perf_counter() - start
+        ticks = simulated_ticks(tasks_bank)
+
+        return {
+            "wall_time": wall_time,
+            "ticks": ticks,
+            "ticks_per_second": ticks / wall_time if wall_time else None,
+        }
+
+    return run
+
+
+def closest_rsu_benchmark(scenario, chromosome):
+    """Returns a benchmark of the lookup of the closest RSU to every task."""
+    tasks_bank = scenario.new_tasks()
+    network = chromosome_to_network(chromosome, scenario)
+
+    def run():
+        for task in tasks_bank:
+            get_closest_rsu(network, task, [])
+
+        return {"calls": len(tasks_bank)}
+
+    return run
+
+
+def chromosome_benchmark(scenario, chromosomes):
+    """Returns a benchmark of the conversion of chromosomes to networks."""
+
+    def run():
+        for chromosome in chromosomes:
+            chromosome_to_network(chromosome, scenario)
+
+        return {"calls": len(chromosomes)}
+
+    return run
+
+
+def sorting_benchmarks(size: int, seed: int, number: int = 100) -> tuple:
+    """Returns benchmarks of the non-dominated sorting and of the crowding distance
+    of a population with random integer fitness values, like the max times,
+    each called `number` times to be long enough to time.
+    """
+    rng = np.random.default_rng(seed)
+    population = [
+        Individual(chromosome=None, fitness_values=tuple(values))
+        for values in rng.integers(0, 10 * size, size=(size, 2)).tolist()
+    ]
+    fronts = non_dominated_sorting(population)
+
+    def sorting():
+        for _ in range(number):
+            non_dominated_sorting(population)
+
+        return {"calls": number}
+
+    def crowding():
+        for _ in range(number):
+            crowding_distance(fronts)
+
+        return {"calls": number}
+
+    return sorting, crowding
+
+
+class GenerationRecorder(Instrumentation):
+    """Keeps the measures of the generations of `nsga2`."""
+
+    def __init__(self):
+        self.records = []
+
+    def on_generation(self, record: dict):
+        self.records.append(record)
+
+
+def generation_benchmark(scenario, backend: str, seed: int):
+    """Returns a benchmark of one generation of `nsga2`, after the initial population."""
+
+    def run():
+        recorder = GenerationRecorder()
+        nsga2(
+            POPULATION_SIZE,
+            1,
+            TOURNAMENT_SIZE,
+            CROSSOVER_PROBABILITY,
+            MUTATION_PROBABILITY,
+            scenario,
+            seed=seed,
+            backend=backend,
+            instrumentation=recorder,
+            progress=False,
+        )
+        record = recorder.records[-1]
+
+        return {
+            "wall_time": record["total"],
+            "evaluations": record["evaluations"],
+            "ticks": record["ticks"],
+            "ticks_per_second": record["ticks_per_second"],
+        }
+
+    return run
+
+
+def benchmark_case(
+    n_tasks: int, n_rsus: int, n_ess: int, seed: int, backends, repeat: int
+) -> list:
+    """Runs every benchmark on one scenario.
+
+    Returns:
+        list: one dict per benchmark, with its name, backend, scenario size and measures.
+    """
+    scenario = generate(n_tasks, n_rsus, n_ess, seed=seed)
+    rng = np.random.default_rng(seed)
+    chromosomes = [random_chromosome(scenario, rng) for _ in range(POPULATION_SIZE)]
+
+    benchmarks = []
+    for backend in backends:
+        if backend == "tick" and n_tasks > TICK_LIMIT:
+            continue
+        benchmarks.append(
+            (
+                "task_offloading",
+                backend,
+                offloading_benchmark(scenario, chromosomes[0], backend, seed),
+            )
+        )
+    benchmarks.append(
+        ("get_closest_rsu", None, closest_rsu_benchmark(scenario, chromosomes[0]))
+    )
+    benchmarks.append(
+        ("chromosome_to_network", None, chromosome_benchmark(scenario, chromosomes))
+    )
+    sorting, crowding = sorting_benchmarks(2 * POPULATION_SIZE, seed)
+    benchmarks.append(("non_dominated_sorting", None, sorting))
+    benchmarks.append(("crowding_distance", None, crowding))
+    benchmarks.append(
+        (
+            "nsga2_generation",
+            GENERATION_BACKEND,
+            generation_benchmark(scenario, GENERATION_BACKEND, seed),
+        )
+    )
+
+    results = []
+    for name, backend, function in benchmarks:
+        results.append(
+            {
+                "benchmark": name,
+                "backend": backend,
+                "tasks": n_tasks,
+                "rsus": n_rsus,
+                "ess": n_ess,
+                "seed": seed,
+                **measure(function, repeat),
+            }
+        )
+
+    return results
+
+
+def commit() -> str:
+    """Returns the commit of the working tree, None outside of a git repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def key(result: dict) -> tuple:
+    """Returns what identifies a result between two runs of the suite."""
+    return (
+        result["benchmark"],
+        result["backend"],
+        result["tasks"],
+        result["rsus"],
+        result["ess"],
+        result["seed"],
+    )
+
+
+def compare(results: dict, baseline: dict, threshold: float = 1.25):
+    """Prints the ratio of the wall times of two runs of the suite, flagging the
+    benchmarks which got slower than the threshold.
+    """
+    previous = {key(result): result for result in baseline["results"]}
+    print(f"\ncompared with {baseline['meta']['commit']}")
+    print(
+        f"{'benchmark':>24}{'backend':>12}{'size':>18}"
+        f"{'before s':>12}{'after s':>12}{'ratio':>8}"
+    )
+    for result in results["results"]:
+        before = previous.get(key(result))
+        if before is None:
+            continue
+        ratio = result["wall_time"] / before["wall_time"]
+        size = f"{result['tasks']}x{result['rsus']}x{result['ess']}"
+        flag = "  slower" if ratio > threshold else ""
+        print(
+            f"{result['benchmark']:>24}{str(result['backend']):>12}{size:>18}"
+            f"{before['wall_time']:>12.5f}{result['wall_time']:>12.5f}{ratio:>8.2f}{flag}"
+        )
+
+
+def main(grid=GRID, seeds=(0,), backends=BACKENDS, repeat=3, output=None, baseline=None):
+    results = {
+        "meta": {
+            "commit": commit(),
+            "date": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "compiled": COMPILED,
+            "backends": list(backends),
+            "grid": {name: list(sizes) for name, sizes in grid.items()},
+            "seeds": list(seeds),
+            "repeat": repeat,
+        },
+        "results": [],
+    }
+
+    print(
+        f"{'benchmark':>24}{'backend':>12}{'size':>18}"
+        f"{'s':>12}{'peak MiB':>10}{'ticks/s':>12}"
+    )
+    for n_tasks, n_rsus, n_ess, seed in itertools.product(
+        grid["tasks"], grid["rsus"], grid["ess"], seeds
+    ):
+        for result in benchmark_case(n_tasks, n_rsus, n_ess, seed, backends, repeat):
+            results["results"].append(result)
+            ticks_per_second = result.get("ticks_per_second")
+            print(
+                f"{result['benchmark']:>24}{str(result['backend']):>12}"
+                f"{f'{n_tasks}x{n_rsus}x{n_ess}':>18}{result['wall_time']:>12.5f}"
+                f"{result['peak_mib']:>10.2f}"
+                + (f"{ticks_per_second:>12.0f}" if ticks_per_second else f"{'-':>12}")
+            )
+
+    if output is not None:
+        with open(output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if baseline is not None:
+        with open(baseline) as file:
+            compare(results, json.load(file))
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="path of the JSON results")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    parser.add_argument("--tasks", type=int, nargs="+", default=GRID["tasks"])
+    parser.add_argument("--rsus", type=int, nargs="+", default=GRID["rsus"])
+    parser.add_argument("--ess", type=int, nargs="+", default=GRID["ess"])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=BACKENDS,
+        choices=("tick", "event", "vectorized", "compiled"),
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+
+    main(
+        grid={"tasks": arguments.tasks, "rsus": arguments.rsus, "ess": arguments.ess},
+        seeds=arguments.seeds,
+        backends=arguments.backends,
+        repeat=arguments.repeat,
+        output=arguments.output,
+        baseline=arguments.compare,
+    )
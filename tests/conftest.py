@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+# the tests import the `utils` package from the root of the repository
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.generator import generate  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def scenario():
+    """Small scenario with the distributions of `datagen.ipynb`."""
+    return generate(60, 12, 4, seed=0)
@@ -0,0 +1,119 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from utils.nsgaii import Individual, ParetoArchive, hypervolume
+
+OBJECTIVES = ("computation", "migration", "makespan", "throughput")
+
+
+def random_fitness(n: int, n_objectives: int, seed: int) -> np.ndarray:
+    """Integer fitness values, so that some solutions tie on some objectives."""
+    return np.random.default_rng(seed).integers(0, 8, (n, n_objectives)).astype(float)
+
+
+def brute_force_front(fitness_values: np.ndarray) -> set:
+    """Distinct fitness values which no other solution dominates."""
+    population = [Individual(fitness_values=tuple(values)) for values in fitness_values]
+
+    return {
+        tuple(individual.fitness)
+        for individual in population
+        if not any(other.dominates(individual) for other in population)
+    }
+
+
+def brute_force_hypervolume(fitness_values: np.ndarray, reference: np.ndarray) -> float:
+    """Counts the unit cells of the integer grid dominated by one of the solutions."""
+    return float(
+        sum(
+            any((values <= cell).all() for values in fitness_values)
+            for cell in itertools.product(*(range(int(bound)) for bound in reference))
+        )
+    )
+
+
+def archive_of(fitness_values: np.ndarray, maxsize: int = 1000) -> ParetoArchive:
+    archive = ParetoArchive(OBJECTIVES[: fitness_values.shape[1]], maxsize)
+    archive.update(
+        [Individual(fitness_values=tuple(values)) for values in fitness_values]
+    )
+
+    return archive
+
+
+@pytest.mark.parametrize("n_objectives", [2, 3, 4])
+@pytest.mark.parametrize("seed", range(5))
+def test_archive_is_front(n_objectives, seed):
+    fitness_values = random_fitness(40, n_objectives, seed)
+    archive = archive_of(fitness_values)
+    archived = [tuple(individual.fitness) for individual in archive.individuals]
+
+    assert len(archived) == len(set(archived))
+    assert set(archived) == brute_force_front(fitness_values)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sorted_archive_order(seed):
+    archive = archive_of(random_fitness(40, 2, seed))
+    values = archive.fitness_values()
+
+    assert (np.diff(values[:, 0]) > 0).all() and (np.diff(values[:, 1]) < 0).all()
+
+
+@pytest.mark.parametrize("n_objectives", [1, 2, 3])
+@pytest.mark.parametrize("seed", range(5))
+def test_hypervolume(n_objectives, seed):
+    fitness_values = random_fitness(12, n_objectives, seed)
+    reference = np.full(n_objectives, 7.0)
+
+    assert hypervolume(fitness_values, reference) == brute_force_hypervolume(
+        fitness_values, reference
+    )
+
+
+@pytest.mark.parametrize("n_objectives", [2, 3])
+def test_archive_hypervolume(n_objectives):
+    fitness_values = random_fitness(40, n_objectives, 0)
+    reference = np.full(n_objectives, 7.0)
+
+    assert archive_of(fitness_values).hypervolume(reference) == brute_force_hypervolume(
+        fitness_values, reference
+    )
+
+
+def test_maximized_objective():
+    archive = ParetoArchive(("computation", ("throughput", "max")))
+    archive.update(
+        [
+            Individual(fitness_values=(1.0, 1.0)),
+            Individual(fitness_values=(1.0, 2.0)),
+            Individual(fitness_values=(0.0, 0.0)),
+        ]
+    )
+
+    assert {tuple(individual.fitness) for individual in archive.individuals} == {
+        (1.0, 2.0),
+        (0.0, 0.0),
+    }
+
+
+@pytest.mark.parametrize("n_objectives", [2, 3])
+def test_bounded_archive_keeps_extremes(n_objectives):
+    fitness_values = np.random.default_rng(1).random((200, n_objectives))
+    front = np.array(sorted(brute_force_front(fitness_values)))
+    archive = archive_of(fitness_values, maxsize=2 * n_objectives)
+    archived = archive.fitness_values()
+
+    # a removed solution no longer rejects the solutions it dominates, so the archive is
+    # not a subset of the front, but its solutions do not dominate each other
+    assert len(archive) == 2 * n_objectives
+    assert brute_force_front(archived) == set(map(tuple, archived))
+    np.testing.assert_array_equal(archived.min(axis=0), front.min(axis=0))
+
+
+@pytest.mark.parametrize("objectives, maxsize", [(OBJECTIVES[:2], 2), (OBJECTIVES, 7)])
+def test_archive_too_small(objectives, maxsize):
+    with pytest.raises(ValueError):
+        ParetoArchive(objectives, maxsize)
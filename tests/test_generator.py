@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from utils.generator import generate, generate_scenario, generate_tasks, road_corridors
+from utils.objects import TASK_FIELDS, Scenario, load_scenario
+
+# tasks, RSUs and ESs of the generated scenarios
+SIZES = (250, 15, 5)
+
+
+def load(path: str, fmt: str) -> Scenario:
+    if fmt == "npy":
+        return load_scenario(path)
+    return Scenario.from_csv(f"{path}/tasks.csv", f"{path}/rsu.csv", f"{path}/es.csv")
+
+
+def streams(seed) -> list:
+    """Generators of the roads, RSUs, ESs and tasks, like `generate_scenario`."""
+    return [
+        np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(4)
+    ]
+
+
+@pytest.mark.parametrize("fmt", ["npy", "csv"])
+@pytest.mark.parametrize("distribution", ["uniform", "corridors"])
+def test_generate_scenario_is_generate(tmp_path, fmt, distribution):
+    generate_scenario(str(tmp_path), *SIZES, seed=3, distribution=distribution, fmt=fmt)
+
+    assert (
+        load(str(tmp_path), fmt).fingerprint()
+        == generate(*SIZES, seed=3, distribution=distribution).fingerprint()
+    )
+
+
+@pytest.mark.parametrize("fmt", ["npy", "csv"])
+@pytest.mark.parametrize("chunksize", [1, 64, 249])
+def test_chunked_scenario(tmp_path, fmt, chunksize):
+    generate_scenario(
+        str(tmp_path),
+        *SIZES,
+        seed=3,
+        distribution="corridors",
+        chunksize=chunksize,
+        fmt=fmt,
+    )
+    loaded = load(str(tmp_path), fmt)
+    reference = generate(*SIZES, seed=3, distribution="corridors")
+
+    # the RSUs and ESs do not depend on the chunks, and the tasks are the chunks drawn
+    # one after the other from the tasks stream of the seed
+    roads_rng, _, _, tasks_rng = streams(3)
+    roads = road_corridors(8, 100, 1, roads_rng)
+    chunks = list(
+        generate_tasks(SIZES[0], tasks_rng, 100, "corridors", roads, 1, 2.0, chunksize)
+    )
+    assert len(chunks) == -(-SIZES[0] // chunksize)
+    for field in TASK_FIELDS:
+        expected = np.concatenate([chunk[field] for chunk in chunks])
+        assert loaded.tasks[field].tolist() == expected.tolist()
+    assert Scenario(loaded.tasks, reference.rsus, reference.ess).fingerprint() == (
+        loaded.fingerprint()
+    )
+
+
+def test_empty_scenario(tmp_path):
+    for fmt in ("npy", "csv"):
+        generate_scenario(str(tmp_path / fmt), 0, 4, 2, seed=0, fmt=fmt)
+        assert load(str(tmp_path / fmt), fmt).n_tasks == 0
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from utils.main import RSUIndex, get_closest_rsu
+from utils.objects import RSU, Task
+
+# RSUs at distance 5 of the origin, more of them than the neighbours queried from the tree
+CIRCLE = [(5, 0), (0, 5), (-5, 0), (0, -5)] + [
+    (x * a, y * b) for x, y in ((3, 4), (4, 3)) for a in (1, -1) for b in (1, -1)
+]
+
+
+def network_of(coordinates) -> list:
+    return [RSU(ID=i, X=x, Y=y, DTR=1) for i, (x, y) in enumerate(coordinates)]
+
+
+def point(x, y) -> Task:
+    return Task(ID=0, LENGTH=1, FILE_SIZE=1, TYPE="COMPUTATION", X=x, Y=y)
+
+
+def check(index: RSUIndex, network: list, x, y, exclude: set):
+    """The index finds the same RSU as the brute force search of `get_closest_rsu`."""
+    excluded = [network[j] for j in exclude]
+
+    assert index.closest(point(x, y), exclude) is get_closest_rsu(
+        network, point(x, y), excluded
+    )
+
+
+@pytest.mark.parametrize("tree", [True, False], ids=["tree", "brute"])
+@pytest.mark.parametrize("seed", range(5))
+def test_index_is_brute_force(seed, tree):
+    rng = np.random.default_rng(seed)
+    # a small grid, so that many RSUs share coordinates or distances
+    network = network_of(rng.integers(0, 5, (15, 2)).tolist())
+    index = RSUIndex(network)
+    if not tree:
+        index.tree = None
+
+    for _ in range(200):
+        exclude = set(np.flatnonzero(rng.random(len(network)) < 0.3).tolist())
+        if rng.random() < 0.5:
+            exclude = set()
+        kind = rng.integers(3)
+        if kind == 0:
+            # on an RSU, like the tasks after their first hop
+            rsu = network[rng.integers(len(network))]
+            x, y = rsu.X, rsu.Y
+        elif kind == 1:
+            x, y = rng.integers(-1, 6, 2).tolist()
+        else:
+            x, y = rng.uniform(-1, 6, 2).tolist()
+        check(index, network, x, y, exclude)
+
+
+@pytest.mark.parametrize("tree", [True, False], ids=["tree", "brute"])
+def test_index_many_ties(tree):
+    network = network_of(CIRCLE + [(9, 9)])
+    index = RSUIndex(network)
+    if not tree:
+        index.tree = None
+
+    assert len(CIRCLE) > RSUIndex.KD_TREE_NEIGHBOURS
+    check(index, network, 0, 0, set())
+    check(index, network, 0, 0, {0, 1, 2})
+    check(index, network, 0.1, 0, set())
+
+
+def test_index_everything_excluded():
+    network = network_of([(0, 0), (1, 1), (1, 1)])
+    index = RSUIndex(network)
+
+    assert index.closest(point(0, 0), {0, 1, 2}) is None
+    assert index.closest(point(1, 1), {1}) is network[2]
+    # the RSUs sharing coordinates are sorted by their order in the network
+    assert index.neighbours[1].tolist() == [1, 2, 0]
@@ -0,0 +1,115 @@
+import math
+
+import numpy as np
+import pytest
+
+from utils.metrics import METRICS, OffloadingStats, QuantileSketch
+from utils.nsgaii import chromosome_to_network, random_chromosome
+from utils.offloading import offloading_metrics, task_offloading
+
+QUANTILES = (0.0, 0.01, 0.25, 0.5, 0.75, 0.95, 0.99, 1.0)
+
+
+@pytest.mark.parametrize("relative_accuracy", [0.1, 0.01, 0.001])
+@pytest.mark.parametrize("distribution", ["lognormal", "integers"])
+def test_sketch_relative_error(relative_accuracy, distribution):
+    rng = np.random.default_rng(0)
+    if distribution == "lognormal":
+        values = rng.lognormal(0, 3, 10_000)
+    else:
+        values = rng.integers(0, 1000, 10_000).astype(float)
+
+    sketch = QuantileSketch(relative_accuracy)
+    for value in values:
+        sketch.add(value)
+
+    ordered = np.sort(values)
+    for q in QUANTILES:
+        # the sketch estimates the value of rank q * (count - 1), rounded down
+        exact = ordered[math.floor(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=relative_accuracy, abs=0)
+
+
+def test_sketch_bounds():
+    sketch = QuantileSketch()
+    assert len(sketch) == 0
+    assert sketch.quantile(0.5) == 0.0
+
+    for value in (0, 0, 3, 7):
+        sketch.add(value)
+
+    assert len(sketch) == 4
+    assert sketch.quantile(0.0) == 0.0
+    assert sketch.quantile(1.0) == 7
+
+    with pytest.raises(ValueError):
+        sketch.add(-1)
+
+
+def test_sketch_memory():
+    sketch = QuantileSketch(0.01)
+    for value in range(1, 100_000):
+        sketch.add(value)
+
+    # the buckets only grow with the logarithm of the largest value
+    assert len(sketch._buckets) < math.log(100_000) / math.log(1.01 / 0.99) + 1
+
+
+@pytest.mark.parametrize("servers", ["single", "multi"])
+def test_offloading_metrics(scenario, servers):
+    network = chromosome_to_network(
+        random_chromosome(scenario, np.random.default_rng(0)), scenario
+    )
+    tasks_bank = task_offloading(
+        scenario.new_tasks(), network, servers=servers, rng=np.random.default_rng(0)
+    )
+    metrics = offloading_metrics(tasks_bank, network, servers)
+
+    assert set(metrics) == set(METRICS)
+    assert metrics["computation"] == max(t.COMPUTATION_HISTORY for t in tasks_bank)
+    assert metrics["migration"] == max(t.MIGRATION_HISTORY for t in tasks_bank)
+    assert metrics["makespan"] == max(
+        t.START_TIME + t.COMPUTATION_HISTORY for t in tasks_bank
+    )
+    # the file sizes are in megabytes, and each migration moves the whole file
+    assert metrics["megabytes_migrated"] == sum(
+        t.FILE_SIZE * t.MIGRATIONS for t in tasks_bank
+    )
+
+    latencies = np.sort([t.START_TIME + t.COMPUTATION_HISTORY for t in tasks_bank])
+    for q in (0.50, 0.95, 0.99):
+        exact = latencies[math.floor(q * (len(latencies) - 1))]
+        assert metrics[f"p{round(q * 100)}_latency"] == pytest.approx(exact, rel=0.01)
+    assert 0 < metrics["mean_utilisation"] <= metrics["max_utilisation"] <= 1
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+@pytest.mark.parametrize(
+    "backend, policy",
+    [
+        ("tick", "migrate"),
+        ("tick", "queue"),
+        ("event", "migrate"),
+        ("event", "queue"),
+        ("vectorized", "migrate"),
+        ("compiled", "migrate"),
+    ],
+)
+@pytest.mark.parametrize("servers", ["single", "multi"])
+def test_streaming_metrics(scenario, backend, policy, servers):
+    network = chromosome_to_network(
+        random_chromosome(scenario, np.random.default_rng(0)), scenario
+    )
+    stats = OffloadingStats(network, servers)
+    tasks_bank = task_offloading(
+        scenario.new_tasks(),
+        network,
+        backend,
+        servers,
+        policy,
+        rng=np.random.default_rng(0),
+        stats=stats,
+    )
+
+    assert stats.n_tasks == len(tasks_bank)
+    assert stats.metrics() == offloading_metrics(tasks_bank, network, servers)
@@ -0,0 +1,69 @@
+import json
+import os
+import re
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+from utils.generator import generate_scenario
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+# the experiments of the notebooks are shrunk to a population of a few generations
+PARAMETERS = {"POPULATION_SIZE": 6, "MAX_GENERATIONS": 1}
+
+
+def code_cells(notebook: str) -> list:
+    """Returns the code cells of a notebook, with smaller experiments, see `PARAMETERS`."""
+    with open(os.path.join(ROOT, notebook)) as file:
+        cells = json.load(file)["cells"]
+
+    sources = []
+    for i, cell in enumerate(cells):
+        if cell["cell_type"] != "code":
+            continue
+        source = "".join(cell["source"])
+        for name, value in PARAMETERS.items():
+            source = re.sub(rf"^{name} = \d+$", f"{name} = {value}", source, flags=re.M)
+        sources.append((i, source))
+
+    return sources
+
+
+def run_notebook(notebook: str):
+    """Runs the code cells of a notebook in order, in the current directory."""
+    namespace = {}
+    np.random.seed(0)
+    try:
+        for i, source in code_cells(notebook):
+            exec(compile(source, f"{notebook}, cell {i}", "exec"), namespace)
+    finally:
+        plt.close("all")
+
+
+@pytest.fixture
+def data(tmp_path, monkeypatch):
+    """Runs the test in a directory holding the data files of `datagen.ipynb`."""
+    monkeypatch.chdir(tmp_path)
+    generate_scenario("data", 60, 12, 4, seed=0, fmt="csv")
+
+    return tmp_path
+
+
+def test_datagen(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.mkdir("data")
+    run_notebook("datagen.ipynb")
+
+    assert sorted(os.listdir("data")) == ["es.csv", "rsu.csv", "tasks.csv"]
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+@pytest.mark.parametrize(
+    "notebook", ["offloading.ipynb", "nsgaii.ipynb", "plots.ipynb"]
+)
+def test_notebook(data, notebook):
+    run_notebook(notebook)
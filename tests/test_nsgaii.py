@@ -0,0 +1,185 @@
+import numpy as np
+import pytest
+
+from utils.nsgaii import (
+    FitnessCache,
+    evaluate_chromosomes,
+    evaluation_pool,
+    load_checkpoint,
+    nsga2,
+    save_checkpoint,
+    objective_key,
+    random_chromosome,
+)
+
+# population size, generations, tournament size, crossover and mutation probabilities
+SETTINGS = (10, 3, 2, 0.9, 0.3)
+
+
+def front(population: list) -> list:
+    """Returns what two identical runs must share of their final population."""
+    return [
+        (
+            tuple(float(value) for value in individual.fitness),
+            individual.chromosome.tobytes(),
+            individual.rank,
+            individual.crowding_distance,
+        )
+        for individual in population
+    ]
+
+
+def run(scenario, **kwargs) -> list:
+    return nsga2(*SETTINGS, scenario, backend="event", progress=False, **kwargs)
+
+
+@pytest.fixture(scope="module")
+def reference(scenario):
+    return front(run(scenario, rng=np.random.default_rng(7)))
+
+
+def test_seed_is_generator(scenario, reference):
+    assert front(run(scenario, seed=7)) == reference
+
+
+def test_serial_is_pool(scenario, reference):
+    population = run(scenario, rng=np.random.default_rng(7), n_jobs=2, chunksize=2)
+
+    assert front(population) == reference
+
+
+def test_cache_keeps_front(scenario, reference):
+    cache = FitnessCache()
+
+    assert front(run(scenario, seed=7, cache=cache)) == reference
+    assert front(run(scenario, seed=7, cache=cache)) == reference
+    assert cache.hit_rate > 0
+
+
+def test_cache_keys_callable_objectives(scenario):
+    cache = FitnessCache()
+    first = run(
+        scenario,
+        seed=1,
+        cache=cache,
+        objectives=(lambda m: m["computation"], "migration"),
+    )
+    second = run(
+        scenario, seed=1, cache=cache, objectives=(lambda m: -1000.0, "migration")
+    )
+
+    assert {individual.fitness[0] for individual in first} != {-1000.0}
+    assert {individual.fitness[0] for individual in second} == {-1000.0}
+
+
+def test_objective_key():
+    def weighted(weight):
+        return lambda metrics: weight * metrics["computation"]
+
+    assert objective_key("migration") == "migration"
+    assert objective_key(weighted(2)) == objective_key(weighted(2))
+    assert objective_key(weighted(2)) != objective_key(weighted(3))
+    assert objective_key(lambda m: m["computation"]) != objective_key(
+        lambda m: m["migration"]
+    )
+
+
+def test_cache_refuses_callable_objects(scenario):
+    class Objective:
+        def __call__(self, metrics):
+            return metrics["computation"]
+
+    with pytest.raises(ValueError):
+        run(
+            scenario,
+            seed=1,
+            cache=FitnessCache(),
+            objectives=(Objective(), "migration"),
+        )
+
+
+def test_global_state_untouched(scenario):
+    np.random.seed(123)
+    state = np.random.get_state()
+    run(scenario, rng=np.random.default_rng(7))
+    after = np.random.get_state()
+
+    assert np.array_equal(after[1], state[1]) and after[2:] == state[2:]
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_checkpoint_resume(scenario, reference, tmp_path, n_jobs):
+    checkpoint = str(tmp_path / "run.ckpt")
+    population_size, generations, *operators = SETTINGS
+    nsga2(
+        population_size,
+        generations - 1,
+        *operators,
+        scenario,
+        seed=7,
+        backend="event",
+        checkpoint=checkpoint,
+        progress=False,
+    )
+    assert load_checkpoint(checkpoint)["generation"] == generations - 1
+
+    population = run(
+        scenario, seed=7, checkpoint=checkpoint, resume=True, n_jobs=n_jobs
+    )
+
+    assert front(population) == reference
+    assert load_checkpoint(checkpoint)["generation"] == generations
+
+
+def test_checkpoint_keeps_array_states(tmp_path):
+    generator = np.random.Generator(np.random.MT19937(3))
+    save_checkpoint(
+        str(tmp_path / "run.ckpt"), {"generator_state": generator.bit_generator.state}
+    )
+    restored = np.random.Generator(np.random.MT19937())
+    restored.bit_generator.state = load_checkpoint(str(tmp_path / "run.ckpt"))[
+        "generator_state"
+    ]
+
+    assert np.array_equal(
+        restored.integers(2**32, size=8), generator.integers(2**32, size=8)
+    )
+
+
+def test_checkpoint_resume_mt19937(scenario, tmp_path):
+    def generator():
+        return np.random.Generator(np.random.MT19937(7))
+
+    checkpoint = str(tmp_path / "run.ckpt")
+    population_size, generations, *operators = SETTINGS
+    nsga2(
+        population_size,
+        generations - 1,
+        *operators,
+        scenario,
+        backend="event",
+        checkpoint=checkpoint,
+        progress=False,
+        rng=generator(),
+    )
+    population = run(scenario, checkpoint=checkpoint, resume=True, rng=generator())
+
+    assert front(population) == front(run(scenario, rng=generator()))
+
+
+def test_spawned_seeds(scenario):
+    chromosomes = [
+        random_chromosome(scenario, np.random.default_rng(i)) for i in range(6)
+    ]
+    seeds = np.random.SeedSequence(5).spawn(len(chromosomes))
+
+    serial = evaluate_chromosomes(chromosomes, scenario, seeds, backend="event")
+    pool = evaluation_pool(scenario, 2, "event")
+    try:
+        parallel = evaluate_chromosomes(
+            chromosomes, scenario, seeds, pool=pool, backend="event"
+        )
+    finally:
+        pool.shutdown()
+
+    assert serial == parallel
@@ -0,0 +1,135 @@
+import mmap
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.generator import generate_scenario
+from utils.objects import (
+    ES_DTYPES,
+    ES_FIELDS,
+    RSU_DTYPES,
+    RSU_FIELDS,
+    SCENARIO_FIELDS,
+    TASK_DTYPES,
+    TASK_FIELDS,
+    Scenario,
+    load_ess,
+    load_rsus,
+    load_scenario,
+    load_tasks,
+    populate_ess,
+    populate_rsus,
+    populate_tasks,
+    read_columns,
+    save_scenario,
+)
+
+# loaders of each data file, with the fields and dtypes of its columns, and the loader
+# of `datagen.ipynb` it replaces
+DATA_FILES = {
+    "tasks.csv": (load_tasks, populate_tasks, TASK_FIELDS, TASK_DTYPES),
+    "rsu.csv": (load_rsus, populate_rsus, RSU_FIELDS, RSU_DTYPES),
+    "es.csv": (load_ess, populate_ess, ES_FIELDS, ES_DTYPES),
+}
+
+
+def columns(scenario: Scenario) -> dict:
+    """Returns the columns of a scenario as lists, whatever their dtype."""
+    return {
+        (name, field): getattr(scenario, name)[field].tolist()
+        for name, fields in SCENARIO_FIELDS.items()
+        for field in fields
+    }
+
+
+def is_mapped(column: np.ndarray) -> bool:
+    """Returns True if a column is a view of a memory-mapped file."""
+    base = column
+    while base is not None and not isinstance(base, mmap.mmap):
+        base = getattr(base, "base", None)
+
+    return base is not None
+
+
+@pytest.mark.parametrize("mapped", [True, False])
+def test_scenario_round_trip(scenario, tmp_path, mapped):
+    save_scenario(scenario, str(tmp_path))
+    loaded = load_scenario(str(tmp_path), mmap=mapped)
+
+    assert columns(loaded) == columns(scenario)
+    assert loaded.fingerprint() == scenario.fingerprint()
+    assert (loaded.source is not None) == mapped
+    assert all(is_mapped(column) == mapped for column in loaded.tasks.values())
+    with pytest.raises(ValueError):
+        loaded.tasks["LENGTH"][0] = 0
+
+
+def test_mapped_scenario_pickles_as_path(scenario, tmp_path):
+    save_scenario(scenario, str(tmp_path))
+    mapped = load_scenario(str(tmp_path))
+    in_memory = load_scenario(str(tmp_path), mmap=False)
+
+    # a memory-mapped scenario is sent as its path, and mapped again
+    data = pickle.dumps(mapped)
+    assert len(data) < 1000 < len(pickle.dumps(in_memory))
+    unpickled = pickle.loads(data)
+    assert unpickled.source == mapped.source
+    assert is_mapped(unpickled.tasks["ID"])
+    assert columns(unpickled) == columns(scenario)
+
+    assert pickle.loads(pickle.dumps(in_memory)).fingerprint() == scenario.fingerprint()
+
+
+def test_scenario_is_frozen(scenario):
+    with pytest.raises(AttributeError):
+        scenario.tasks = {}
+    with pytest.raises(TypeError):
+        scenario.tasks["ID"] = np.zeros(1)
+    with pytest.raises(ValueError):
+        scenario.rsus["X"][0] = 0
+
+
+@pytest.fixture(scope="module")
+def data_files(tmp_path_factory) -> str:
+    """Directory of data files like the ones of `datagen.ipynb`."""
+    path = str(tmp_path_factory.mktemp("data"))
+    generate_scenario(path, 100, 12, 4, seed=0, fmt="csv")
+
+    return path
+
+
+@pytest.mark.parametrize("chunksize", [None, 7])
+@pytest.mark.parametrize("name", list(DATA_FILES))
+def test_load_is_populate(data_files, name, chunksize):
+    load, populate, fields, dtypes = DATA_FILES[name]
+    path = f"{data_files}/{name}"
+
+    def values(objects: list) -> list:
+        return [
+            tuple((type(getattr(x, field)), getattr(x, field)) for field in fields)
+            for x in objects
+        ]
+
+    expected = values(populate(pd.read_csv(path)))
+    assert values(load(path, chunksize)) == expected
+
+    columns = read_columns(path, dtypes, chunksize)
+    assert list(columns) == list(dtypes)
+    assert all(len(column) == len(expected) for column in columns.values())
+    assert all(
+        columns[field].dtype == object
+        for field, dtype in dtypes.items()
+        if dtype == "category"
+    )
+
+
+@pytest.mark.parametrize("chunksize", [None, 7])
+def test_scenario_from_csv(data_files, chunksize):
+    paths = [f"{data_files}/{name}" for name in DATA_FILES]
+
+    assert (
+        Scenario.from_csv(*paths, chunksize).fingerprint()
+        == Scenario.from_dataframes(*map(pd.read_csv, paths)).fingerprint()
+    )
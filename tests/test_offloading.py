@@ -0,0 +1,188 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from utils.compiled import COMPILED, compiled_offloading
+from utils.nsgaii import chromosome_to_network, random_chromosome
+from utils.objects import Task
+from utils.offloading import _tick_offloading, online_offloading, task_offloading
+from utils.policies import get_policy
+
+SEEDS = range(3)
+
+
+def outcome(tasks_bank: list, network: list) -> tuple:
+    """Returns what every backend must reproduce of an offloading process."""
+    return (
+        [
+            (
+                task.ID,
+                task.COMPUTATION_HISTORY,
+                task.MIGRATION_HISTORY,
+                task.START_TIME,
+                task.MIGRATIONS,
+                task.RSU.ID,
+                [rsu.ID for rsu in task.RSU_HISTORY],
+            )
+            for task in tasks_bank
+        ],
+        [(rsu.ID, rsu.STATE, rsu.END_TIME, rsu.SLOTS) for rsu in network],
+    )
+
+
+def offload(scenario, seed: int, generator: bool, function) -> tuple:
+    """Runs an offloading process on a random network of the scenario, drawing the ready
+    tasks from the global generator, or from an explicit one if `generator` is True.
+
+    Returns:
+        tuple: outcome of the process, and next integer of the generator it used.
+    """
+    tasks_bank = scenario.new_tasks()
+    network = chromosome_to_network(
+        random_chromosome(scenario, np.random.default_rng(seed)), scenario
+    )
+    np.random.seed(seed)
+    rng = np.random.default_rng(seed) if generator else None
+
+    tasks_bank = function(tasks_bank, network, rng)
+    if rng is None:
+        following = np.random.randint(2**32, dtype=np.uint64)
+    else:
+        following = rng.integers(2**32, dtype=np.uint64)
+
+    return outcome(tasks_bank, network), int(following)
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+@pytest.mark.parametrize("generator", [False, True], ids=["global", "generator"])
+@pytest.mark.parametrize("servers", ["single", "multi"])
+@pytest.mark.parametrize("backend", ["event", "vectorized", "compiled"])
+def test_backend_parity(scenario, backend, servers, generator):
+    for seed in SEEDS:
+        reference = offload(
+            scenario,
+            seed,
+            generator,
+            lambda tasks, network, rng: _tick_offloading(
+                tasks, network, servers, get_policy("migrate"), rng
+            ),
+        )
+        result = offload(
+            scenario,
+            seed,
+            generator,
+            lambda tasks, network, rng: task_offloading(
+                tasks, network, backend=backend, servers=servers, rng=rng
+            ),
+        )
+
+        assert result == reference
+
+
+@pytest.mark.skipif(COMPILED, reason="numba is installed")
+def test_compiled_fallback_warns(scenario):
+    network = chromosome_to_network(
+        random_chromosome(scenario, np.random.default_rng(0)), scenario
+    )
+
+    with pytest.warns(RuntimeWarning, match="numba"):
+        compiled_offloading(scenario.new_tasks(), network, rng=np.random.default_rng(0))
+
+
+@pytest.mark.skipif(not COMPILED, reason="numba is not installed")
+def test_compiled_does_not_warn(scenario):
+    network = chromosome_to_network(
+        random_chromosome(scenario, np.random.default_rng(0)), scenario
+    )
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        compiled_offloading(scenario.new_tasks(), network, rng=np.random.default_rng(0))
+
+
+def stream(scenario, n_tasks: int, spacing: int, pulled: list):
+    """Yields n_tasks copies of the tasks of the scenario, arriving every `spacing` time
+    units, and counts them in `pulled`."""
+    tasks = scenario.new_tasks()
+    for i in range(n_tasks):
+        task = tasks[i % len(tasks)]
+        task = Task(
+            ID=i,
+            LENGTH=task.LENGTH,
+            FILE_SIZE=task.FILE_SIZE,
+            TYPE=task.TYPE,
+            X=task.X,
+            Y=task.Y,
+        )
+        task.ARRIVAL = i * spacing
+        pulled[0] += 1
+        yield task
+
+
+@pytest.mark.parametrize("generator", [False, True], ids=["global", "generator"])
+@pytest.mark.parametrize("policy", ["migrate", "queue"])
+@pytest.mark.parametrize("servers", ["single", "multi"])
+def test_online_is_event(scenario, servers, policy, generator):
+    def online(tasks, network, rng):
+        records = list(online_offloading(tasks, network, servers, policy, rng=rng))
+        assert sorted(record["ID"] for record in records) == [task.ID for task in tasks]
+        return tasks
+
+    for seed in SEEDS:
+        reference = offload(
+            scenario,
+            seed,
+            generator,
+            lambda tasks, network, rng: task_offloading(
+                tasks, network, "event", servers, policy, rng
+            ),
+        )
+
+        assert offload(scenario, seed, generator, online) == reference
+
+
+@pytest.mark.parametrize("policy", ["migrate", "queue"])
+def test_online_yields_completions(scenario, policy):
+    network = chromosome_to_network(
+        random_chromosome(scenario, np.random.default_rng(0)), scenario
+    )
+    tasks = list(stream(scenario, 200, 3, [0]))
+    records = list(
+        online_offloading(tasks, network, "multi", policy, rng=np.random.default_rng(0))
+    )
+
+    assert sorted(record["ID"] for record in records) == list(range(200))
+    assert all(
+        record["ARRIVAL"] <= record["START_TIME"] < record["END_TIME"]
+        for record in records
+    )
+    # the records come when the computations end, not when they start
+    end_times = [record["END_TIME"] for record in records]
+    assert end_times == sorted(end_times)
+    assert [record["START_TIME"] for record in records] != sorted(
+        record["START_TIME"] for record in records
+    )
+
+
+def test_online_state_is_bounded(scenario):
+    def most_pending(n_tasks: int) -> int:
+        network = chromosome_to_network(
+            random_chromosome(scenario, np.random.default_rng(0)), scenario
+        )
+        pulled = [0]
+        pending = 0
+        records = online_offloading(
+            stream(scenario, n_tasks, 40, pulled),
+            network,
+            "multi",
+            "queue",
+            rng=np.random.default_rng(0),
+        )
+        for done, _ in enumerate(records, 1):
+            pending = max(pending, pulled[0] - done)
+
+        return pending
+
+    # the tasks read and not yet yielded do not grow with the length of the stream
+    assert most_pending(2000) == most_pending(500) < 100
@@ -0,0 +1,93 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+import utils.offloading
+from utils.main import service_time
+from utils.nsgaii import chromosome_to_network, random_chromosome
+from utils.objects import ES, RSU, Task
+from utils.offloading import task_offloading
+from utils.policies import AlwaysMigrate, WaitIfFaster, get_policy, predicted_wait
+
+
+class AlwaysWait(WaitIfFaster):
+    """Waits whatever the predicted times, as long as the queue is not full."""
+
+    def wait(self, task, rsu, wait_time: int, migration_time: int) -> bool:
+        return True
+
+
+def test_get_policy():
+    policy = WaitIfFaster(2)
+
+    assert isinstance(get_policy("migrate"), AlwaysMigrate)
+    assert get_policy("queue").queue_size == 4
+    assert get_policy(policy) is policy
+    with pytest.raises(ValueError):
+        get_policy("teleport")
+
+
+def test_wait_if_faster():
+    policy = WaitIfFaster()
+
+    assert policy.wait(None, None, wait_time=3, migration_time=3)
+    assert not policy.wait(None, None, wait_time=4, migration_time=3)
+    assert not AlwaysMigrate().wait(None, None, wait_time=0, migration_time=3)
+
+
+def test_predicted_wait():
+    rsu = RSU(ID=0, X=0, Y=0, DTR=10)
+    rsu.ES = ES(ID=0, VM_NB=2, VM_CP=5)
+    queued = Task(ID=0, LENGTH=40, FILE_SIZE=1, TYPE="COMPUTATION", X=0, Y=0)
+    task = Task(ID=1, LENGTH=40, FILE_SIZE=1, TYPE="COMPUTATION", X=0, Y=0)
+    rsu.SLOTS = [10]
+    rsu.QUEUE = deque([queued])
+
+    # the slot turns free after time 10, then computes the queued task
+    duration = service_time(rsu, queued, "single")
+    assert predicted_wait(rsu, task, 5, "single") == 11 + duration + 1 - 5
+    # with one slot per VM, the queued task takes the free slot right away, and the task
+    # the first slot to turn free
+    duration = service_time(rsu, queued, "multi")
+    assert predicted_wait(rsu, task, 5, "multi") == min(11, 5 + duration + 1) - 5
+
+
+@pytest.mark.parametrize("policy", [WaitIfFaster, AlwaysWait])
+@pytest.mark.parametrize("servers", ["single", "multi"])
+@pytest.mark.parametrize("backend", ["tick", "event"])
+def test_predicted_wait_is_exact(scenario, monkeypatch, backend, servers, policy):
+    # predicted start time of the tasks, and tasks which chose to wait
+    predictions = {}
+    queued = []
+
+    def recorded_wait(rsu, task, current_time, servers="single"):
+        wait_time = predicted_wait(rsu, task, current_time, servers)
+        predictions[id(task)] = current_time + wait_time
+        return wait_time
+
+    class Recorded(policy):
+        def wait(self, task, rsu, wait_time: int, migration_time: int) -> bool:
+            assert len(rsu.QUEUE) < self.queue_size
+            if super().wait(task, rsu, wait_time, migration_time):
+                queued.append(task)
+                return True
+            return False
+
+    monkeypatch.setattr(utils.offloading, "predicted_wait", recorded_wait)
+    for seed in range(3):
+        network = chromosome_to_network(
+            random_chromosome(scenario, np.random.default_rng(seed)), scenario
+        )
+        task_offloading(
+            scenario.new_tasks(),
+            network,
+            backend,
+            servers,
+            Recorded(),
+            rng=np.random.default_rng(seed),
+        )
+
+    # the queues are FIFO, so the tasks start when predicted
+    assert queued
+    assert all(task.START_TIME == predictions[id(task)] for task in queued)
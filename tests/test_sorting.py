@@ -0,0 +1,170 @@
+import numpy as np
+import pytest
+
+from utils.nsgaii import (
+    Individual,
+    crowding_distance,
+    crowding_distances,
+    non_dominated_ranks,
+    non_dominated_sorting,
+    nsga2,
+    objective_name,
+    parse_objectives,
+)
+
+
+def random_fitness(n: int, n_objectives: int, seed: int) -> np.ndarray:
+    """Integer fitness values, so that some solutions tie on some objectives."""
+    return np.random.default_rng(seed).integers(0, 8, (n, n_objectives)).astype(float)
+
+
+def brute_force_ranks(fitness_values: np.ndarray) -> np.ndarray:
+    """Peels the fronts one at a time with the pairwise dominance of `Individual`."""
+    population = [Individual(fitness_values=tuple(values)) for values in fitness_values]
+    ranks = np.full(len(population), -1)
+    remaining = set(range(len(population)))
+    rank = 0
+    while remaining:
+        front = {
+            i
+            for i in remaining
+            if not any(population[j].dominates(population[i]) for j in remaining)
+        }
+        ranks[list(front)] = rank
+        remaining -= front
+        rank += 1
+
+    return ranks
+
+
+def brute_force_crowding(fitness_values: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """Crowding distance of Deb et al., front by front and objective by objective."""
+    distances = np.zeros(len(ranks))
+    for rank in np.unique(ranks):
+        front = np.flatnonzero(ranks == rank).tolist()
+        for objective in range(fitness_values.shape[1]):
+            ordered = sorted(front, key=lambda i: fitness_values[i, objective])
+            span = (
+                fitness_values[ordered[-1], objective]
+                - fitness_values[ordered[0], objective]
+            )
+            for before, i, after in zip(ordered, ordered[1:], ordered[2:]):
+                if span > 0:
+                    distances[i] += (
+                        fitness_values[after, objective]
+                        - fitness_values[before, objective]
+                    ) / span
+            distances[ordered[0]] = distances[ordered[-1]] = np.inf
+
+    return distances
+
+
+@pytest.mark.parametrize("n_objectives", [2, 3, 4])
+@pytest.mark.parametrize("seed", range(5))
+def test_ranks(n_objectives, seed):
+    fitness_values = random_fitness(60, n_objectives, seed)
+    expected = brute_force_ranks(fitness_values)
+
+    assert np.array_equal(non_dominated_ranks(fitness_values), expected)
+    assert np.array_equal(non_dominated_ranks(fitness_values, "matrix"), expected)
+    if n_objectives == 2:
+        assert np.array_equal(non_dominated_ranks(fitness_values, "sweep"), expected)
+
+
+@pytest.mark.parametrize("n_objectives", [2, 3, 4])
+@pytest.mark.parametrize("seed", range(5))
+def test_crowding_distances(n_objectives, seed):
+    fitness_values = random_fitness(60, n_objectives, seed)
+    ranks = non_dominated_ranks(fitness_values)
+
+    assert np.array_equal(
+        crowding_distances(fitness_values, ranks),
+        brute_force_crowding(fitness_values, ranks),
+    )
+
+
+def test_directions():
+    metrics, signs = parse_objectives(("computation", ("throughput", "max")))
+    assert metrics == ("computation", "throughput")
+    assert signs.tolist() == [1.0, -1.0]
+
+    # a higher throughput is better, so the second individual dominates the first
+    first = Individual(fitness_values=(3, 1.0))
+    second = Individual(fitness_values=(3, 2.0))
+    assert second.dominates(first, signs)
+    assert not first.dominates(second, signs)
+
+    fronts = crowding_distance(non_dominated_sorting([first, second], signs), signs)
+    assert fronts == [[second], [first]]
+    assert (first.rank, second.rank) == (2, 1)
+
+
+@pytest.mark.parametrize(
+    "objectives",
+    [(), ("latency",), (("computation", "up"),)],
+    ids=["none", "unknown metric", "unknown direction"],
+)
+def test_invalid_objectives(objectives):
+    with pytest.raises(ValueError):
+        parse_objectives(objectives)
+
+
+def test_nsga2_three_objectives(scenario):
+    objectives = ("computation", "migration", ("throughput", "max"))
+    population = nsga2(
+        8,
+        2,
+        2,
+        0.9,
+        0.1,
+        scenario,
+        objectives=objectives,
+        progress=False,
+        rng=np.random.default_rng(0),
+    )
+
+    _, signs = parse_objectives(objectives)
+    assert len(population) == 8
+    assert all(len(individual.fitness) == 3 for individual in population)
+    # no individual of the first front is dominated by another of the population
+    for individual in population:
+        if individual.rank == 1:
+            assert not any(other.dominates(individual, signs) for other in population)
+
+
+def test_pareto_plot_needs_two_objectives():
+    pytest.importorskip("matplotlib").use("Agg")
+    from utils.plots import plot_pareto
+
+    with pytest.raises(ValueError, match="two objectives"):
+        plot_pareto([], 1, 1, 1, 0.9, 0.1, objectives=("computation",))
+
+
+def test_pareto_plot_three_objectives(scenario):
+    pytest.importorskip("matplotlib").use("Agg")
+    import matplotlib.pyplot as plt
+    from utils.plots import plot_pareto
+
+    objectives = ("computation", "migration", lambda metrics: metrics["makespan"])
+    population = nsga2(
+        8, 1, 2, 0.9, 0.3, scenario, seed=0, objectives=objectives, progress=False
+    )
+    plt.close("all")
+    plot_pareto(population, 8, 1, 2, 0.9, 0.3, objectives=objectives)
+    axes = [ax for ax in plt.gcf().axes if ax.get_visible()]
+
+    name = objective_name(objectives[2])
+    assert [(ax.get_xlabel(), ax.get_ylabel()) for ax in axes] == [
+        ("Max Computation Time", "Max Migration Time"),
+        ("Max Computation Time", name),
+        ("Max Migration Time", name),
+    ]
+    assert all(len(ax.collections) == len(population) for ax in axes)
+
+    plot_pareto(
+        population, 8, 1, 2, 0.9, 0.3, objectives=objectives, labels=("a", "b", "c")
+    )
+    assert plt.gcf().axes[2].get_ylabel() == "c"
+    with pytest.raises(ValueError, match="labels"):
+        plot_pareto(population, 8, 1, 2, 0.9, 0.3, objectives=objectives, labels=("a",))
+    plt.close("all")
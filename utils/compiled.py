@@ -0,0 +1,553 @@
+import math
+import warnings
+
+import numpy as np
+
+from .metrics import OffloadingStats
+from .state import NetworkArrays, TaskArrays, COMPUTATION, DATA_TRANSFER
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, the kernels then run as plain Python
+    njit = None
+
+
+# True if the kernels are compiled, False if they run as plain Python
+COMPILED = njit is not None
+
+# time of an event which never happens
+NEVER = np.iinfo(np.int64).max
+
+
+def jit(function):
+    """Compiles a function with numba if it is installed, returns it unchanged otherwise.
+
+    Args:
+        function (function): function to be compiled.
+
+    Returns:
+        function: compiled function.
+    """
+    if njit is None:
+        return function
+
+    return njit(cache=True, nogil=True)(function)
+
+
+@jit
+def _random_interval(raw, position, high):
+    """Draws an integer in [0, high] from a stream of raw 32 bits integers,
+    the way `np.random.randint(high + 1)` does: masked draws, rejected until one is in range.
+
+    Args:
+        raw (np.ndarray): stream of raw 32 bits integers of the global generator.
+        position (int): position of the next unused integer in the stream.
+        high (int): upper bound of the interval, included.
+
+    Returns:
+        tuple: the integer and the new position in the stream, (-1, position) if the
+            stream ran out.
+    """
+    # a single possible value does not use the stream
+    if high == 0:
+        return 0, position
+
+    mask = high
+    mask |= mask >> 1
+    mask |= mask >> 2
+    mask |= mask >> 4
+    mask |= mask >> 8
+    mask |= mask >> 16
+
+    while position < len(raw):
+        value = np.int64(raw[position]) & mask
+        position += 1
+        if value <= high:
+            return value, position
+
+    return -1, position
+
+
+@jit
+def _random_bounded(raw, position, high):
+    """Draws an integer in [0, high] from a stream of raw 32 bits integers,
+    the way `np.random.Generator.integers(high + 1)` does: Lemire's multiply and shift,
+    with the rare biased products rejected.
+
+    Args:
+        raw (np.ndarray): stream of raw 32 bits integers of the generator.
+        position (int): position of the next unused integer in the stream.
+        high (int): upper bound of the interval, included, below 2**31.
+
+    Returns:
+        tuple: the integer and the new position in the stream, (-1, position) if the
+            stream ran out.
+    """
+    # a single possible value does not use the stream
+    if high == 0:
+        return 0, position
+
+    n_values = high + 1
+    threshold = (0xFFFFFFFF - high) % n_values
+
+    while position < len(raw):
+        product = np.int64(raw[position]) * n_values
+        position += 1
+        if (product & 0xFFFFFFFF) >= threshold:
+            return product >> 32, position
+
+    return -1, position
+
+
+@jit
+def _heap_push(heap, size, key):
+    """Adds a key to a binary min-heap stored in the first `size` entries of an array.
+
+    Returns:
+        int: the new size of the heap.
+    """
+    position = size
+    heap[position] = key
+    while position > 0:
+        parent = (position - 1) // 2
+        if heap[parent] <= key:
+            break
+        heap[position] = heap[parent]
+        heap[parent] = key
+        position = parent
+
+    return size + 1
+
+
+@jit
+def _heap_pop(heap, size):
+    """Removes the smallest key of a binary min-heap, see `_heap_push`.
+
+    Returns:
+        tuple: the smallest key and the new size of the heap.
+    """
+    smallest = heap[0]
+    size -= 1
+    key = heap[size]
+    position = 0
+    while True:
+        child = 2 * position + 1
+        if child >= size:
+            break
+        if child + 1 < size and heap[child + 1] < heap[child]:
+            child += 1
+        if key <= heap[child]:
+            break
+        heap[position] = heap[child]
+        position = child
+    heap[position] = key
+
+    return smallest, size
+
+
+@jit
+def _closest_rsu(x, y, rsu_x, rsu_y, visited):
+    """Returns the closest RSU to a point among the RSUs not visited, see `get_closest_rsu`.
+
+    Returns:
+        tuple: index of the closest RSU and its distance to the point.
+    """
+    closest = -1
+    min_distance = math.inf
+    for j in range(len(rsu_x)):
+        distance = math.sqrt((rsu_x[j] - x) ** 2 + (rsu_y[j] - y) ** 2)
+        if distance < min_distance and not visited[j]:
+            min_distance = distance
+            closest = j
+
+    return closest, min_distance
+
+
+@jit
+def _offload_task(
+    i,
+    current_time,
+    length,
+    file_size,
+    task_type,
+    task_x,
+    task_y,
+    completed,
+    migration_time,
+    migration_history,
+    migrations,
+    computation_history,
+    start_time,
+    computing_rsu,
+    rsu_history,
+    hops,
+    visited,
+    rsu_x,
+    rsu_y,
+    dtr,
+    has_es,
+    task_vms,
+    vm_cp,
+    capacity,
+    slots,
+    busy,
+    end_time,
+):
+    """Offloads the task i at the current time, see `offload_task`."""
+    m = len(rsu_x)
+
+    # if the task was not being migrated, find the closest rsu to the task
+    if hops[i] == 0:
+        j, _ = _closest_rsu(task_x[i], task_y[i], rsu_x, rsu_y, visited[i])
+        rsu_history[i, 0] = j
+        visited[i, j] = True
+        hops[i] = 1
+
+        # suppose the task is assigned at that rsu directly
+        task_x[i] = rsu_x[j]
+        task_y[i] = rsu_y[j]
+    else:
+        # get the last rsu the task was assigned to
+        j = rsu_history[i, hops[i] - 1]
+
+    is_compatible = (has_es[j] and task_type[i] == COMPUTATION) or (
+        not has_es[j] and task_type[i] == DATA_TRANSFER
+    )
+
+    # if the rsu is free and compatible with the task, compute the task
+    if not busy[j] and is_compatible:
+        completed[i] = True
+        start_time[i] = current_time
+        computing_rsu[i] = j
+        if task_type[i] == COMPUTATION:
+            t_computation = math.ceil(length[i] / (task_vms[j] * vm_cp[j]))
+        else:
+            t_computation = math.ceil(file_size[i] / dtr[j])
+        computation_history[i] = t_computation
+
+        # the task takes the first free slot of the rsu, see `NetworkArrays.occupy`
+        for k in range(slots.shape[1]):
+            if slots[j, k] < 0:
+                slots[j, k] = current_time + t_computation
+                break
+        end_time[j] = max(end_time[j], current_time + t_computation)
+        occupied = 0
+        for k in range(slots.shape[1]):
+            if slots[j, k] >= 0:
+                occupied += 1
+        if occupied >= capacity[j]:
+            busy[j] = True
+
+    # if the rsu is busy or incompatible with the task, migrate the task
+    else:
+        k, distance = _closest_rsu(task_x[i], task_y[i], rsu_x, rsu_y, visited[i])
+        rsu_history[i, hops[i]] = k
+        visited[i, k] = True
+        hops[i] += 1
+
+        t_migration = math.ceil((file_size[i] / dtr[k]) * distance)
+        migration_time[i] = t_migration
+        migration_history[i] += t_migration
+        migrations[i] += 1
+
+        # update the coordinates of the task for when it will be migrated
+        task_x[i] = rsu_x[k]
+        task_y[i] = rsu_y[k]
+
+    # if the task has gone through all the RSU, reset its history
+    if hops[i] == m:
+        hops[i] = 0
+        visited[i, :] = False
+
+
+@jit
+def _offloading_kernel(
+    current_time,
+    raw,
+    lemire,
+    length,
+    file_size,
+    task_type,
+    task_x,
+    task_y,
+    completed,
+    migration_time,
+    migration_history,
+    migrations,
+    computation_history,
+    start_time,
+    computing_rsu,
+    rsu_history,
+    hops,
+    visited,
+    ready,
+    n_ready,
+    migrating,
+    n_migrating,
+    rsu_x,
+    rsu_y,
+    dtr,
+    has_es,
+    task_vms,
+    vm_cp,
+    capacity,
+    slots,
+    busy,
+    end_time,
+):
+    """Tick loop of `task_offloading` on the task and network arrays.
+    The ready tasks are the first n_ready entries of the ready array. The migrating
+    tasks are in a heap of the first n_migrating entries of the migrating array, keyed
+    by the time unit at the end of which they turn ready, times the number of tasks,
+    plus their index, so that the tasks turning ready together do it in order of index
+    like in the tick loop. The slots are only scanned at the end time of one of them,
+    and the time units without a ready task, which draw nothing, are skipped.
+    The loop stops at the start of a time unit if the stream of random integers runs out,
+    so that it can be resumed from that time unit with a longer stream.
+
+    Returns:
+        tuple: the current time, the number of random integers used, the number of
+            ready tasks, the number of migrating tasks and True if all the tasks are
+            completed.
+    """
+    n = len(completed)
+    position = 0
+
+    remaining = 0
+    for i in range(n):
+        if not completed[i]:
+            remaining += 1
+
+    # first end time of the busy slots
+    next_release = NEVER
+    for j in range(slots.shape[0]):
+        for k in range(slots.shape[1]):
+            if 0 <= slots[j, k] < next_release:
+                next_release = slots[j, k]
+
+    # while there are still tasks to be completed
+    while remaining > 0:
+
+        # check if any task is not completed and is not migrating
+        if n_ready > 0:
+            # draw a ready task, and swap it with the last one to remove it, see `_pop_ready_task`
+            if lemire:
+                k, new_position = _random_bounded(raw, position, n_ready - 1)
+            else:
+                k, new_position = _random_interval(raw, position, n_ready - 1)
+            if k < 0:
+                return current_time, position, n_ready, n_migrating, False
+            position = new_position
+            task = ready[k]
+            ready[k] = ready[n_ready - 1]
+            n_ready -= 1
+
+            _offload_task(
+                task,
+                current_time,
+                length,
+                file_size,
+                task_type,
+                task_x,
+                task_y,
+                completed,
+                migration_time,
+                migration_history,
+                migrations,
+                computation_history,
+                start_time,
+                computing_rsu,
+                rsu_history,
+                hops,
+                visited,
+                rsu_x,
+                rsu_y,
+                dtr,
+                has_es,
+                task_vms,
+                vm_cp,
+                capacity,
+                slots,
+                busy,
+                end_time,
+            )
+            if completed[task]:
+                remaining -= 1
+                next_release = min(
+                    next_release, current_time + computation_history[task]
+                )
+            # a migration shorter than a time unit leaves the task ready
+            elif migration_time[task] == 0:
+                ready[n_ready] = task
+                n_ready += 1
+            else:
+                # the tick loop removes a time unit from the migration at the end of
+                # this one, so the task turns ready at the end of its last time unit
+                n_migrating = _heap_push(
+                    migrating,
+                    n_migrating,
+                    (current_time + migration_time[task] - 1) * n + task,
+                )
+
+        # free the slots whose end time is the current time, see `NetworkArrays.release`
+        if current_time >= next_release:
+            next_release = NEVER
+            for j in range(len(busy)):
+                released = False
+                occupied = 0
+                for k in range(slots.shape[1]):
+                    if 0 <= slots[j, k] <= current_time:
+                        slots[j, k] = -1
+                        released = True
+                    elif slots[j, k] >= 0:
+                        occupied += 1
+                        next_release = min(next_release, slots[j, k])
+                if released:
+                    busy[j] = False
+                    if occupied == 0:
+                        end_time[j] = 0
+
+        # the migrating tasks whose migration ends with the current time turn ready
+        while n_migrating > 0 and migrating[0] // n <= current_time:
+            key, n_migrating = _heap_pop(migrating, n_migrating)
+            migration_time[key % n] = 0
+            ready[n_ready] = key % n
+            n_ready += 1
+
+        # update the current time
+        current_time += 1
+
+        # without a ready task, nothing happens until a slot or a migration ends
+        if n_ready == 0 and remaining > 0:
+            next_event = next_release
+            if n_migrating > 0:
+                next_event = min(next_event, migrating[0] // n)
+            if current_time < next_event < NEVER:
+                current_time = next_event
+
+    return current_time, position, n_ready, n_migrating, True
+
+
+def compiled_offloading(
+    tasks_bank: list,
+    network: list,
+    servers: str = "single",
+    rng: np.random.Generator = None,
+    stats: OffloadingStats = None,
+) -> list:
+    """Offloading process of the tasks in a compiled kernel.
+    Same process as `vectorized_offloading`, but the whole tick loop runs in a single
+    kernel, compiled with numba if it is installed and run as plain Python otherwise,
+    with a RuntimeWarning.
+    The kernel cannot share the NumPy generator, so it is fed the raw 32 bits integers
+    of the generator and draws the ready tasks from them exactly like `np.random.randint`,
+    or like `rng.integers` for a generator. The generator is left in the same state as
+    after the tick loop, so for a given seed every backend gives the same histories.
+
+    Args:
+        tasks_bank (list): list of tasks.
+        network (list): list of RSUs.
+        servers (str): server model of the RSUs, see `task_offloading`.
+        rng (np.random.Generator): random generator, see `task_offloading`.
+        stats (OffloadingStats): statistics, updated as the state is copied back, see
+            `task_offloading`.
+
+    Returns:
+        list: list of tasks with their history.
+    """
+    if not COMPILED:
+        warnings.warn(
+            "numba is not installed, the compiled offloading runs as plain Python "
+            "and is slower than the vectorized backend",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+
+    rsus = NetworkArrays(network, servers)
+    tasks = TaskArrays(tasks_bank, rsus)
+    n = len(tasks)
+
+    # the state of the generator is restored at the end, then advanced by the integers used
+    if rng is None:
+        state = np.random.get_state()
+        raw_integers = np.random.randint
+    else:
+        state = rng.bit_generator.state
+        raw_integers = rng.integers
+    # a task is drawn once per RSU it visits, and a draw uses at most two integers on
+    # average, the stream being extended if the kernel runs out of it
+    batch_size = max(8 * n, 1024)
+    raw = raw_integers(0, 2**32, size=batch_size, dtype=np.uint32)
+    used = 0
+
+    # indices of the tasks which are neither completed nor migrating
+    ready = np.zeros(n, dtype=np.int64)
+    eligible = np.flatnonzero(~tasks.COMPLETED & (tasks.MIGRATION_TIME == 0))
+    ready[: len(eligible)] = eligible
+    n_ready = len(eligible)
+
+    # heap of the migrating tasks, see `_offloading_kernel`, a sorted array being a heap
+    migrating = np.zeros(n, dtype=np.int64)
+    moving = np.flatnonzero(~tasks.COMPLETED & (tasks.MIGRATION_TIME > 0))
+    keys = np.sort((tasks.MIGRATION_TIME[moving] - 1) * n + moving)
+    migrating[: len(keys)] = keys
+    n_migrating = len(keys)
+
+    current_time = 0
+    while True:
+        current_time, position, n_ready, n_migrating, done = _offloading_kernel(
+            current_time,
+            raw,
+            rng is not None,
+            tasks.LENGTH,
+            tasks.FILE_SIZE,
+            tasks.TYPE,
+            tasks.X,
+            tasks.Y,
+            tasks.COMPLETED,
+            tasks.MIGRATION_TIME,
+            tasks.MIGRATION_HISTORY,
+            tasks.MIGRATIONS,
+            tasks.COMPUTATION_HISTORY,
+            tasks.START_TIME,
+            tasks.RSU,
+            tasks.RSU_HISTORY,
+            tasks.HOPS,
+            tasks.VISITED,
+            ready,
+            n_ready,
+            migrating,
+            n_migrating,
+            rsus.X,
+            rsus.Y,
+            rsus.DTR,
+            rsus.HAS_ES,
+            rsus.TASK_VMS,
+            rsus.VM_CP,
+            rsus.CAPACITY,
+            rsus.SLOTS,
+            rsus.BUSY,
+            rsus.END_TIME,
+        )
+        used += position
+        if done:
+            break
+        batch_size *= 2
+        raw = np.concatenate(
+            (
+                raw[position:],
+                raw_integers(0, 2**32, size=batch_size, dtype=np.uint32),
+            )
+        )
+
+    if rng is None:
+        np.random.set_state(state)
+    else:
+        rng.bit_generator.state = state
+    if used:
+        raw_integers(0, 2**32, size=used, dtype=np.uint32)
+
+    rsus.write_back()
+    tasks_bank[:] = tasks.write_back(rsus, stats)
+
+    return tasks_bank
@@ -0,0 +1,339 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from .objects import ES_FIELDS, RSU_FIELDS, TASK_FIELDS, Scenario
+
+# spatial distributions of the RSUs and of the tasks
+DISTRIBUTIONS = ("uniform", "corridors")
+
+# output formats of `generate_scenario`
+FORMATS = ("csv", "npy")
+
+# task types and their probabilities, as in `datagen.ipynb`
+TASK_TYPES = ("DATA TRANSFER", "COMPUTATION")
+TASK_TYPE_PROBABILITIES = (0.2, 0.8)
+
+
+def road_corridors(
+    n_roads: int, size: int, width: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Draws straight roads crossing the area, half of them horizontal on average.
+
+    Args:
+        n_roads (int): number of roads.
+        size (int): side of the square area, the coordinates are in [0, size).
+        width (int): number of cells across a road.
+        rng (np.random.Generator): random generator.
+
+    Returns:
+        np.ndarray: (n_roads, 2) orientation (0 for a road along X, 1 along Y) and
+            first coordinate across each road.
+    """
+    orientations = rng.integers(0, 2, n_roads)
+    offsets = rng.integers(0, size - width + 1, n_roads)
+
+    return np.stack((orientations, offsets), axis=1)
+
+
+def corridor_cells(roads: np.ndarray, size: int, width: int) -> np.ndarray:
+    """Returns the cells covered by roads, see `road_corridors`.
+
+    Args:
+        roads (np.ndarray): (n_roads, 2) roads.
+        size (int): side of the square area.
+        width (int): number of cells across a road.
+
+    Returns:
+        np.ndarray: sorted indices of the cells, the cell of (X, Y) being X * size + Y.
+    """
+    along = np.arange(size)
+    cells = []
+    for orientation, offset in roads.tolist():
+        for across in range(offset, offset + width):
+            if orientation == 0:
+                cells.append(along * size + across)
+            else:
+                cells.append(across * size + along)
+
+    return np.unique(np.concatenate(cells)) if cells else np.empty(0, dtype=np.int64)
+
+
+def place_rsus(
+    n_rsus: int,
+    size: int,
+    rng: np.random.Generator,
+    distribution: str = "uniform",
+    cells: np.ndarray = None,
+) -> tuple:
+    """Places RSUs on distinct cells of the area.
+    The cells are drawn without replacement in a single pass, so no two RSUs share their
+    coordinates and nothing is redrawn, however many RSUs there are.
+
+    Args:
+        n_rsus (int): number of RSUs.
+        size (int): side of the square area.
+        rng (np.random.Generator): random generator.
+        distribution (str): "uniform" over the whole area, or "corridors" along roads.
+        cells (np.ndarray): cells of the roads, see `corridor_cells`, for "corridors".
+
+    Returns:
+        tuple: X and Y coordinates of the RSUs.
+    """
+    if distribution == "uniform":
+        n_cells = size * size
+    elif distribution == "corridors":
+        n_cells = len(cells)
+    else:
+        raise ValueError(f"Unknown spatial distribution: {distribution}")
+
+    if n_rsus > n_cells:
+        raise ValueError(f"Cannot place {n_rsus} RSUs on {n_cells} distinct cells")
+
+    chosen = rng.choice(n_cells, size=n_rsus, replace=False)
+    if distribution == "corridors":
+        chosen = cells[chosen]
+
+    return chosen // size, chosen % size
+
+
+def generate_rsus(
+    n_rsus: int,
+    rng: np.random.Generator,
+    size: int = 100,
+    distribution: str = "uniform",
+    cells: np.ndarray = None,
+) -> dict:
+    """Generates the RSU bank, with the distributions of `datagen.ipynb`.
+
+    Args:
+        n_rsus (int): number of RSUs.
+        rng (np.random.Generator): random generator.
+        size (int): side of the square area.
+        distribution (str): spatial distribution, see `place_rsus`.
+        cells (np.ndarray): cells of the roads, for "corridors".
+
+    Returns:
+        dict: columns of the RSUs, see `RSU_FIELDS`.
+    """
+    x, y = place_rsus(n_rsus, size, rng, distribution, cells)
+
+    return {
+        "ID": np.arange(n_rsus),
+        "X": x,
+        "Y": y,
+        "DTR": rng.integers(1, 60, n_rsus),
+    }
+
+
+def generate_ess(n_ess: int, rng: np.random.Generator) -> dict:
+    """Generates the ES bank, with the distributions of `datagen.ipynb`.
+
+    Args:
+        n_ess (int): number of ESs.
+        rng (np.random.Generator): random generator.
+
+    Returns:
+        dict: columns of the ESs, see `ES_FIELDS`.
+    """
+    return {
+        "ID": np.arange(n_ess),
+        "VM_NB": rng.integers(1, 6, n_ess),
+        "VM_CP": rng.integers(1, 11, n_ess),
+    }
+
+
+def generate_tasks(
+    n_tasks: int,
+    rng: np.random.Generator,
+    size: int = 100,
+    distribution: str = "uniform",
+    roads: np.ndarray = None,
+    width: int = 1,
+    spread: float = 2.0,
+    chunksize: int = 100_000,
+):
+    """Generates the tasks bank one chunk at a time, like `datagen.ipynb`.
+    Along roads, a task is on a random road, at a random position along it, and at a
+    normally distributed distance across it.
+
+    Args:
+        n_tasks (int): number of tasks.
+        rng (np.random.Generator): random generator.
+        size (int): side of the square area.
+        distribution (str): "uniform" over the whole area, or "corridors" along roads.
+        roads (np.ndarray): roads, see `road_corridors`, for "corridors".
+        width (int): number of cells across a road.
+        spread (float): standard deviation of the distance of the tasks to their road.
+        chunksize (int): number of tasks of a chunk.
+
+    Yields:
+        dict: columns of the tasks of a chunk, see `TASK_FIELDS`.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown spatial distribution: {distribution}")
+
+    for start in range(0, n_tasks, chunksize):
+        n = min(chunksize, n_tasks - start)
+        chunk = {
+            "ID": np.arange(start, start + n),
+            "LENGTH": rng.integers(1, 100, n),
+            "FILE_SIZE": rng.integers(1, 500, n),
+            "TYPE": rng.choice(np.array(TASK_TYPES), n, p=TASK_TYPE_PROBABILITIES),
+        }
+
+        if distribution == "uniform":
+            chunk["X"] = rng.integers(0, size, n)
+            chunk["Y"] = rng.integers(0, size, n)
+        else:
+            road = roads[rng.integers(0, len(roads), n)]
+            along = rng.integers(0, size, n)
+            across = road[:, 1] + rng.uniform(0, width, n) + rng.normal(0, spread, n)
+            across = np.clip(np.floor(across), 0, size - 1).astype(np.int64)
+            horizontal = road[:, 0] == 0
+            chunk["X"] = np.where(horizontal, along, across)
+            chunk["Y"] = np.where(horizontal, across, along)
+
+        yield chunk
+
+
+def generate_scenario(
+    path: str,
+    n_tasks: int,
+    n_rsus: int,
+    n_ess: int,
+    seed=None,
+    size: int = 100,
+    distribution: str = "uniform",
+    n_roads: int = 8,
+    width: int = 1,
+    spread: float = 2.0,
+    chunksize: int = 100_000,
+    fmt: str = "npy",
+):
+    """Generates a scenario and writes it to a directory, streaming the tasks in chunks,
+    so that the memory used does not grow with the number of tasks.
+    The RSUs, the ESs and the tasks are drawn from independent streams of the seed, so
+    changing the number of tasks does not change the RSUs, and the same seed and chunk
+    size give the same files.
+
+    Args:
+        path (str): directory of the scenario, created if needed.
+        n_tasks (int): number of tasks.
+        n_rsus (int): number of RSUs.
+        n_ess (int): number of ESs.
+        seed: seed of the scenario, see `np.random.SeedSequence`.
+        size (int): side of the square area.
+        distribution (str): spatial distribution of the RSUs and tasks,
+            see `DISTRIBUTIONS`.
+        n_roads (int): number of roads, for "corridors".
+        width (int): number of cells across a road, for "corridors".
+        spread (float): standard deviation of the distance of the tasks to their road.
+        chunksize (int): number of tasks generated and written at a time.
+        fmt (str): "npy" for the format of `load_scenario`, "csv" for the data files
+            of `datagen.ipynb` (tasks.csv, rsu.csv and es.csv).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown scenario format: {fmt}")
+
+    roads_rng, rsus_rng, ess_rng, tasks_rng = [
+        np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(4)
+    ]
+
+    roads = cells = None
+    if distribution == "corridors":
+        roads = road_corridors(n_roads, size, width, roads_rng)
+        cells = corridor_cells(roads, size, width)
+
+    rsus = generate_rsus(n_rsus, rsus_rng, size, distribution, cells)
+    ess = generate_ess(n_ess, ess_rng)
+    chunks = generate_tasks(
+        n_tasks, tasks_rng, size, distribution, roads, width, spread, chunksize
+    )
+
+    os.makedirs(path, exist_ok=True)
+    if fmt == "csv":
+        pd.DataFrame(rsus, columns=RSU_FIELDS).to_csv(
+            os.path.join(path, "rsu.csv"), index=False
+        )
+        pd.DataFrame(ess, columns=ES_FIELDS).to_csv(
+            os.path.join(path, "es.csv"), index=False
+        )
+        tasks_path = os.path.join(path, "tasks.csv")
+        for i, chunk in enumerate(chunks):
+            pd.DataFrame(chunk, columns=TASK_FIELDS).to_csv(
+                tasks_path, index=False, mode="w" if i == 0 else "a", header=i == 0
+            )
+        if n_tasks == 0:
+            pd.DataFrame(columns=TASK_FIELDS).to_csv(tasks_path, index=False)
+        return
+
+    # the files of `save_scenario`, the tasks columns being filled in place
+    for name, bank in (("rsus", rsus), ("ess", ess)):
+        for field, column in bank.items():
+            np.save(os.path.join(path, f"{name}.{field}.npy"), column)
+
+    dtypes = {field: np.dtype(np.int64) for field in TASK_FIELDS}
+    dtypes["TYPE"] = np.dtype(f"<U{max(len(task_type) for task_type in TASK_TYPES)}")
+    files = {}
+    for field, dtype in dtypes.items():
+        # the header holds the final shape, the chunks are then appended after it with
+        # plain writes, which unlike a memory map keep no written page resident
+        file_path = os.path.join(path, f"tasks.{field}.npy")
+        column = np.lib.format.open_memmap(
+            file_path, mode="w+", dtype=dtype, shape=(n_tasks,)
+        )
+        offset = column.offset
+        del column
+        files[field] = open(file_path, "r+b")
+        files[field].seek(offset)
+
+    try:
+        for chunk in chunks:
+            for field, file in files.items():
+                column = np.ascontiguousarray(chunk[field], dtype=dtypes[field])
+                file.write(column.tobytes())
+    finally:
+        for file in files.values():
+            file.close()
+
+
+def generate(
+    n_tasks: int,
+    n_rsus: int,
+    n_ess: int,
+    seed=None,
+    size: int = 100,
+    distribution: str = "uniform",
+    n_roads: int = 8,
+    width: int = 1,
+    spread: float = 2.0,
+) -> Scenario:
+    """Generates a scenario in memory, see `generate_scenario`.
+
+    Returns:
+        Scenario: the scenario, equal to the one written by `generate_scenario` with
+            the same arguments and a chunk size of at least n_tasks.
+    """
+    roads_rng, rsus_rng, ess_rng, tasks_rng = [
+        np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(4)
+    ]
+
+    roads = cells = None
+    if distribution == "corridors":
+        roads = road_corridors(n_roads, size, width, roads_rng)
+        cells = corridor_cells(roads, size, width)
+
+    tasks = next(
+        generate_tasks(
+            n_tasks, tasks_rng, size, distribution, roads, width, spread, max(n_tasks, 1)
+        ),
+        {field: np.empty(0, dtype=np.int64) for field in TASK_FIELDS},
+    )
+
+    return Scenario(
+        tasks,
+        generate_rsus(n_rsus, rsus_rng, size, distribution, cells),
+        generate_ess(n_ess, ess_rng),
+    )
@@ -0,0 +1,107 @@
+import contextlib
+import cProfile
+import json
+import pstats
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # pyinstrument is optional, only the cProfile hook is then available
+    Profiler = None
+
+
+# profilers which can run around the evaluations, see `JSONLinesSink`
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+class Instrumentation:
+    """Receives the measures of each generation of `nsga2`, and does nothing with them.
+    Subclasses override the methods they need.
+    """
+
+    def evaluation(self):
+        """Returns the context manager which wraps every batch of evaluations,
+        for instance to profile them.
+
+        Returns:
+            contextlib.AbstractContextManager: the context manager.
+        """
+        return contextlib.nullcontext()
+
+    def on_generation(self, record: dict):
+        """Receives the measures of a generation.
+
+        Args:
+            record (dict): "generation" (0 for the initial population), wall times in
+                seconds ("selection", "variation", "evaluation", "sorting", "total"),
+                number of "evaluations", simulated "ticks" and "ticks_per_second",
+                fitness cache "cache_hits", "cache_misses" and "cache_hit_rate" (None
+                without cache), "hypervolume" of the first front and "archive_size"
+                (None without archive).
+        """
+
+    def close(self):
+        """Called once at the end of the run."""
+
+
+class JSONLinesSink(Instrumentation):
+    """Writes the measures of each generation as a line of JSON, and optionally profiles
+    the evaluations with cProfile or pyinstrument.
+
+    Attributes:
+        path (str): path of the JSON lines file, appended to.
+        profiler (str): profiler of the evaluations, see `PROFILERS`, or None.
+        profile_path (str): path of the profile written at the end of the run, a pstats
+            file for cProfile and an HTML page for pyinstrument.
+    """
+
+    def __init__(self, path: str, profiler=None, profile_path=None):
+        if profiler is not None and profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler: {profiler}")
+        if profiler == "pyinstrument" and Profiler is None:
+            raise ImportError("pyinstrument is not installed")
+
+        self.path = path
+        self.profiler = profiler
+        self.profile_path = profile_path
+        if profile_path is None and profiler is not None:
+            extension = "prof" if profiler == "cprofile" else "html"
+            self.profile_path = f"{path}.{extension}"
+
+        self._file = open(path, "a")
+        self._profile = None
+        if profiler == "cprofile":
+            self._profile = cProfile.Profile()
+        elif profiler == "pyinstrument":
+            self._profile = Profiler()
+
+    @contextlib.contextmanager
+    def evaluation(self):
+        if self._profile is None:
+            yield
+            return
+
+        # both profilers accumulate over successive start and stop
+        if self.profiler == "cprofile":
+            self._profile.enable()
+        else:
+            self._profile.start()
+        try:
+            yield
+        finally:
+            if self.profiler == "cprofile":
+                self._profile.disable()
+            else:
+                self._profile.stop()
+
+    def on_generation(self, record: dict):
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+        if self.profiler == "cprofile":
+            pstats.Stats(self._profile).dump_stats(self.profile_path)
+        elif self.profiler == "pyinstrument":
+            with open(self.profile_path, "w") as file:
+                file.write(self._profile.output_html())
@@ -1,6 +1,15 @@
+import heapq
 import math
+
+import numpy as np
+
 from .objects import RSU, Task
 
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy is optional, the index falls back to a brute force search
+    cKDTree = None
+
 
 def get_closest_rsu(rsu_list: list, object, exclude_list: list) -> RSU:
     """
@@ -17,15 +26,206 @@ def get_closest_rsu(rsu_list: list, object, exclude_list: list) -> RSU:
     min_distance = math.inf
     min_rsu = None
 
+    # the RSUs are compared by identity, so look them up in a set
+    excluded = {id(rsu) for rsu in exclude_list}
+
     for rsu in rsu_list:
         distance = math.sqrt((rsu.X - object.X) ** 2 + (rsu.Y - object.Y) ** 2)
-        if distance < min_distance and rsu not in exclude_list:
+        if distance < min_distance and id(rsu) not in excluded:
             min_distance = distance
             min_rsu = rsu
 
     return min_rsu
 
 
+class RSUIndex:
+    """Spatial index of the RSUs of a network, built once per network.
+
+    Tasks move to the coordinates of the RSUs after their first hop, so most lookups
+    are RSU to RSU: they walk the precomputed neighbour order of the RSU the task is on.
+    The lookups from other coordinates use a KD-tree (if scipy is installed) or a
+    brute force search. Ties are broken like `get_closest_rsu`, by order in the network.
+
+    Attributes:
+        rsus (list): list of RSUs, the position of an RSU in this list is its index.
+        position (dict): position of each RSU, by id of the RSU.
+        distances (np.ndarray): (M, M) matrix of the distances between the RSUs.
+        neighbours (np.ndarray): (M, M) positions of the RSUs, sorted by distance to each RSU.
+    """
+
+    # number of neighbours queried from the KD-tree before falling back to a brute force search
+    KD_TREE_NEIGHBOURS = 8
+
+    def __init__(self, network: list):
+        self.rsus = list(network)
+        self.position = {id(rsu): i for i, rsu in enumerate(self.rsus)}
+
+        self.X = np.array([rsu.X for rsu in self.rsus])
+        self.Y = np.array([rsu.Y for rsu in self.rsus])
+
+        # pairwise distances, and the RSUs sorted by distance to each RSU
+        # a stable sort keeps the network order between RSUs at the same distance
+        self.distances = np.sqrt(
+            (self.X[:, None] - self.X[None, :]) ** 2
+            + (self.Y[:, None] - self.Y[None, :]) ** 2
+        )
+        self.neighbours = np.argsort(self.distances, axis=1, kind="stable")
+
+        # first RSU at each coordinates
+        self.anchors = {}
+        for i, rsu in enumerate(self.rsus):
+            self.anchors.setdefault((rsu.X, rsu.Y), i)
+
+        if cKDTree is not None and self.rsus:
+            self.tree = cKDTree(np.column_stack((self.X, self.Y)))
+        else:
+            self.tree = None
+
+    def __len__(self) -> int:
+        return len(self.rsus)
+
+    def positions(self, rsus: list) -> set:
+        """Returns the set of positions of a list of RSUs.
+
+        Args:
+            rsus (list): list of RSUs of the network.
+
+        Returns:
+            set: positions of the RSUs in the index.
+        """
+        return {self.position[id(rsu)] for rsu in rsus}
+
+    def closest_position(self, x, y, exclude=frozenset()):
+        """Returns the position of the closest RSU to a point.
+
+        Args:
+            x: X coordinate of the point.
+            y: Y coordinate of the point.
+            exclude (set): positions of the RSUs to be excluded from the search.
+
+        Returns:
+            int: position of the closest RSU, None if all the RSUs are excluded.
+        """
+        anchor = self.anchors.get((x, y))
+
+        # the point is on an RSU: at most len(exclude) neighbours can be skipped
+        if anchor is not None:
+            for j in self.neighbours[anchor, : len(exclude) + 1].tolist():
+                if j not in exclude:
+                    return j
+            return None
+
+        if not exclude and self.tree is not None:
+            k = min(self.KD_TREE_NEIGHBOURS, len(self.rsus))
+            distances, positions = self.tree.query((x, y), k=k)
+            distances = np.atleast_1d(distances)
+            positions = np.atleast_1d(positions)
+            ties = distances == distances[0]
+            # if all the neighbours are tied, there may be more of them further away
+            if not ties.all() or k == len(self.rsus):
+                return int(positions[ties].min())
+
+        distances = np.sqrt((self.X - x) ** 2 + (self.Y - y) ** 2)
+        if exclude:
+            distances[list(exclude)] = math.inf
+        closest = int(np.argmin(distances))
+        if distances[closest] == math.inf:
+            return None
+
+        return closest
+
+    def closest(self, object, exclude=frozenset()) -> RSU:
+        """Returns the closest RSU to an object, see `get_closest_rsu`.
+
+        Args:
+            object (object): object to which the closest RSU is to be found.
+            exclude (set): positions of the RSUs to be excluded from the search.
+
+        Returns:
+            RSU: closest RSU to the object.
+        """
+        closest = self.closest_position(object.X, object.Y, exclude)
+        if closest is None:
+            return None
+
+        return self.rsus[closest]
+
+
+# server models of the RSUs: "single" computes one task at a time on all the VMs of an ES,
+# "multi" computes one task per VM of an ES at the same time
+SERVER_MODELS = ("single", "multi")
+
+
+def server_capacity(rsu: RSU, servers: str = "single") -> int:
+    """Returns the number of tasks an RSU can compute at the same time.
+
+    Args:
+        rsu (RSU): RSU to be checked.
+        servers (str): server model, see `SERVER_MODELS`.
+
+    Returns:
+        int: VM_NB for an RSU connected to an ES in the "multi" model, 1 otherwise.
+    """
+    if servers == "multi" and rsu.ES != "AP":
+        return rsu.ES.VM_NB
+
+    return 1
+
+
+def task_vms(rsu: RSU, servers: str = "single") -> int:
+    """Returns the number of VMs of an RSU computing a single task.
+
+    Args:
+        rsu (RSU): RSU connected to an ES.
+        servers (str): server model, see `SERVER_MODELS`.
+
+    Returns:
+        int: all the VMs of the ES in the "single" model, one in the "multi" model.
+    """
+    if servers == "multi":
+        return 1
+
+    return rsu.ES.VM_NB
+
+
+def occupy_server(rsu: RSU, end_time: int, capacity: int = 1):
+    """Starts a task on a free slot of an RSU.
+
+    Args:
+        rsu (RSU): RSU computing the task.
+        end_time (int): time at which the task ends.
+        capacity (int): number of slots of the RSU, see `server_capacity`.
+    """
+    heapq.heappush(rsu.SLOTS, end_time)
+    # the end time of the RSU is the time at which all its slots are free
+    rsu.END_TIME = end_time if rsu.END_TIME is None else max(rsu.END_TIME, end_time)
+    if len(rsu.SLOTS) >= capacity:
+        rsu.STATE = "BUSY"
+
+
+def release_server(rsu: RSU, current_time: int) -> int:
+    """Frees the slots of an RSU whose task ends at or before the current time.
+
+    Args:
+        rsu (RSU): RSU to be released.
+        current_time (int): current time of the offloading process.
+
+    Returns:
+        int: number of slots freed.
+    """
+    released = 0
+    while rsu.SLOTS and rsu.SLOTS[0] <= current_time:
+        heapq.heappop(rsu.SLOTS)
+        released += 1
+
+    if released:
+        rsu.STATE = "IDLE"
+        if not rsu.SLOTS:
+            rsu.END_TIME = 0
+
+    return released
+
+
 def is_server_free(rsu: RSU) -> bool:
     """Checks if an RSU is free.
 
@@ -68,6 +268,28 @@ def computation_time(task_length: int, vm_nb: int, vm_cpu: int) -> float:
     return math.ceil(task_length / (vm_nb * vm_cpu))
 
 
+def service_time(rsu: RSU, task: Task, servers: str = "single") -> int:
+    """Computes the time an RSU takes to compute a compatible task: the computation time
+    on an ES, the data transfer time on an AP.
+
+    Args:
+        rsu (RSU): RSU computing the task.
+        task (Task): task to be computed.
+        servers (str): server model of the RSUs, see `SERVER_MODELS`.
+
+    Returns:
+        int: time of the task on the RSU.
+    """
+    if task.TYPE == "COMPUTATION":
+        return computation_time(
+            task_length=task.LENGTH,
+            vm_nb=task_vms(rsu, servers),
+            vm_cpu=rsu.ES.VM_CP,
+        )
+
+    return data_transfer_time(file_size=task.FILE_SIZE, dtr=rsu.DTR)
+
+
 def migration_time(file_size: int, distance: float, dtr: int) -> float:
     """Computes the migration of a task between a AP RSU and an ES.
 
@@ -0,0 +1,189 @@
+import math
+
+from .main import server_capacity
+
+
+class QuantileSketch:
+    """Streaming sketch of the quantiles of non-negative values, with bounded memory.
+    The values are counted in buckets whose bounds grow geometrically, so any quantile
+    is estimated within a relative error of `relative_accuracy` (the DDSketch scheme),
+    and the number of buckets only grows with the logarithm of the largest value.
+
+    Attributes:
+        relative_accuracy (float): maximum relative error of the quantiles.
+        count (int): number of values added.
+        min (float): smallest value added.
+        max (float): largest value added.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        # number of values in each bucket, by index of the bucket
+        self._buckets = {}
+        self._zeros = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, value: float):
+        """Adds a value to the sketch.
+
+        Args:
+            value (float): non-negative value.
+        """
+        if value < 0:
+            raise ValueError(f"The sketch only holds non-negative values, got {value}")
+
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        if value == 0:
+            self._zeros += 1
+            return
+
+        # the bucket i holds the values in (gamma^(i-1), gamma^i]
+        i = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[i] = self._buckets.get(i, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        """Estimates a quantile of the values added.
+
+        Args:
+            q (float): quantile, between 0 and 1.
+
+        Returns:
+            float: the quantile, 0 if the sketch is empty.
+        """
+        if self.count == 0:
+            return 0.0
+
+        # rank of the quantile among the sorted values
+        rank = q * (self.count - 1)
+
+        seen = self._zeros
+        if rank < seen:
+            return 0.0
+
+        for i in sorted(self._buckets):
+            seen += self._buckets[i]
+            if rank < seen:
+                # middle of the bucket, in relative terms
+                value = 2 * self._gamma**i / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+
+        return self.max
+
+
+class OffloadingStats:
+    """Statistics of an offloading process, accumulated as the computations of the tasks
+    start, in a single pass and with a memory which does not grow with the number of tasks.
+
+    The latency of a task is the time between its arrival and the end of its computation.
+    The data migrated is in megabytes, the unit of the FILE_SIZE of the tasks: each
+    migration of a task moves its whole file.
+
+    Attributes:
+        n_tasks (int): number of tasks computed.
+        sketch (QuantileSketch): sketch of the latencies of the tasks.
+        busy_time (dict): total computation time of each RSU, by ID.
+        capacity (dict): number of slots of each RSU, by ID.
+    """
+
+    def __init__(self, network: list, servers: str = "single", relative_accuracy=0.01):
+        self.n_tasks = 0
+        self.sketch = QuantileSketch(relative_accuracy)
+        self.busy_time = {rsu.ID: 0 for rsu in network}
+        self.capacity = {rsu.ID: server_capacity(rsu, servers) for rsu in network}
+        self._max_computation = 0
+        self._max_migration = 0
+        self._makespan = 0
+        self._max_delay = 0
+        self._total_delay = 0
+        self._total_latency = 0
+        self._megabytes_migrated = 0
+
+    def add(self, task):
+        """Adds a task whose computation started.
+
+        Args:
+            task (Task): task being computed, see `offload_task`.
+        """
+        end_time = task.START_TIME + task.COMPUTATION_HISTORY
+        latency = end_time - task.ARRIVAL
+        delay = task.START_TIME - task.ARRIVAL - task.MIGRATION_HISTORY
+
+        self.n_tasks += 1
+        self._max_computation = max(self._max_computation, task.COMPUTATION_HISTORY)
+        self._max_migration = max(self._max_migration, task.MIGRATION_HISTORY)
+        self._makespan = max(self._makespan, end_time)
+        self._max_delay = max(self._max_delay, delay)
+        self._total_delay += delay
+        self._total_latency += latency
+        self._megabytes_migrated += task.FILE_SIZE * task.MIGRATIONS
+        self.sketch.add(latency)
+        if task.RSU is not None:
+            self.busy_time[task.RSU.ID] += task.COMPUTATION_HISTORY
+
+    def utilisation(self) -> dict:
+        """Returns the share of the time the slots of each RSU were computing a task,
+        between the start of the offloading and the makespan.
+
+        Returns:
+            dict: utilisation of each RSU, by ID.
+        """
+        if not self._makespan:
+            return {ID: 0.0 for ID in self.busy_time}
+
+        return {
+            ID: float(busy_time / (self.capacity[ID] * self._makespan))
+            for ID, busy_time in self.busy_time.items()
+        }
+
+    def metrics(self) -> dict:
+        """Returns the metrics of the tasks added so far, see `METRICS`.
+
+        Returns:
+            dict: value of each metric.
+        """
+        utilisation = self.utilisation()
+        n_tasks = max(self.n_tasks, 1)
+
+        return {
+            "computation": self._max_computation,
+            "migration": self._max_migration,
+            "makespan": self._makespan,
+            "queueing_delay": self._max_delay,
+            "mean_queueing_delay": self._total_delay / n_tasks,
+            "mean_latency": self._total_latency / n_tasks,
+            "p50_latency": self.sketch.quantile(0.50),
+            "p95_latency": self.sketch.quantile(0.95),
+            "p99_latency": self.sketch.quantile(0.99),
+            "throughput": self.n_tasks / self._makespan if self._makespan else 0.0,
+            "megabytes_migrated": int(self._megabytes_migrated),
+            "mean_utilisation": sum(utilisation.values()) / max(len(utilisation), 1),
+            "max_utilisation": max(utilisation.values(), default=0.0),
+        }
+
+
+# metrics of an offloading process, see `OffloadingStats.metrics`
+METRICS = (
+    "computation",
+    "migration",
+    "makespan",
+    "queueing_delay",
+    "mean_queueing_delay",
+    "mean_latency",
+    "p50_latency",
+    "p95_latency",
+    "p99_latency",
+    "throughput",
+    "megabytes_migrated",
+    "mean_utilisation",
+    "max_utilisation",
+)
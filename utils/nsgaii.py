@@ -1,16 +1,34 @@
-import random
-
-from tqdm.notebook import tqdm
-
-from .offloading import task_offloading
-from .objects import Task, RSU, ES, get_random_network
+import bisect
+import hashlib
+import itertools
+import json
+import os
+import pickle
+import time
+import types
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+try:
+    from tqdm.auto import tqdm
+except ImportError:  # tqdm is optional, the runs then have no progress bar
+    tqdm = None
+
+from .instrumentation import Instrumentation
+from .metrics import METRICS, OffloadingStats
+from .offloading import SIMULATION_COUNTERS, count_simulations, task_offloading
+from .policies import AlwaysMigrate, get_policy
+from .objects import Scenario, random_integer
 
 
 class Individual(object):
     """Individual of the NSGA-II algorithm.
 
     Attributes:
-        chromosome (list): chromosome of the individual.
+        chromosome (np.ndarray): chromosome of the individual.
         fitness (list): fitness of the individual.
         ID (int): ID of the individual.
         crowding_distance (float): crowding distance of the individual.
@@ -20,18 +38,32 @@ class Individual(object):
         dominates: checks if the individual dominates another individual.
     """
 
-    global_individual = []
+    # counter of the IDs, the individuals themselves are not kept
+    ids = itertools.count(1)
+
+    def __init__(
+        self, network=None, chromosome=None, fitness_values=None, scenario=None
+    ):
+        """Creates an individual, either from a network which is evaluated on the scenario,
+        or from a chromosome and its already computed fitness.
 
-    def __init__(self, network):
+        Args:
+            network (list): list of RSU.
+            chromosome (np.ndarray): chromosome of the individual, if network is None.
+            fitness_values (tuple): fitness of the chromosome, if network is None.
+            scenario (Scenario): scenario the network is evaluated on.
+        """
+        if network is not None:
+            # create the chromosome
+            chromosome = network_to_chromosome(network, scenario)
 
-        # create the chromosome
-        self.chromosome = network_to_chromosome(network)
+            # compute the fitness
+            fitness_values = fitness(network, scenario)
 
-        # compute the fitness
-        self.fitness = fitness(network)
+        self.chromosome = chromosome
+        self.fitness = fitness_values
 
-        self.__class__.global_individual.append(self)
-        self.ID = len(self.__class__.global_individual)
+        self.ID = next(self.__class__.ids)
         self.crowding_distance = None
         self.rank = None
 
@@ -41,126 +73,381 @@ class Individual(object):
         Returns:
             str: string representation of the individual.
         """
-        for i in range(len(self.chromosome)):
-            if i == 0:
-                string = f"{self.chromosome[i]}"
-            else:
-                string += f", {self.chromosome[i]}"
-        return string
+        return ", ".join(str(gene) for gene in self.chromosome.tolist())
 
     # dominates method
-    def dominates(self, other):
+    def dominates(self, other, signs=None):
         """Checks if the individual dominates another individual.
 
         Args:
             other (Individual): individual to compare to.
+            signs (np.ndarray): sign of each objective, see `parse_objectives`,
+                all the objectives are minimized if None.
 
         Returns:
             bool: True if the individual dominates the other individual, False otherwise.
         """
+        if signs is None:
+            signs = np.ones(len(self.fitness))
+
+        # the objectives are minimized once multiplied by their sign
+        own = np.asarray(self.fitness, dtype=float) * signs
+        others = np.asarray(other.fitness, dtype=float) * signs
+
         # check if the individual dominates the other individual
-        if all(
-            self.fitness[i] <= other.fitness[i] for i in range(len(self.fitness))
-        ) and any(self.fitness[i] < other.fitness[i] for i in range(len(self.fitness))):
-            return True
-        return False
+        return bool(np.all(own <= others) and np.any(own < others))
+
+
+# metrics minimized by default, see `fitness`
+OBJECTIVES = ("computation", "migration")
+
+# sign of the objectives of each direction, the signed objectives are minimized
+DIRECTIONS = {"min": 1.0, "max": -1.0}
+
+
+def parse_objectives(objectives) -> tuple:
+    """Splits a list of objectives into their metrics and the sign of their direction.
+    An objective is a metric of `METRICS`, or a function of the dict of the metrics
+    returning a number, optionally paired with its direction, "min" (the default) or "max",
+    e.g. ("computation", ("throughput", "max"), my_function).
+
+    Args:
+        objectives (list): list of objectives.
+
+    Returns:
+        tuple: the metrics of the objectives, see `fitness`, and the (number of objectives,)
+            array of the sign of each objective.
+    """
+    metrics = []
+    signs = []
+    for objective in objectives:
+        direction = "min"
+        if isinstance(objective, (tuple, list)):
+            objective, direction = objective
+
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown objective direction: {direction}")
+        if not callable(objective) and objective not in METRICS:
+            raise ValueError(f"Unknown metric: {objective}")
+
+        metrics.append(objective)
+        signs.append(DIRECTIONS[direction])
+
+    if not metrics:
+        raise ValueError("At least one objective is needed")
+
+    return tuple(metrics), np.array(signs)
+
+
+def objective_name(objective) -> str:
+    """Returns the name of the metric of an objective, stable across processes.
+
+    Args:
+        objective: metric of `METRICS`, or function of the metrics.
+
+    Returns:
+        str: name of the metric, or qualified name of the function.
+    """
+    if isinstance(objective, partial):
+        return objective_name(objective.func)
+    if callable(objective):
+        return f"{objective.__module__}.{objective.__qualname__}"
+
+    return objective
+
+
+def objective_key(objective) -> str:
+    """Returns the key of an objective in the fitness cache, stable across processes.
+    A function is keyed on what it computes: its bytecode, constants, default values,
+    closure and the values of the globals it reads, so two lambdas of a module, or a
+    function edited between two runs, do not share cache entries.
+
+    Args:
+        objective: metric of `METRICS`, or function of the metrics.
+
+    Returns:
+        str: name of the metric, or name of the function and digest of its behaviour.
+
+    Raises:
+        ValueError: if the function depends on a value without a stable representation,
+            or the objective is a callable object, whose results cannot be cached.
+    """
+    if not callable(objective):
+        return objective
+
+    behaviour = hashlib.sha1(_stable_repr(objective, set()).encode()).hexdigest()
+    return f"{objective_name(objective)}:{behaviour}"
+
+
+def _stable_repr(value, seen: set) -> str:
+    """Returns a representation of a value which is the same in every process,
+    see `objective_key`. Functions are represented by their behaviour, and the
+    functions already in `seen` by their name only, to stop at recursive functions.
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return repr(value)
+    if isinstance(value, (tuple, list)):
+        items = ", ".join(_stable_repr(item, seen) for item in value)
+        return f"{type(value).__name__}({items})"
+    if isinstance(value, (set, frozenset)):
+        items = ", ".join(sorted(_stable_repr(item, seen) for item in value))
+        return f"{type(value).__name__}({items})"
+    if isinstance(value, dict):
+        items = sorted(
+            f"{_stable_repr(key, seen)}: {_stable_repr(item, seen)}"
+            for key, item in value.items()
+        )
+        return f"dict({', '.join(items)})"
+    if isinstance(value, np.ndarray):
+        digest = hashlib.sha1(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return f"array({value.dtype}, {value.shape}, {digest})"
+    if isinstance(value, types.ModuleType):
+        return f"module({value.__name__})"
+    if isinstance(value, (type, types.BuiltinFunctionType)):
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, types.CodeType):
+        return repr(
+            (
+                value.co_code.hex(),
+                value.co_names,
+                tuple(_stable_repr(constant, seen) for constant in value.co_consts),
+            )
+        )
+    if isinstance(value, partial):
+        return repr(
+            (
+                _stable_repr(value.func, seen),
+                _stable_repr(value.args, seen),
+                _stable_repr(value.keywords, seen),
+            )
+        )
+    if isinstance(value, types.FunctionType):
+        if id(value) in seen:
+            return objective_name(value)
+        seen.add(id(value))
+
+        # globals read by the function and by the functions nested in it
+        names = set()
+        codes = [value.__code__]
+        while codes:
+            code = codes.pop()
+            names.update(code.co_names)
+            codes.extend(c for c in code.co_consts if isinstance(c, types.CodeType))
+        read = {
+            name: value.__globals__[name]
+            for name in sorted(names)
+            if name in value.__globals__
+        }
+        closure = [cell.cell_contents for cell in value.__closure__ or ()]
+
+        return repr(
+            (
+                objective_name(value),
+                _stable_repr(value.__code__, seen),
+                _stable_repr(value.__defaults__, seen),
+                _stable_repr(value.__kwdefaults__, seen),
+                _stable_repr(closure, seen),
+                _stable_repr(read, seen),
+            )
+        )
+
+    raise ValueError(
+        f"Cannot cache an objective depending on a {type(value).__name__}, "
+        "which has no stable representation"
+    )
+
+
+# dtype of the chromosomes
+CHROMOSOME_DTYPE = np.int32
+# RSU linked to an ES which is not in the network
+NO_RSU = -1
+
+
+def split_chromosome(chromosome: np.ndarray, n_rsus: int) -> tuple:
+    """Returns views on the two blocks of a chromosome.
+    A chromosome is a flat integer array: the (X, Y) coordinates of each RSU of the
+    scenario, followed by the position of the RSU linked to each ES of the scenario.
+    The RSUs and ESs are in the order of the scenario banks.
+
+    Args:
+        chromosome (np.ndarray): chromosome of an individual.
+        n_rsus (int): number of RSUs of the scenario.
+
+    Returns:
+        tuple: (M, 2) coordinates of the RSUs and (W,) positions of the RSUs linked to the ESs.
+    """
+    return chromosome[: 2 * n_rsus].reshape(n_rsus, 2), chromosome[2 * n_rsus :]
 
 
-def network_to_chromosome(network):
+def network_to_chromosome(network, scenario: Scenario) -> np.ndarray:
     """Converts a network to a chromosome.
 
     Args:
         network (list): list of RSU composing the network.
+        scenario (Scenario): scenario the network is a solution of.
 
     Returns:
-        list: chromosome of the individual.
+        np.ndarray: chromosome of the individual, see `split_chromosome`.
     """
-    # get the list of RSU from the chromosome
-    rsus = [rsu for rsu in network]
-    # get the list of ES from the chromosome
-    es_rsus = [rsu for rsu in network if rsu.ES != "AP"]
+    rsu_positions = {ID: i for i, ID in enumerate(scenario.rsus["ID"].tolist())}
+    es_positions = {ID: k for k, ID in enumerate(scenario.ess["ID"].tolist())}
 
-    # sort the first list of RSU by RSU ID
-    rsus.sort(key=lambda x: x.ID)
-    # sort the second list of RSU by ES ID
-    es_rsus.sort(key=lambda x: x.ES.ID)
+    chromosome = np.empty(2 * scenario.n_rsus + scenario.n_ess, dtype=CHROMOSOME_DTYPE)
+    coordinates, links = split_chromosome(chromosome, scenario.n_rsus)
 
-    # get the coordinates of each RSU in rsus + es_rsus
-    rsu_coordinates = [(rsu.ID, rsu.X, rsu.Y) for rsu in rsus]
-    es_rsu_link = [(rsu.ES.ID, rsu.ID) for rsu in es_rsus]
+    # the RSUs which are not in the network keep their coordinates of the bank
+    coordinates[:, 0] = scenario.rsus["X"]
+    coordinates[:, 1] = scenario.rsus["Y"]
+    links[:] = NO_RSU
 
-    return rsu_coordinates + es_rsu_link
+    for rsu in network:
+        i = rsu_positions[rsu.ID]
+        coordinates[i] = rsu.X, rsu.Y
+        if rsu.ES != "AP":
+            links[es_positions[rsu.ES.ID]] = i
 
+    return chromosome
 
-def chromosome_to_network(chromosome):
+
+def chromosome_to_network(chromosome: np.ndarray, scenario: Scenario) -> list:
     """Converts a chromosome to a network.
+    The network is made of new RSU and ES objects, created from the scenario.
+    If several ESs are linked to the same RSU, the RSU gets the last one.
 
     Args:
-        rsu_bank (list): list of RSU.
-        es_bank (list): list of ES.
-        chromosome (list): chromosome of the individual.
+        chromosome (np.ndarray): chromosome of the individual.
+        scenario (Scenario): scenario the chromosome is a solution of.
 
     Returns:
         list: list of RSU.
     """
-    # get the instances of the RSU and ES classes
-    rsu_bank = RSU.global_rsu
-    es_bank = ES.global_es
-
-    number_of_rsus = len(rsu_bank)
-
-    # get the list of RSU from the chromosome
-    chromosome_rsu_info = chromosome[:number_of_rsus]
-    # get the list of ES from the chromosome
-    chromosome_es_info = chromosome[number_of_rsus:]
+    # create the RSU and ES of the network
+    rsu_bank = scenario.new_rsus()
+    es_bank = scenario.new_ess()
 
-    # update the coordinates of the RSUs
-    # if the first element of the tuple is the same as the RSU ID, update the coordinates
-    for rsu in rsu_bank:
-        for gene in chromosome_rsu_info:
-            if rsu.ID == gene[0]:
-                rsu.X = gene[1]
-                rsu.Y = gene[2]
+    coordinates, links = split_chromosome(chromosome, len(rsu_bank))
 
-    # set all the RSUs to be APs
-    for rsu in rsu_bank:
+    # update the coordinates of the RSUs, and set all of them to be APs
+    for rsu, (x, y) in zip(rsu_bank, coordinates.tolist()):
+        rsu.X = x
+        rsu.Y = y
         rsu.ES = "AP"
 
-    # update the ES of the RSUs
-    # if the first element of the tuple is the same as the ES ID, update the ES
-    for rsu in rsu_bank:
-        for gene in chromosome_es_info:
-            if rsu.ID == gene[1]:
-                for es in es_bank:
-                    if es.ID == gene[0]:
-                        rsu.ES = es
+    # update the ES of the linked RSUs
+    for es, i in zip(es_bank, links.tolist()):
+        if i != NO_RSU:
+            rsu_bank[i].ES = es
 
     return rsu_bank
 
 
-def fitness(network):
-    """Computes the fitness of the individual.
+def random_chromosome(scenario: Scenario, rng: np.random.Generator = None) -> np.ndarray:
+    """Generates a random chromosome, like `get_random_network`: random coordinates
+    for every RSU, and every ES linked to a different random RSU.
+
+    Args:
+        scenario (Scenario): scenario the chromosome is a solution of.
+        rng (np.random.Generator): random generator, the global one if None.
+
+    Returns:
+        np.ndarray: chromosome, see `split_chromosome`.
+    """
+    chromosome = np.empty(2 * scenario.n_rsus + scenario.n_ess, dtype=CHROMOSOME_DTYPE)
+    coordinates, links = split_chromosome(chromosome, scenario.n_rsus)
+
+    if rng is None:
+        coordinates[:] = np.random.randint(0, 100, size=coordinates.shape)
+        links[:] = np.random.permutation(scenario.n_rsus)[: scenario.n_ess]
+    else:
+        coordinates[:] = rng.integers(0, 100, size=coordinates.shape)
+        links[:] = rng.permutation(scenario.n_rsus)[: scenario.n_ess]
+
+    return chromosome
+
+
+def network_metrics(
+    network,
+    scenario: Scenario,
+    backend="tick",
+    servers="single",
+    policy="migrate",
+    rng: np.random.Generator = None,
+) -> dict:
+    """Runs the offloading of the tasks of a scenario on a network, and computes its metrics.
 
     Args:
         network (list): list of RSU.
+        scenario (Scenario): scenario the network is evaluated on.
+        backend (str): offloading backend, see `task_offloading`.
+        servers (str): server model of the RSUs, see `task_offloading`.
+        policy: migration policy of the tasks, see `task_offloading`.
+        rng (np.random.Generator): random generator of the offloading, see `task_offloading`.
 
     Returns:
-        list: fitness of the individual.
+        dict: metrics of the offloading, see `offloading_metrics`.
     """
-    # get all instances of the Task class
-    tasks_bank = Task.global_task
+    # create the tasks of this evaluation
+    tasks_bank = scenario.new_tasks()
 
-    # reset the history of the tasks and RSUs
+    # reset the history of the RSUs
     fresh_network, fresh_tasks = reset_history(network, tasks_bank)
 
-    final_tasks = task_offloading(network=fresh_network, tasks_bank=fresh_tasks)
+    # the statistics are gathered as the computations start, without another pass
+    stats = OffloadingStats(fresh_network, servers)
+    task_offloading(
+        network=fresh_network,
+        tasks_bank=fresh_tasks,
+        backend=backend,
+        servers=servers,
+        policy=policy,
+        rng=rng,
+        stats=stats,
+    )
+
+    return stats.metrics()
+
+
+def fitness(
+    network,
+    scenario: Scenario,
+    backend="tick",
+    servers="single",
+    policy="migrate",
+    objectives=OBJECTIVES,
+    rng: np.random.Generator = None,
+):
+    """Computes the fitness of the individual.
+
+    Args:
+        network (list): list of RSU.
+        scenario (Scenario): scenario the network is evaluated on.
+        backend (str): offloading backend, see `task_offloading`.
+        servers (str): server model of the RSUs, see `task_offloading`.
+        policy: migration policy of the tasks, see `task_offloading`.
+        objectives (tuple): metrics of the fitness, names of `METRICS` or functions of
+            the dict of the metrics.
+        rng (np.random.Generator): random generator of the offloading, see `task_offloading`.
 
-    # get the max COMPUTATION_HISTORY of all the tasks
-    max_computation = max(task.COMPUTATION_HISTORY for task in final_tasks)
-    # get the max MIGRATION_HISTORY of all the tasks
-    max_migration = max(task.MIGRATION_HISTORY for task in final_tasks)
+    Returns:
+        tuple: fitness of the individual, by default the max computation time and the max
+            migration time of the tasks.
+    """
+    unknown = [
+        objective
+        for objective in objectives
+        if not callable(objective) and objective not in METRICS
+    ]
+    if unknown:
+        raise ValueError(f"Unknown metrics: {unknown}")
 
-    return max_computation, max_migration
+    metrics = network_metrics(network, scenario, backend, servers, policy, rng)
+
+    return tuple(
+        objective(metrics) if callable(objective) else metrics[objective]
+        for objective in objectives
+    )
 
 
 def reset_history(network, tasks_bank):
@@ -172,9 +459,15 @@ def reset_history(network, tasks_bank):
     """
     # reset the tasks
     for task in tasks_bank:
+        task.X = task.ORIGIN_X
+        task.Y = task.ORIGIN_Y
         task.COMPUTATION_HISTORY = 0
         task.MIGRATION_HISTORY = 0
         task.MIGRATION_TIME = 0
+        task.MIGRATIONS = 0
+        task.START_TIME = None
+        task.WAITING = False
+        task.RSU = None
         task.COMPLETED = False
         task.RSU_HISTORY = []
 
@@ -182,232 +475,1228 @@ def reset_history(network, tasks_bank):
     for rsu in network:
         rsu.STATE = "IDLE"
         rsu.END_TIME = None
+        rsu.SLOTS = []
+        rsu.QUEUE.clear()
 
     return network, tasks_bank
 
 
-def crossing(parent_1: Individual, parent_2: Individual) -> tuple:
-    """Crosses two individuals.
+def cross_chromosomes(
+    chromosome_1: np.ndarray,
+    chromosome_2: np.ndarray,
+    n_rsus: int,
+    rng: np.random.Generator = None,
+) -> tuple:
+    """Crosses two chromosomes with a one point crossover.
+    The crossover point is drawn among the genes, a gene being the coordinates of an RSU
+    or the RSU linked to an ES.
 
     Args:
-        parent_1 (Individual): first parent.
-        parent_2 (Individual): second parent.
+        chromosome_1 (np.ndarray): first chromosome.
+        chromosome_2 (np.ndarray): second chromosome.
+        n_rsus (int): number of RSUs of the scenario.
+        rng (np.random.Generator): random generator, the global one if None.
 
     Returns:
-        Individual: child.
+        tuple: the two child chromosomes.
     """
-    # get the chromosome of the parents
-    chromosome_1 = parent_1.chromosome.copy()
-    chromosome_2 = parent_2.chromosome.copy()
-
     # get the number of genes of the chromosomes
-    number_of_genes = len(chromosome_1)
+    number_of_genes = len(chromosome_1) - n_rsus
 
-    # get the crossover point
-    crossover_point = random.randint(0, number_of_genes - 1)
+    # get the crossover point, and its position in the array
+    crossover_point = random_integer(rng, 0, number_of_genes)
+    crossover_point += min(crossover_point, n_rsus)
 
     # create child chromosome 1
-    child_chromosome_1 = chromosome_1[:crossover_point] + chromosome_2[crossover_point:]
+    child_chromosome_1 = np.concatenate(
+        (chromosome_1[:crossover_point], chromosome_2[crossover_point:])
+    )
     # create child chromosome 2
-    child_chromosome_2 = chromosome_2[:crossover_point] + chromosome_1[crossover_point:]
+    child_chromosome_2 = np.concatenate(
+        (chromosome_2[:crossover_point], chromosome_1[crossover_point:])
+    )
+
+    return child_chromosome_1, child_chromosome_2
+
+
+def crossing(
+    parent_1: Individual,
+    parent_2: Individual,
+    scenario: Scenario,
+    rng: np.random.Generator = None,
+) -> tuple:
+    """Crosses two individuals.
+
+    Args:
+        parent_1 (Individual): first parent.
+        parent_2 (Individual): second parent.
+        scenario (Scenario): scenario the children are evaluated on.
+        rng (np.random.Generator): random generator, the global one if None.
+
+    Returns:
+        Individual: child.
+    """
+    # get the chromosome of the children
+    child_chromosome_1, child_chromosome_2 = cross_chromosomes(
+        parent_1.chromosome, parent_2.chromosome, scenario.n_rsus, rng
+    )
 
     # create a network and Individual from the child chromosome 1
-    child_network_1 = chromosome_to_network(child_chromosome_1)
-    child_1 = Individual(child_network_1)
+    child_network_1 = chromosome_to_network(child_chromosome_1, scenario)
+    child_1 = Individual(child_network_1, scenario=scenario)
 
     # create a network and Individual from the child chromosome 2
-    child_network_2 = chromosome_to_network(child_chromosome_2)
-    child_2 = Individual(child_network_2)
+    child_network_2 = chromosome_to_network(child_chromosome_2, scenario)
+    child_2 = Individual(child_network_2, scenario=scenario)
 
     return child_1, child_2
 
 
-def mutation(individual: Individual) -> Individual:
+def mutate_chromosome(
+    chromosome: np.ndarray, n_rsus: int, rng: np.random.Generator = None
+) -> np.ndarray:
+    """Mutates a chromosome, either the coordinates of an RSU or the RSU linked to an ES.
+
+    Args:
+        chromosome (np.ndarray): chromosome to be mutated.
+        n_rsus (int): number of RSUs of the scenario.
+        rng (np.random.Generator): random generator, the global one if None.
+
+    Returns:
+        np.ndarray: mutated chromosome.
+    """
+    chromosome = chromosome.copy()
+    coordinates, links = split_chromosome(chromosome, n_rsus)
+
+    # get the number of genes of the chromosome
+    number_of_genes = n_rsus + len(links)
+
+    # get the mutation point
+    mutation_point = random_integer(rng, 0, number_of_genes)
+
+    # if the gene is in the first block, create new coordinates for the RSU
+    if mutation_point < n_rsus:
+        coordinates[mutation_point] = (
+            random_integer(rng, 0, 101),
+            random_integer(rng, 0, 101),
+        )
+
+    # else, link the ES to a random RSU that is not already connected to an ES
+    else:
+        free_rsus = np.setdiff1d(np.arange(n_rsus), links)
+        links[mutation_point - n_rsus] = free_rsus[random_integer(rng, 0, len(free_rsus))]
+
+    return chromosome
+
+
+def mutation(
+    individual: Individual, scenario: Scenario, rng: np.random.Generator = None
+) -> Individual:
     """Mutates an individual.
 
     Args:
         individual (Individual): individual to be mutated.
+        scenario (Scenario): scenario the mutated individual is evaluated on.
+        rng (np.random.Generator): random generator, the global one if None.
 
     Returns:
         Individual: mutated individual.
     """
-    # get the chromosome of the individual
-    chromosome = individual.chromosome.copy()
+    chromosome = mutate_chromosome(individual.chromosome, scenario.n_rsus, rng)
 
-    # get the number of genes of the chromosome
-    number_of_genes = len(chromosome)
+    network = chromosome_to_network(chromosome, scenario)
 
-    # get the mutation point
-    mutation_point = random.randint(0, number_of_genes - 1)
+    return Individual(network, scenario=scenario)
+
+
+# scenario and offloading options of the worker processes, set once by _init_worker
+_worker_state = {}
+
+
+def _init_worker(
+    scenario: Scenario,
+    backend,
+    servers="single",
+    policy="migrate",
+    objectives=OBJECTIVES,
+):
+    """Initializes a worker process of the evaluation pool.
+
+    Args:
+        scenario (Scenario): scenario the chromosomes are evaluated on.
+        backend (str): offloading backend, see `task_offloading`.
+        servers (str): server model of the RSUs, see `task_offloading`.
+        policy: migration policy of the tasks, see `task_offloading`.
+        objectives (tuple): names of the metrics of the fitness, see `fitness`.
+    """
+    _worker_state["scenario"] = scenario
+    _worker_state["backend"] = backend
+    _worker_state["servers"] = servers
+    _worker_state["policy"] = policy
+    _worker_state["objectives"] = objectives
+
+
+def _evaluate_in_worker(job: tuple) -> tuple:
+    """Computes the fitness of a chromosome in a worker process.
+
+    Args:
+        job (tuple): chromosome and seed of the evaluation.
+
+    Returns:
+        tuple: fitness of the chromosome, and number of time units simulated.
+    """
+    chromosome, seed = job
+    ticks = SIMULATION_COUNTERS["ticks"]
+
+    fitness_values = evaluate_chromosome(
+        chromosome,
+        _worker_state["scenario"],
+        seed,
+        _worker_state["backend"],
+        _worker_state["servers"],
+        _worker_state["policy"],
+        _worker_state["objectives"],
+    )
+
+    return fitness_values, SIMULATION_COUNTERS["ticks"] - ticks
+
+
+def evaluation_pool(
+    scenario: Scenario,
+    n_jobs: int,
+    backend="tick",
+    servers="single",
+    policy="migrate",
+    objectives=OBJECTIVES,
+) -> ProcessPoolExecutor:
+    """Creates a pool of processes to evaluate chromosomes, see `evaluate_chromosomes`.
+    The workers only receive the columns of the scenario, once.
+
+    Args:
+        scenario (Scenario): scenario the chromosomes are evaluated on.
+        n_jobs (int): number of worker processes.
+        backend (str): offloading backend, see `task_offloading`.
+        servers (str): server model of the RSUs, see `task_offloading`.
+        policy: migration policy of the tasks, see `task_offloading`.
+        objectives (tuple): names of the metrics of the fitness, see `fitness`.
+
+    Returns:
+        ProcessPoolExecutor: the pool, to be shut down by the caller.
+    """
+    return ProcessPoolExecutor(
+        max_workers=n_jobs,
+        initializer=_init_worker,
+        initargs=(scenario, backend, servers, policy, objectives),
+    )
+
+
+def evaluate_chromosome(
+    chromosome,
+    scenario: Scenario,
+    seed,
+    backend="tick",
+    servers="single",
+    policy="migrate",
+    objectives=OBJECTIVES,
+) -> tuple:
+    """Computes the fitness of a chromosome, with its own random generator.
+    The offloading draws from a generator created from the seed for this evaluation
+    only, so the fitness does not depend on any other draw, here or in another process.
+
+    Args:
+        chromosome (np.ndarray): chromosome to be evaluated.
+        scenario (Scenario): scenario the chromosome is evaluated on.
+        seed (int or np.random.SeedSequence): seed of the evaluation.
+        backend (str): offloading backend, see `task_offloading`.
+        servers (str): server model of the RSUs, see `task_offloading`.
+        policy: migration policy of the tasks, see `task_offloading`.
+        objectives (tuple): names of the metrics of the fitness, see `fitness`.
+
+    Returns:
+        tuple: fitness of the chromosome.
+    """
+    rng = np.random.default_rng(seed)
+
+    network = chromosome_to_network(chromosome, scenario)
+
+    return fitness(network, scenario, backend, servers, policy, objectives, rng)
+
+
+def canonical_chromosome(chromosome: np.ndarray, n_rsus: int) -> np.ndarray:
+    """Returns the canonical form of a chromosome.
+    When several ESs are linked to the same RSU, only the last one is kept linked,
+    so chromosomes giving the same network have the same canonical form.
+
+    Args:
+        chromosome (np.ndarray): chromosome of an individual.
+        n_rsus (int): number of RSUs of the scenario.
+
+    Returns:
+        np.ndarray: the canonical chromosome.
+    """
+    canonical = chromosome.astype(np.int64)
+    _, links = split_chromosome(canonical, n_rsus)
+
+    # keep the last ES linked to each RSU
+    reversed_links = links[::-1]
+    _, last = np.unique(reversed_links, return_index=True)
+    overwritten = np.ones(len(links), dtype=bool)
+    overwritten[len(links) - 1 - last] = False
+    links[overwritten] = NO_RSU
+
+    return canonical
+
+
+def _plain(value):
+    """Converts a NumPy scalar to the equivalent Python scalar, and a seed sequence
+    to the values which define its stream.
+    """
+    if isinstance(value, np.random.SeedSequence):
+        return (value.entropy, value.spawn_key, value.pool_size)
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class FitnessCache:
+    """LRU cache of the fitness of chromosomes.
+    The key of a chromosome is a hash of its canonical form, the seed of its evaluation,
+    the scenario and the offloading options, so a hit gives exactly the fitness the
+    offloading would have computed.
+
+    Attributes:
+        maxsize (int): maximum number of fitness values kept.
+        path (str): file the cache is loaded from and saved to, None to keep it in memory.
+        hits (int): number of lookups which found a fitness.
+        misses (int): number of lookups which did not find a fitness.
+    """
 
-    # get the gene to be mutated
-    gene = chromosome[mutation_point]
+    def __init__(self, maxsize=100_000, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+        if path is not None and os.path.exists(path):
+            with open(path, "rb") as file:
+                for key, value in pickle.load(file).items():
+                    self.put(key, value)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of the lookups which found a fitness."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @staticmethod
+    def key(
+        chromosome,
+        n_rsus: int,
+        seed,
+        fingerprint: str,
+        backend="tick",
+        servers="single",
+        policy="migrate",
+        objectives=OBJECTIVES,
+    ) -> str:
+        """Returns the key of the evaluation of a chromosome.
 
-    # get the length of the gene
-    gene_length = len(gene)
+        Args:
+            chromosome (np.ndarray): chromosome of an individual.
+            n_rsus (int): number of RSUs of the scenario.
+            seed (int or np.random.SeedSequence): seed of the evaluation.
+            fingerprint (str): fingerprint of the scenario, see `Scenario.fingerprint`.
+            backend (str): offloading backend, see `task_offloading`.
+            servers (str): server model of the RSUs, see `task_offloading`.
+            policy: migration policy of the tasks, see `task_offloading`.
+            objectives (tuple): metrics of the fitness, see `fitness`, the functions
+                being keyed on their behaviour, see `objective_key`.
 
-    # if the gene is a tuple of 3 elements, it is a RSU
-    if gene_length == 3:
-        # create new coordinates for the RSU
-        new_X = random.randint(0, 100)
-        new_Y = random.randint(0, 100)
+        Returns:
+            str: hexadecimal digest.
+        """
+        digest = hashlib.sha1(canonical_chromosome(chromosome, n_rsus).tobytes())
+        # the default options keep the keys they had before there was a choice
+        options = (_plain(seed), fingerprint, backend)
+        if servers != "single" or repr(get_policy(policy)) != repr(AlwaysMigrate()):
+            options += (servers, repr(get_policy(policy)))
+        if tuple(objectives) != OBJECTIVES:
+            options += (tuple(objective_key(objective) for objective in objectives),)
+        digest.update(repr(options).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """Returns the fitness of a key, None if it is not in the cache.
 
-        # replace the old coordinates with the new ones
-        chromosome[mutation_point] = (gene[0], new_X, new_Y)
+        Args:
+            key (str): key of the evaluation.
 
-    # if the gene is a tuple of 2 elements, it is an ES
-    elif gene_length == 2:
-        # get the list of RSU IDs
-        rsu_ids = [rsu.ID.copy() for rsu in RSU.global_rsu]
+        Returns:
+            tuple: fitness, or None.
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
 
-        # get the list of RSU IDs that are already connected to an ES
-        connected_rsu_ids = [gene[1] for gene in chromosome if len(gene) == 2]
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
 
-        # choose a random RSU ID that is not already connected to an ES
-        new_rsu_id = random.choice(list(set(rsu_ids) - set(connected_rsu_ids)))
+    def put(self, key: str, value: tuple):
+        """Adds the fitness of a key, evicting the least recently used one if the cache is full.
 
-        # replace the old RSU ID with the new one
-        chromosome[mutation_point] = (gene[0], new_rsu_id)
+        Args:
+            key (str): key of the evaluation.
+            value (tuple): fitness.
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def save(self):
+        """Writes the cache to its file, if it has one."""
+        if self.path is None:
+            return
+
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "wb") as file:
+            pickle.dump(dict(self._entries), file)
+        os.replace(temporary_path, self.path)
+
+
+def evaluate_chromosomes(
+    chromosomes: list,
+    scenario: Scenario,
+    seeds: list,
+    pool=None,
+    chunksize=1,
+    backend="tick",
+    cache: FitnessCache = None,
+    servers="single",
+    policy="migrate",
+    objectives=OBJECTIVES,
+) -> list:
+    """Computes the fitness of a batch of chromosomes.
+    Each evaluation draws from its own generator, created from its seed (see
+    `evaluate_chromosome`), so the fitness of a chromosome only depends on its seed,
+    whether it is evaluated here or in any worker of the pool. Independent streams
+    for each chromosome are given by the children of a seed sequence, for instance
+    `np.random.SeedSequence(seed).spawn(len(chromosomes))`.
+    With a cache, only the chromosomes not found in it are evaluated, each of them once.
 
-    network = chromosome_to_network(chromosome)
+    Args:
+        chromosomes (list): list of chromosomes.
+        scenario (Scenario): scenario the chromosomes are evaluated on, must be
+            the scenario of the pool if there is one.
+        seeds (list): seed of the evaluation of each chromosome, integers or
+            `np.random.SeedSequence`.
+        pool (ProcessPoolExecutor): pool created by `evaluation_pool`,
+            the chromosomes are evaluated in this process if None.
+        chunksize (int): number of chromosomes sent to a worker at a time.
+        backend (str): offloading backend, see `task_offloading`.
+        cache (FitnessCache): cache of the fitness values, or None.
+        servers (str): server model of the RSUs, see `task_offloading`, must be
+            the server model of the pool if there is one.
+        policy: migration policy of the tasks, see `task_offloading`, must be
+            the policy of the pool if there is one.
+        objectives (tuple): names of the metrics of the fitness, see `fitness`, must be
+            the objectives of the pool if there is one.
 
-    return Individual(network)
+    Returns:
+        list: fitness of each chromosome.
+    """
+    options = (backend, servers, policy, objectives)
+    if cache is None:
+        return _evaluate_batch(chromosomes, scenario, seeds, pool, chunksize, options)
+
+    fingerprint = scenario.fingerprint()
+    keys = [
+        cache.key(chromosome, scenario.n_rsus, seed, fingerprint, *options)
+        for chromosome, seed in zip(chromosomes, seeds)
+    ]
+
+    # look up the cache, and keep the first position of each missing key
+    fitness_values = [None] * len(chromosomes)
+    missing = {}
+    for i, key in enumerate(keys):
+        if key in missing:
+            cache.hits += 1
+            continue
+        fitness_values[i] = cache.get(key)
+        if fitness_values[i] is None:
+            missing[key] = i
+
+    # evaluate the missing chromosomes
+    computed = _evaluate_batch(
+        [chromosomes[i] for i in missing.values()],
+        scenario,
+        [seeds[i] for i in missing.values()],
+        pool,
+        chunksize,
+        options,
+    )
+    computed = dict(zip(missing, computed))
+    for key, value in computed.items():
+        cache.put(key, value)
+
+    return [
+        value if value is not None else computed[key]
+        for key, value in zip(keys, fitness_values)
+    ]
+
+
+def _evaluate_batch(
+    chromosomes: list, scenario: Scenario, seeds: list, pool, chunksize, options
+) -> list:
+    """Computes the fitness of a batch of chromosomes, see `evaluate_chromosomes`."""
+    if pool is not None:
+        results = list(
+            pool.map(_evaluate_in_worker, zip(chromosomes, seeds), chunksize=chunksize)
+        )
+        # the simulations of the workers are counted in this process
+        count_simulations(len(results), sum(ticks for _, ticks in results))
+        return [fitness_values for fitness_values, _ in results]
+
+    return [
+        evaluate_chromosome(chromosome, scenario, seed, *options)
+        for chromosome, seed in zip(chromosomes, seeds)
+    ]
 
 
-def non_dominated_sorting(population):
+def non_dominated_sorting(population, signs=None):
     """Sorts the population by non-dominated sorting.
+    The ranks are computed on the array of the fitness values, see `non_dominated_ranks`.
 
     Args:
         population (list): list of individuals.
+        signs (np.ndarray): sign of each objective, see `parse_objectives`,
+            all the objectives are minimized if None.
 
     Returns:
-        list: list of individuals.
-    """
-    # initialize the fronts
-    fronts = []
-
-    # initialize the first front
-    front_1 = []
-
-    # for each individual in the population
-    for individual in population:
-        # initialize the number of individuals that dominate the individual
-        individual.number_of_dominating_individuals = 0
-        # initialize the list of individuals that are dominated by the individual
-        individual.dominated_individuals = []
-
-        # for each individual in the population
-        for other_individual in population:
-            # if the individual dominates the other individual
-            if individual.dominates(other_individual):
-                # add the other individual to the list of individuals that are dominated by the individual
-                individual.dominated_individuals.append(other_individual)
-            # if the other individual dominates the individual
-            elif other_individual.dominates(individual):
-                # increase the number of individuals that dominate the individual
-                individual.number_of_dominating_individuals += 1
-
-        # if the individual is not dominated by any other individual
-        if individual.number_of_dominating_individuals == 0:
-            # add the individual to the first front
-            front_1.append(individual)
-
-    # add the first front to the list of fronts
-    fronts.append(front_1)
-
-    # for each front
-    for front in fronts:
-        # for each individual in the front
-        for individual in front:
-            # for each individual that is dominated by the individual
-            for dominated_individual in individual.dominated_individuals:
-                # decrease the number of individuals that dominate the dominated individual
-                dominated_individual.number_of_dominating_individuals -= 1
-
-                # if the dominated individual is not dominated by any other individual
-                if dominated_individual.number_of_dominating_individuals == 0:
-                    # add the dominated individual to the next front
-                    fronts.append([dominated_individual])
-
-    # update the ranks of the individuals
-    for i in range(len(fronts)):
-        for individual in fronts[i]:
-            individual.rank = i + 1
+        list: list of fronts, each front being a list of individuals.
+    """
+    if not population:
+        return []
+
+    fitness_values = signed_fitness(population, signs)
+    ranks = non_dominated_ranks(fitness_values)
+
+    # group the individuals by front, keeping the order of the population
+    fronts = [[] for _ in range(ranks.max() + 1)]
+    for individual, rank in zip(population, ranks):
+        individual.rank = int(rank) + 1
+        fronts[rank].append(individual)
 
     return fronts
 
 
-def crowding_distance(fronts):
+def signed_fitness(population, signs=None) -> np.ndarray:
+    """Returns the fitness values of a population, as objectives to be minimized.
+
+    Args:
+        population (list): list of individuals.
+        signs (np.ndarray): sign of each objective, see `parse_objectives`,
+            all the objectives are minimized if None.
+
+    Returns:
+        np.ndarray: (N, number of objectives) fitness values times their sign.
+    """
+    fitness_values = np.array(
+        [individual.fitness for individual in population], dtype=float
+    )
+    if signs is None:
+        return fitness_values
+
+    return fitness_values * signs
+
+
+def non_dominated_ranks(fitness_values: np.ndarray, method="auto") -> np.ndarray:
+    """Computes the front of each solution, all the objectives being minimized.
+
+    Args:
+        fitness_values (np.ndarray): (N, number of objectives) fitness values.
+        method (str): "sweep" for the O(N log N) two objectives algorithm, "matrix" for the
+            dominance matrix algorithm, "auto" to use the sweep when there are two objectives.
+
+    Returns:
+        np.ndarray: index of the front of each solution, the first front being 0.
+    """
+    fitness_values = np.asarray(fitness_values, dtype=float)
+    if method == "auto":
+        method = "sweep" if fitness_values.shape[1] == 2 else "matrix"
+
+    if method == "sweep":
+        return _sweep_ranks(fitness_values)
+    elif method == "matrix":
+        return _matrix_ranks(fitness_values)
+    raise ValueError(f"Unknown non-dominated sorting method: {method}")
+
+
+def _sweep_ranks(fitness_values: np.ndarray) -> np.ndarray:
+    """Computes the fronts of two objectives solutions by sort and sweep.
+    Once sorted by the first then the second objective, a solution can only be dominated
+    by the solutions before it, and it is dominated by a front if and only if it is
+    dominated by the last solution added to that front. Those are checked by binary search.
+
+    Args:
+        fitness_values (np.ndarray): (N, 2) fitness values.
+
+    Returns:
+        np.ndarray: index of the front of each solution.
+    """
+    order = np.lexsort((fitness_values[:, 1], fitness_values[:, 0]))
+    first = fitness_values[order, 0].tolist()
+    second = fitness_values[order, 1].tolist()
+
+    ranks = np.empty(len(order), dtype=np.int64)
+    # last solution added to each front
+    last_first = []
+    last_second = []
+
+    for position, solution in enumerate(order.tolist()):
+        f1, f2 = first[position], second[position]
+
+        # find the first front which does not dominate the solution
+        low, high = 0, len(last_second)
+        while low < high:
+            middle = (low + high) // 2
+            if last_second[middle] < f2 or (
+                last_second[middle] == f2 and last_first[middle] < f1
+            ):
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == len(last_second):
+            last_first.append(f1)
+            last_second.append(f2)
+        else:
+            last_first[low] = f1
+            last_second[low] = f2
+        ranks[solution] = low
+
+    return ranks
+
+
+def _matrix_ranks(fitness_values: np.ndarray, block_size=2**22) -> np.ndarray:
+    """Computes the fronts of solutions with any number of objectives from their dominance matrix.
+
+    Args:
+        fitness_values (np.ndarray): (N, number of objectives) fitness values.
+        block_size (int): maximum number of comparisons held in memory at once.
+
+    Returns:
+        np.ndarray: index of the front of each solution.
+    """
+    n, n_objectives = fitness_values.shape
+
+    # dominance[i, j] is True if the solution i dominates the solution j,
+    # computed by blocks of rows to bound the memory of the comparisons
+    dominance = np.empty((n, n), dtype=bool)
+    rows = max(1, block_size // max(1, n * n_objectives))
+    for start in range(0, n, rows):
+        block = fitness_values[start : start + rows, None, :]
+        dominance[start : start + rows] = (block <= fitness_values[None]).all(
+            axis=2
+        ) & (block < fitness_values[None]).any(axis=2)
+
+    # number of solutions dominating each solution
+    dominated_by = dominance.sum(axis=0)
+
+    ranks = np.full(n, -1, dtype=np.int64)
+    front = np.flatnonzero(dominated_by == 0)
+    rank = 0
+    while front.size:
+        ranks[front] = rank
+        # remove the front, and free the solutions which were only dominated by it
+        dominated_by -= dominance[front].sum(axis=0)
+        dominated_by[front] = -1
+        front = np.flatnonzero(dominated_by == 0)
+        rank += 1
+
+    return ranks
+
+
+def crowding_distance(fronts, signs=None):
     """Calculates the crowding distance of each individual in the population.
 
     Args:
         fronts (list): list of fronts.
+        signs (np.ndarray): sign of each objective, see `parse_objectives`,
+            all the objectives are minimized if None.
 
     Returns:
         list: list of fronts with updated crowding distances.
     """
+    population = [individual for front in fronts for individual in front]
+    if not population:
+        return fronts
 
-    # initialize the crowding distance of each individual to 0
-    for front in fronts:
-        for individual in front:
-            individual.crowding_distance = 0
-
-    # for each objective
-    for objective in range(2):
-        # for each front
-        for front in fronts:
-            # sort the individuals in the front by the objective
-            front.sort(key=lambda x: x.fitness[objective])
-
-            # set the crowding distance of the first and last individual to infinity
-            front[0].crowding_distance = float("inf")
-            front[-1].crowding_distance = float("inf")
-
-            # calculate the crowding distance of the other individuals
-            for i in range(1, len(front) - 1):
-                # if the fitness of the first and last individual is the same, set the crowding distance to 0 for all individuals in the front
-                if front[0].fitness[objective] == front[-1].fitness[objective]:
-                    for individual in front:
-                        individual.crowding_distance = 0
-                    break
-                front[i].crowding_distance += (
-                    front[i + 1].fitness[objective] - front[i - 1].fitness[objective]
-                ) / (front[-1].fitness[objective] - front[0].fitness[objective])
+    fitness_values = signed_fitness(population, signs)
+    ranks = np.repeat(np.arange(len(fronts)), [len(front) for front in fronts])
+
+    for individual, distance in zip(
+        population, crowding_distances(fitness_values, ranks)
+    ):
+        individual.crowding_distance = distance
 
     return fronts
 
 
-def tournament_selection(population, tournament_size):
+def crowding_distances(fitness_values: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """Computes the crowding distance of each solution within its front.
+    For each objective, the solutions at the ends of a front get an infinite distance,
+    and the others the normalized distance between their two neighbours. An objective
+    with the same value over a whole front adds nothing to the distances in that front.
+
+    Args:
+        fitness_values (np.ndarray): (N, number of objectives) fitness values.
+        ranks (np.ndarray): index of the front of each solution.
+
+    Returns:
+        np.ndarray: crowding distance of each solution.
+    """
+    fitness_values = np.asarray(fitness_values, dtype=float)
+    ranks = np.asarray(ranks)
+    n = len(ranks)
+    distances = np.zeros(n)
+
+    for objective in range(fitness_values.shape[1]):
+        # sort the solutions by front, then by the objective
+        order = np.lexsort((fitness_values[:, objective], ranks))
+        values = fitness_values[order, objective]
+        sorted_ranks = ranks[order]
+
+        # first and last solution of each front
+        first = np.ones(n, dtype=bool)
+        first[1:] = sorted_ranks[1:] != sorted_ranks[:-1]
+        last = np.ones(n, dtype=bool)
+        last[:-1] = first[1:]
+
+        # range of the objective over the front of each solution
+        front = np.cumsum(first) - 1
+        span = values[last][front] - values[first][front]
+
+        # normalized distance between the two neighbours of the solutions inside a front
+        gaps = np.zeros(n)
+        gaps[1:-1] = values[2:] - values[:-2]
+        inside = ~first & ~last & (span > 0)
+        gaps[inside] /= span[inside]
+        gaps[~inside] = 0
+
+        distances[order] += gaps
+        distances[order[first | last]] = np.inf
+
+    return distances
+
+
+def environmental_selection(fitness_values: np.ndarray, size: int) -> tuple:
+    """Selects the survivors of a generation, by front then by decreasing crowding distance.
+
+    Args:
+        fitness_values (np.ndarray): (N, number of objectives) fitness values.
+        size (int): number of survivors.
+
+    Returns:
+        tuple: indices of the survivors, and the front index and crowding distance
+            of every solution.
+    """
+    ranks = non_dominated_ranks(fitness_values)
+    distances = crowding_distances(fitness_values, ranks)
+
+    # lexsort is stable, so ties keep the order of the solutions
+    order = np.lexsort((-distances, ranks))
+
+    return order[:size], ranks, distances
+
+
+def hypervolume(fitness_values: np.ndarray, reference: np.ndarray) -> float:
+    """Computes the hypervolume dominated by a set of solutions, all the objectives being
+    minimized, and bounded by a reference point. The solutions which do not dominate the
+    reference point add nothing. Two objectives are swept in O(N log N), more objectives
+    are sliced along the last objective, which is only meant for small fronts.
+
+    Args:
+        fitness_values (np.ndarray): (N, number of objectives) fitness values.
+        reference (np.ndarray): (number of objectives,) reference point.
+
+    Returns:
+        float: the hypervolume.
+    """
+    fitness_values = np.asarray(fitness_values, dtype=float)
+    reference = np.asarray(reference, dtype=float)
+    fitness_values = fitness_values[(fitness_values < reference).all(axis=1)]
+    if len(fitness_values) == 0:
+        return 0.0
+
+    if fitness_values.shape[1] == 1:
+        return float(reference[0] - fitness_values[:, 0].min())
+
+    if fitness_values.shape[1] == 2:
+        # sweep the solutions by the first objective, keeping the best second objective
+        order = np.lexsort((fitness_values[:, 1], fitness_values[:, 0]))
+        volume = 0.0
+        best = reference[1]
+        for first, second in fitness_values[order].tolist():
+            if second < best:
+                volume += (reference[0] - first) * (best - second)
+                best = second
+        return volume
+
+    # slices between the successive values of the last objective
+    order = np.argsort(fitness_values[:, -1], kind="stable")
+    fitness_values = fitness_values[order]
+    bounds = np.append(fitness_values[:, -1], reference[-1])
+    volume = 0.0
+    for i in range(len(fitness_values)):
+        height = bounds[i + 1] - bounds[i]
+        if height > 0:
+            volume += height * hypervolume(fitness_values[: i + 1, :-1], reference[:-1])
+
+    return volume
+
+
+class ParetoArchive:
+    """External archive of the non-dominated solutions found during a run of `nsga2`.
+    The archive is updated as the offspring are evaluated, so a solution which was
+    truncated from the population is kept as long as nothing dominates it.
+    With two objectives, the solutions are kept sorted by the first objective (the second
+    one then decreases), so an insertion is found by binary search. With more objectives,
+    a new solution is compared to the whole archive at once. A solution equal to an archived
+    one is not added. When the archive is full, the most crowded solution is removed.
+
+    Attributes:
+        maxsize (int): maximum number of solutions.
+        signs (np.ndarray): sign of each objective, see `parse_objectives`.
+    """
+
+    def __init__(self, objectives=OBJECTIVES, maxsize=1000):
+        """Creates an empty archive.
+
+        Args:
+            objectives (list): objectives of the solutions, see `parse_objectives`.
+            maxsize (int): maximum number of solutions. Each objective has two extreme
+                solutions, which are never removed, so it must be at least 3 and twice
+                the number of objectives.
+
+        Raises:
+            ValueError: if maxsize is too small to keep the extreme solutions.
+        """
+        _, self.signs = parse_objectives(objectives)
+        if maxsize < max(3, 2 * len(self.signs)):
+            raise ValueError(
+                f"The archive must hold at least {max(3, 2 * len(self.signs))} "
+                f"solutions, got maxsize={maxsize}"
+            )
+        self.maxsize = maxsize
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._individuals)
+
+    def clear(self):
+        """Removes all the solutions from the archive."""
+        self._individuals = []
+        # signed objectives of the solutions, as lists of values
+        self._values = []
+        # first objective of each solution, sorted, when there are two objectives
+        self._first = []
+
+    @property
+    def individuals(self) -> list:
+        """Solutions of the archive, sorted by their first objective if there are two."""
+        return list(self._individuals)
+
+    def fitness_values(self) -> np.ndarray:
+        """Returns the (N, number of objectives) fitness values of the archive, signed."""
+        return np.array(self._values, dtype=float).reshape(-1, len(self.signs))
+
+    def add(self, individual: Individual) -> bool:
+        """Adds a solution to the archive, if no archived solution dominates it, and removes
+        the archived solutions it dominates.
+
+        Args:
+            individual (Individual): evaluated solution.
+
+        Returns:
+            bool: True if the solution was added.
+        """
+        values = (np.asarray(individual.fitness, dtype=float) * self.signs).tolist()
+
+        if len(values) == 2:
+            added = self._add_sorted(individual, values)
+        else:
+            added = self._add_any(individual, values)
+
+        if added and len(self) > self.maxsize:
+            self._remove_most_crowded()
+
+        return added
+
+    def update(self, population: list) -> int:
+        """Adds several solutions to the archive, in order.
+
+        Args:
+            population (list): list of evaluated individuals.
+
+        Returns:
+            int: number of solutions added.
+        """
+        return sum(self.add(individual) for individual in population)
+
+    def _add_sorted(self, individual: Individual, values: list) -> bool:
+        """Adds a solution of two objectives, see `add`."""
+        first, second = values
+
+        # the archived solution with the largest first objective not above the new one
+        # has the smallest second objective among them, so it is the only one to check
+        before = bisect.bisect_right(self._first, first) - 1
+        if before >= 0 and self._values[before][1] <= second:
+            return False
+
+        # the dominated solutions follow the new one in the archive
+        start = bisect.bisect_left(self._first, first)
+        end = start
+        while end < len(self._values) and self._values[end][1] >= second:
+            end += 1
+
+        self._individuals[start:end] = [individual]
+        self._values[start:end] = [values]
+        self._first[start:end] = [first]
+
+        return True
+
+    def _add_any(self, individual: Individual, values: list) -> bool:
+        """Adds a solution of any number of objectives, see `add`."""
+        new = np.array(values)
+        archived = self.fitness_values()
+
+        # an archived solution equal or better on every objective rejects the new one
+        if len(archived) and (archived <= new).all(axis=1).any():
+            return False
+
+        kept = ~((new <= archived).all(axis=1) & (new < archived).any(axis=1))
+        self._individuals = [self._individuals[i] for i in np.flatnonzero(kept)]
+        self._values = [self._values[i] for i in np.flatnonzero(kept)]
+        self._individuals.append(individual)
+        self._values.append(values)
+
+        return True
+
+    def _remove_most_crowded(self):
+        """Removes the solution with the smallest crowding distance, never an extreme one."""
+        distances = crowding_distances(self.fitness_values(), np.zeros(len(self), int))
+        i = int(np.argmin(distances))
+
+        del self._individuals[i]
+        del self._values[i]
+        if self._first:
+            del self._first[i]
+
+    def hypervolume(self, reference) -> float:
+        """Computes the hypervolume of the archive, see `hypervolume`.
+
+        Args:
+            reference (np.ndarray): reference point, signed like the archive.
+
+        Returns:
+            float: the hypervolume.
+        """
+        if len(self.signs) != 2:
+            return hypervolume(self.fitness_values(), reference)
+
+        # the archive is already sorted by the first objective
+        volume = 0.0
+        best = reference[1]
+        for first, second in self._values:
+            if first < reference[0] and second < best:
+                volume += (reference[0] - first) * (best - second)
+                best = second
+
+        return volume
+
+
+def _encode_array(value):
+    """Encodes the arrays of the state of a generator in JSON, see `save_checkpoint`.
+
+    Raises:
+        TypeError: if the value is neither an array nor a NumPy scalar.
+    """
+    if isinstance(value, np.ndarray):
+        return {"__ndarray__": value.tolist(), "dtype": value.dtype.str}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot store a {type(value).__name__} in a checkpoint")
+
+
+def _decode_array(value: dict):
+    """Decodes the arrays encoded by `_encode_array`."""
+    if "__ndarray__" in value:
+        return np.array(value["__ndarray__"], dtype=value["dtype"])
+    return value
+
+
+def save_checkpoint(path: str, state: dict):
+    """Writes the state of a run of `nsga2` to a compressed NumPy archive.
+    The file is replaced at once, so a run stopped while writing keeps its last checkpoint.
+
+    Args:
+        path (str): path of the checkpoint.
+        state (dict): arrays and numbers of the state, see `nsga2`. The states of the
+            random generators are stored as JSON, with their arrays (the key of a
+            MT19937 generator) stored as lists tagged with their dtype.
+    """
+    arrays = {}
+    for name, value in state.items():
+        if name.endswith("_state"):
+            value = json.dumps(value, default=_encode_array)
+        arrays[name] = np.asarray(value)
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        np.savez_compressed(file, **arrays)
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(path: str) -> dict:
+    """Reads the state of a run of `nsga2` written by `save_checkpoint`.
+
+    Args:
+        path (str): path of the checkpoint.
+
+    Returns:
+        dict: arrays and numbers of the state.
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        state = {}
+        for name in archive.files:
+            value = archive[name]
+            if name.endswith("_state"):
+                value = json.loads(value.item(), object_hook=_decode_array)
+            elif value.ndim == 0:
+                value = value.item()
+            state[name] = value
+
+    return state
+
+
+def tournament_selection(population, tournament_size, signs=None, rng=None):
     """Selects an individual from the population using tournament selection.
 
     Args:
         population (list): list of individuals.
         tournament_size (int): size of the tournament.
+        signs (np.ndarray): sign of each objective, see `parse_objectives`,
+            all the objectives are minimized if None.
+        rng (np.random.Generator): random generator, the global one if None.
 
     Returns:
         Individual: the selected individual.
     """
     # choose tournament_size individuals randomly from the population
-    tournament = random.sample(population, tournament_size)
+    random = np.random if rng is None else rng
+    tournament = [
+        population[i]
+        for i in random.choice(len(population), tournament_size, replace=False)
+    ]
 
     best_individual = tournament[0]
 
-    tournament = crowding_distance([tournament])
+    tournament = crowding_distance([tournament], signs)
 
     # flattent the list of lists
     tournament = [individual for front in tournament for individual in front]
 
     # find the best individual in the tournament
     for individual in tournament:
-        if individual.dominates(best_individual):
+        if individual.dominates(best_individual, signs):
             best_individual = individual
-        elif not best_individual.dominates(individual):
+        elif not best_individual.dominates(individual, signs):
             if individual.crowding_distance > best_individual.crowding_distance:
                 best_individual = individual
 
     return best_individual
 
 
+def select_parents(
+    ranks: np.ndarray,
+    distances: np.ndarray,
+    n_parents: int,
+    tournament_size: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Selects parents by tournaments, all the tournaments being drawn at once.
+    The winner of a tournament is the contestant with the lowest front index, then the
+    largest crowding distance. The contestants are drawn with replacement.
+
+    Args:
+        ranks (np.ndarray): index of the front of each individual of the population.
+        distances (np.ndarray): crowding distance of each individual of the population.
+        n_parents (int): number of parents to select.
+        tournament_size (int): size of the tournaments.
+        rng (np.random.Generator): random generator.
+
+    Returns:
+        np.ndarray: indices of the selected parents in the population.
+    """
+    # position of each individual when sorted by front, then by decreasing distance
+    order = np.lexsort((-np.asarray(distances), np.asarray(ranks)))
+    position = np.empty(len(order), dtype=np.int64)
+    position[order] = np.arange(len(order))
+
+    contestants = rng.integers(0, len(order), size=(n_parents, tournament_size))
+    winners = np.argmin(position[contestants], axis=1)
+
+    return contestants[np.arange(n_parents), winners]
+
+
+def crossover_population(
+    parents_1: np.ndarray,
+    parents_2: np.ndarray,
+    n_rsus: int,
+    crossover_probability: float,
+    rng: np.random.Generator,
+) -> tuple:
+    """Crosses pairs of chromosomes with one point crossovers, see `cross_chromosomes`.
+
+    Args:
+        parents_1 (np.ndarray): (P, L) first chromosome of each pair.
+        parents_2 (np.ndarray): (P, L) second chromosome of each pair.
+        n_rsus (int): number of RSUs of the scenario.
+        crossover_probability (float): probability of crossing a pair.
+        rng (np.random.Generator): random generator.
+
+    Returns:
+        tuple: the two (P, L) child chromosomes of each pair, and the (P,) mask of the
+            crossed pairs.
+    """
+    n_pairs, length = parents_1.shape
+    crossed = rng.random(n_pairs) < crossover_probability
+
+    # crossover points among the genes, and their positions in the arrays
+    points = rng.integers(0, length - n_rsus, size=n_pairs)
+    points += np.minimum(points, n_rsus)
+
+    swapped = crossed[:, None] & (np.arange(length)[None, :] >= points[:, None])
+    children_1 = np.where(swapped, parents_2, parents_1)
+    children_2 = np.where(swapped, parents_1, parents_2)
+
+    return children_1, children_2, crossed
+
+
+def mutate_population(
+    chromosomes: np.ndarray, n_rsus: int, mutated: np.ndarray, rng: np.random.Generator
+) -> np.ndarray:
+    """Mutates one gene of some chromosomes, see `mutate_chromosome`.
+
+    Args:
+        chromosomes (np.ndarray): (P, L) chromosomes, mutated in place.
+        n_rsus (int): number of RSUs of the scenario.
+        mutated (np.ndarray): (P,) mask of the chromosomes to mutate.
+        rng (np.random.Generator): random generator.
+
+    Returns:
+        np.ndarray: the chromosomes.
+    """
+    rows = np.flatnonzero(mutated)
+    n_genes = chromosomes.shape[1] - n_rsus
+    genes = rng.integers(0, n_genes, size=len(rows))
+
+    # new coordinates for the RSU genes
+    rsu_rows = rows[genes < n_rsus]
+    rsu_genes = genes[genes < n_rsus]
+    coordinates = rng.integers(0, 101, size=(len(rsu_rows), 2))
+    chromosomes[rsu_rows, 2 * rsu_genes] = coordinates[:, 0]
+    chromosomes[rsu_rows, 2 * rsu_genes + 1] = coordinates[:, 1]
+
+    # new RSUs, not already connected to an ES, for the ES genes
+    es_rows = rows[genes >= n_rsus]
+    es_columns = genes[genes >= n_rsus] + n_rsus
+    if len(es_rows):
+        links = chromosomes[es_rows, 2 * n_rsus :]
+        connected = np.zeros((len(es_rows), n_rsus), dtype=bool)
+        valid = links != NO_RSU
+        connected[np.nonzero(valid)[0], links[valid]] = True
+
+        # the free RSU with the highest random score is chosen
+        scores = rng.random((len(es_rows), n_rsus))
+        scores[connected] = -1
+        choices = np.argmax(scores, axis=1)
+        has_free = ~connected.all(axis=1)
+        chromosomes[es_rows[has_free], es_columns[has_free]] = choices[has_free]
+
+    return chromosomes
+
+
+def variation(
+    chromosomes: np.ndarray,
+    ranks: np.ndarray,
+    distances: np.ndarray,
+    n_offspring: int,
+    n_rsus: int,
+    tournament_size: int,
+    crossover_probability: float,
+    mutation_probability: float,
+    rng: np.random.Generator,
+    timings: dict = None,
+) -> tuple:
+    """Creates the offspring of a population: tournament selection of the parents,
+    one point crossover and mutation, each in a few array operations on the whole population.
+    As in the pairwise operators, both children of a pair are mutated or none of them.
+
+    Args:
+        chromosomes (np.ndarray): (N, L) chromosomes of the population.
+        ranks (np.ndarray): index of the front of each individual of the population.
+        distances (np.ndarray): crowding distance of each individual of the population.
+        n_offspring (int): number of offspring.
+        n_rsus (int): number of RSUs of the scenario.
+        tournament_size (int): size of the tournaments.
+        crossover_probability (float): probability of crossing a pair of parents.
+        mutation_probability (float): probability of mutating a pair of children.
+        rng (np.random.Generator): random generator.
+        timings (dict): if not None, the wall times of the "selection" and of the
+            "variation" (crossover and mutation) are added to it, in seconds.
+
+    Returns:
+        tuple: (n_offspring, L) chromosomes of the offspring, index of the parent each
+            offspring comes from in the population, and mask of the offspring which are
+            different from that parent.
+    """
+    start = time.perf_counter()
+    n_pairs = (n_offspring + 1) // 2
+    parents = select_parents(ranks, distances, 2 * n_pairs, tournament_size, rng)
+    parents_1, parents_2 = parents[0::2], parents[1::2]
+    selected = time.perf_counter()
+
+    children_1, children_2, crossed = crossover_population(
+        chromosomes[parents_1],
+        chromosomes[parents_2],
+        n_rsus,
+        crossover_probability,
+        rng,
+    )
+
+    mutated = rng.random(n_pairs) < mutation_probability
+    offspring = np.empty((2 * n_pairs, chromosomes.shape[1]), dtype=chromosomes.dtype)
+    offspring[0::2] = children_1
+    offspring[1::2] = children_2
+    mutate_population(offspring, n_rsus, np.repeat(mutated, 2), rng)
+
+    changed = np.repeat(crossed | mutated, 2)
+
+    if timings is not None:
+        timings["selection"] = timings.get("selection", 0.0) + selected - start
+        timings["variation"] = (
+            timings.get("variation", 0.0) + time.perf_counter() - selected
+        )
+
+    return offspring[:n_offspring], parents[:n_offspring], changed[:n_offspring]
+
+
 # Define the NSGA2 algorithm
 def nsga2(
     POPULATION_SIZE,
@@ -415,70 +1704,350 @@ def nsga2(
     TOURNAMENT_SIZE,
     CROSSOVER_PROBABILITY,
     MUTATION_PROBABILITY,
-    rsu_bank,
-    es_bank,
+    scenario,
+    n_jobs=1,
+    chunksize=1,
+    seed=None,
+    backend="tick",
+    cache=None,
+    simulation_seed=None,
+    servers="single",
+    policy="migrate",
+    objectives=OBJECTIVES,
+    checkpoint=None,
+    checkpoint_every=1,
+    resume=False,
+    reference=None,
+    stop_window=None,
+    stop_tolerance=1e-3,
+    archive=None,
+    callback=None,
+    instrumentation=None,
+    progress=True,
+    rng: np.random.Generator = None,
 ):
-    # Create an initial population of candidate solutions
-    population = [
-        Individual(get_random_network(rsu_bank, es_bank))
-        for _ in range(POPULATION_SIZE)
-    ]
-
-    # Iterate until the maximum number of generations is reached
-    for _ in tqdm(range(MAX_GENERATIONS)):
-        # Create an empty list to store the offspring generated in this generation
-        offspring = []
+    """Runs the NSGA-II algorithm.
+    The offspring of a generation are created from the whole population at once
+    (see `variation`), then evaluated as one batch, in a pool of
+    n_jobs processes if n_jobs > 1. All the randomness of the run comes from one
+    generator: the genetic operators draw from it, and every offloading simulation draws
+    from its own generator created from the same simulation seed, so the fitness of a
+    chromosome does not depend on when or where it is evaluated: a run with a given
+    generator gives the same population whatever the number of processes, and the
+    fitness values can be cached. The global random generators are never used.
+
+    The state of the run (population, fitness values, random generators and generation)
+    can be saved to a checkpoint every few generations. A run resumed from its checkpoint,
+    with the same arguments, gives the same population as a run which was not stopped.
+    The run stops early when the hypervolume of its first front stops growing.
+    Every evaluated solution can be offered to an external Pareto archive, which keeps
+    the non-dominated solutions truncated from the population, up to its maxsize.
 
-        # Perform crossover and mutation operations to generate new offspring
-        while len(offspring) < POPULATION_SIZE:
-            # Select two parent solutions using tournament selection
-            parent1 = tournament_selection(population, tournament_size=TOURNAMENT_SIZE)
-            parent2 = tournament_selection(population, tournament_size=TOURNAMENT_SIZE)
+    Args:
+        POPULATION_SIZE (int): size of the population.
+        MAX_GENERATIONS (int): number of generations.
+        TOURNAMENT_SIZE (int): size of the tournaments of the selection.
+        CROSSOVER_PROBABILITY (float): probability of crossing two parents.
+        MUTATION_PROBABILITY (float): probability of mutating two children.
+        scenario (Scenario): scenario to optimize the network of.
+        n_jobs (int): number of processes evaluating the offspring.
+        chunksize (int): number of chromosomes sent to a process at a time.
+        seed (int): seed of the generator of the run, when rng is None.
+        backend (str): offloading backend, see `task_offloading`.
+        cache (FitnessCache): cache of the fitness values, saved at the end of the run.
+        simulation_seed (int): seed of the generators of the offloading simulations,
+            drawn from the generator of the run if None.
+        servers (str): server model of the RSUs, see `task_offloading`.
+        policy: migration policy of the tasks, see `task_offloading`.
+        objectives (list): objectives of the optimization, with their direction,
+            see `parse_objectives`. The fitness of the individuals holds their values.
+        checkpoint (str): path of the checkpoint of the run, see `save_checkpoint`,
+            no checkpoint is written if None.
+        checkpoint_every (int): number of generations between two checkpoints.
+        resume (bool): True to resume the run from its checkpoint, if the file exists.
+        reference (list): reference point of the hypervolume, in the units of the
+            objectives. If None, the worst values of the initial population, plus a margin.
+        stop_window (int): the run stops when the hypervolume grew by less than
+            stop_tolerance (relative) over that many generations, it never stops early if None.
+        stop_tolerance (float): relative growth of the hypervolume under which the run stops.
+        archive (ParetoArchive): archive updated with every evaluated solution, with the
+            same objectives as the run. It is saved in the checkpoints.
+        callback (function): called after each generation with a dict of the number of
+            generations done ("generation"), the "population", the "hypervolume" of its
+            first front, the "archive" and its hypervolume ("archive_hypervolume",
+            None without archive), the hypervolumes being computed at the signed "reference".
+        instrumentation (Instrumentation): receives the wall times and counters of each
+            generation, and wraps the evaluations, see `utils.instrumentation`.
+        progress (bool): True to show a progress bar, if tqdm is installed.
+        rng (np.random.Generator): generator of the run, `np.random.default_rng(seed)`
+            if None. It is advanced by the run, and saved in the checkpoints.
 
-            # Perform crossover operation with probability CROSSOVER_PROBABILITY
-            if random.random() < CROSSOVER_PROBABILITY:
-                child1, child2 = crossing(parent1, parent2)
+    Returns:
+        list: the final population.
+    """
+    metrics, signs = parse_objectives(objectives)
+    if archive is not None and not np.array_equal(archive.signs, signs):
+        raise ValueError("The archive and the run do not have the same objectives")
+
+    state = None
+    if resume and checkpoint is not None and os.path.exists(checkpoint):
+        state = load_checkpoint(checkpoint)
+
+    # random generator of the run
+    generator = rng if rng is not None else np.random.default_rng(seed)
+
+    if state is not None:
+        simulation_seed = state["simulation_seed"]
+    elif simulation_seed is None:
+        simulation_seed = int(generator.integers(2**63))
+
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+
+    pool = None
+    if n_jobs > 1:
+        pool = evaluation_pool(scenario, n_jobs, backend, servers, policy, metrics)
+
+    def evaluate(chromosomes, timings):
+        start = time.perf_counter()
+        with instrumentation.evaluation():
+            fitness_values = evaluate_chromosomes(
+                chromosomes,
+                scenario,
+                [simulation_seed] * len(chromosomes),
+                pool=pool,
+                chunksize=chunksize,
+                backend=backend,
+                cache=cache,
+                servers=servers,
+                policy=policy,
+                objectives=metrics,
+            )
+        timings["evaluation"] = time.perf_counter() - start
+        timings["evaluations"] = len(chromosomes)
+        return [
+            Individual(chromosome=chromosome, fitness_values=fitness_value)
+            for chromosome, fitness_value in zip(chromosomes, fitness_values)
+        ]
+
+    def save(generation):
+        save_checkpoint(
+            checkpoint,
+            {
+                "generation": generation,
+                "chromosomes": np.stack(
+                    [individual.chromosome for individual in population]
+                ),
+                "fitness_values": np.array(
+                    [individual.fitness for individual in population], dtype=float
+                ),
+                "ranks": ranks,
+                "distances": distances,
+                "simulation_seed": simulation_seed,
+                "reference": reference,
+                "hypervolumes": np.array(hypervolumes, dtype=float),
+                "generator_state": generator.bit_generator.state,
+                **archived(),
+            },
+        )
+
+    def counters():
+        # simulated ticks, and hits and misses of the cache, to be measured by differences
+        if cache is None:
+            return SIMULATION_COUNTERS["ticks"], None, None
+        return SIMULATION_COUNTERS["ticks"], cache.hits, cache.misses
+
+    def report(generation, timings, start, before):
+        ticks, hits, misses = [
+            None if then is None else now - then
+            for now, then in zip(counters(), before)
+        ]
+        lookups = None if hits is None else hits + misses
+        instrumentation.on_generation(
+            {
+                "generation": generation,
+                "selection": timings.get("selection", 0.0),
+                "variation": timings.get("variation", 0.0),
+                "evaluation": timings["evaluation"],
+                "sorting": timings["sorting"],
+                "total": time.perf_counter() - start,
+                "evaluations": timings["evaluations"],
+                "ticks": ticks,
+                "ticks_per_second": (
+                    ticks / timings["evaluation"] if timings["evaluation"] else 0.0
+                ),
+                "cache_hits": hits,
+                "cache_misses": misses,
+                "cache_hit_rate": hits / lookups if lookups else None,
+                "hypervolume": hypervolumes[-1],
+                "archive_size": None if archive is None else len(archive),
+            }
+        )
+
+    def archived():
+        if archive is None:
+            return {}
+        return {
+            "archive_chromosomes": np.stack(
+                [individual.chromosome for individual in archive.individuals]
+            ),
+            "archive_fitness_values": np.array(
+                [individual.fitness for individual in archive.individuals], dtype=float
+            ),
+        }
+
+    try:
+        if state is not None:
+            # restore the population and the generators where the checkpoint left them
+            population = [
+                Individual(chromosome=chromosome, fitness_values=tuple(fitness_value))
+                for chromosome, fitness_value in zip(
+                    state["chromosomes"].astype(CHROMOSOME_DTYPE),
+                    state["fitness_values"].tolist(),
+                )
+            ]
+            ranks = state["ranks"]
+            distances = state["distances"]
+            for individual, rank, distance in zip(population, ranks, distances):
+                individual.rank = int(rank) + 1
+                individual.crowding_distance = distance
+            reference = state["reference"]
+            hypervolumes = state["hypervolumes"].tolist()
+            generator.bit_generator.state = state["generator_state"]
+            first_generation = state["generation"]
+            if archive is not None and "archive_chromosomes" in state:
+                archive.clear()
+                archive.update(
+                    [
+                        Individual(chromosome=chromosome, fitness_values=tuple(value))
+                        for chromosome, value in zip(
+                            state["archive_chromosomes"].astype(CHROMOSOME_DTYPE),
+                            state["archive_fitness_values"].tolist(),
+                        )
+                    ]
+                )
+        else:
+            timings = {}
+            start = time.perf_counter()
+            before = counters()
+
+            # Create an initial population of candidate solutions
+            population = evaluate(
+                [random_chromosome(scenario, generator) for _ in range(POPULATION_SIZE)],
+                timings,
+            )
+            if archive is not None:
+                archive.update(population)
+            sorting = time.perf_counter()
+            fitness_values = signed_fitness(population, signs)
+            _, ranks, distances = environmental_selection(
+                fitness_values, POPULATION_SIZE
+            )
+
+            # reference point of the hypervolume, fixed for the whole run
+            if reference is None:
+                worst = fitness_values.max(axis=0)
+                margin = 0.1 * (worst - fitness_values.min(axis=0))
+                reference = worst + np.where(margin > 0, margin, 1.0)
             else:
-                child1, child2 = parent1, parent2
-
-            # Perform mutation operation on each child with probability MUTATION_PROBABILITY
-            if random.random() < MUTATION_PROBABILITY:
-                child1 = mutation(child1)
-                child2 = mutation(child2)
-
-            # Add the new offspring to the list
-            offspring.append(child1)
-            offspring.append(child2)
-
-        # Combine the parent and offspring populations into a single population for sorting and selection
-        combined_population = population + offspring
-
-        # Perform non-dominated sorting and crowding distance assignment
-        fronts = non_dominated_sorting(combined_population)
-        fronts = crowding_distance(fronts)
-
-        # Select the next generation of candidate solutions using the non-dominated sorting and crowding distance
-        new_population = []
-        i = 0
-        while len(new_population) < POPULATION_SIZE and i < len(fronts):
-            # Select the ith front from the non-dominated sorting
-            front = fronts[i]
-
-            # Sort the solutions in the front by their crowding distance
-            front = sorted(front, key=lambda x: x.crowding_distance, reverse=True)
-
-            # Add the solutions to the new population until the population size is reached
-            for solution in front:
-                if len(new_population) < POPULATION_SIZE:
-                    new_population.append(solution)
-                else:
+                reference = np.asarray(reference, dtype=float) * signs
+            hypervolumes = [hypervolume(fitness_values[ranks == 0], reference)]
+            timings["sorting"] = time.perf_counter() - sorting
+            first_generation = 0
+            report(0, timings, start, before)
+
+        generations = range(first_generation, MAX_GENERATIONS)
+        if progress and tqdm is not None:
+            generations = tqdm(
+                generations, initial=first_generation, total=MAX_GENERATIONS
+            )
+
+        # Iterate until the maximum number of generations is reached
+        for generation in generations:
+            timings = {}
+            start = time.perf_counter()
+            before = counters()
+
+            # Select the parents, and perform crossover and mutation operations
+            # on the whole population to generate new offspring
+            offspring_chromosomes, parents, changed = variation(
+                np.stack([individual.chromosome for individual in population]),
+                ranks,
+                distances,
+                POPULATION_SIZE,
+                scenario.n_rsus,
+                TOURNAMENT_SIZE,
+                CROSSOVER_PROBABILITY,
+                MUTATION_PROBABILITY,
+                generator,
+                timings,
+            )
+
+            # Evaluate the new offspring, the unchanged ones are their parents
+            evaluated = evaluate(list(offspring_chromosomes[changed]), timings)
+            if archive is not None:
+                archive.update(evaluated)
+            new_offspring = iter(evaluated)
+            offspring = [
+                next(new_offspring) if is_new else population[parent]
+                for parent, is_new in zip(parents, changed)
+            ]
+
+            # Combine the parent and offspring populations into a single population for sorting and selection
+            combined_population = population + offspring
+
+            # Perform non-dominated sorting and crowding distance assignment,
+            # and select the next generation of candidate solutions
+            sorting = time.perf_counter()
+            fitness_values = signed_fitness(combined_population, signs)
+            survivors, ranks, distances = environmental_selection(
+                fitness_values, POPULATION_SIZE
+            )
+
+            # Set the current population to the selected solutions
+            population = [combined_population[i] for i in survivors]
+            fitness_values = fitness_values[survivors]
+            ranks = ranks[survivors]
+            distances = distances[survivors]
+            for individual, rank, distance in zip(population, ranks, distances):
+                individual.rank = int(rank) + 1
+                individual.crowding_distance = distance
+
+            # hypervolume of the first front, whose solutions always survive
+            hypervolumes.append(hypervolume(fitness_values[ranks == 0], reference))
+            timings["sorting"] = time.perf_counter() - sorting
+            report(generation + 1, timings, start, before)
+
+            if callback is not None:
+                callback(
+                    {
+                        "generation": generation + 1,
+                        "population": population,
+                        "hypervolume": hypervolumes[-1],
+                        "archive": archive,
+                        "archive_hypervolume": (
+                            None if archive is None else archive.hypervolume(reference)
+                        ),
+                        "reference": reference,
+                    }
+                )
+
+            if checkpoint is not None and (generation + 1) % checkpoint_every == 0:
+                save(generation + 1)
+
+            # stop when the first front no longer moves
+            if stop_window is not None and len(hypervolumes) > stop_window:
+                previous = hypervolumes[-1 - stop_window]
+                if hypervolumes[-1] - previous <= stop_tolerance * abs(previous):
+                    if checkpoint is not None:
+                        save(generation + 1)
                     break
-
-            # Move to the next front
-            i += 1
-
-        # Set the current population and fitness values to the new population and fitness values
-        population = new_population
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if cache is not None:
+            cache.save()
+        instrumentation.close()
 
     # Return the final population and fitness values
     return population
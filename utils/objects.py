@@ -1,3 +1,8 @@
+import hashlib
+import os
+from collections import deque
+from types import MappingProxyType
+
 import pandas as pd
 import numpy as np
 
@@ -5,7 +10,7 @@ import numpy as np
 class RSU:
     """Represents an RSU."""
 
-    global_rsu = []
+    __slots__ = ("ID", "X", "Y", "DTR", "STATE", "END_TIME", "SLOTS", "QUEUE", "ES")
 
     def __init__(
         self,
@@ -20,14 +25,21 @@ class RSU:
         self.DTR = DTR
         self.STATE = "IDLE"
         self.END_TIME = None
+        # end times of the tasks being computed, as a heap
+        self.SLOTS = []
+        # tasks waiting for a slot, in order of arrival
+        self.QUEUE = deque()
         self.ES = None
-        self.__class__.global_rsu.append(self)
+
+    def to_dict(self) -> dict:
+        """Returns the attributes of the RSU, as `vars` would without `__slots__`."""
+        return {field: getattr(self, field) for field in self.__slots__}
 
 
 class ES:
     """Represents an ES."""
 
-    global_es = []
+    __slots__ = ("ID", "VM_NB", "VM_CP")
 
     def __init__(
         self,
@@ -38,13 +50,35 @@ class ES:
         self.ID = ID
         self.VM_NB = VM_NB
         self.VM_CP = VM_CP
-        self.__class__.global_es.append(self)
+
+    def to_dict(self) -> dict:
+        """Returns the attributes of the ES, as `vars` would without `__slots__`."""
+        return {field: getattr(self, field) for field in self.__slots__}
 
 
 class Task:
     """Represents a task."""
 
-    global_task = []
+    __slots__ = (
+        "ID",
+        "LENGTH",
+        "FILE_SIZE",
+        "TYPE",
+        "X",
+        "Y",
+        "ORIGIN_X",
+        "ORIGIN_Y",
+        "ARRIVAL",
+        "COMPLETED",
+        "MIGRATION_HISTORY",
+        "COMPUTATION_HISTORY",
+        "MIGRATION_TIME",
+        "MIGRATIONS",
+        "START_TIME",
+        "WAITING",
+        "RSU",
+        "RSU_HISTORY",
+    )
 
     def __init__(
         self,
@@ -61,12 +95,25 @@ class Task:
         self.TYPE = TYPE
         self.X = X
         self.Y = Y
+        self.ORIGIN_X = X
+        self.ORIGIN_Y = Y
+        # time at which the task is created, see `online_offloading`
+        self.ARRIVAL = 0
         self.COMPLETED = False
         self.MIGRATION_HISTORY = 0
         self.COMPUTATION_HISTORY = 0
         self.MIGRATION_TIME = 0
+        # number of migrations of the task
+        self.MIGRATIONS = 0
+        self.START_TIME = None
+        self.WAITING = False
+        # RSU computing the task
+        self.RSU = None
         self.RSU_HISTORY = []
-        self.__class__.global_task.append(self)
+
+    def to_dict(self) -> dict:
+        """Returns the attributes of the task, as `vars` would without `__slots__`."""
+        return {field: getattr(self, field) for field in self.__slots__}
 
 
 def populate_tasks(data: pd.DataFrame) -> list:
@@ -75,19 +122,34 @@ def populate_tasks(data: pd.DataFrame) -> list:
     Args:
         data (pd.DataFrame): dataframe containing the tasks.
     """
-    tasks = []
-    for i in range(len(data)):
-        task = Task(
-            ID=data["ID"][i],
-            LENGTH=data["LENGTH"][i],
-            FILE_SIZE=data["FILE_SIZE"][i],
-            TYPE=data["TYPE"][i],
-            X=data["X"][i],
-            Y=data["Y"][i],
-        )
-        tasks.append(task)
+    return from_columns(Task, {field: data[field].to_numpy() for field in TASK_FIELDS})
+
 
-    return tasks
+def stream_tasks(path: str, chunksize: int = 10_000):
+    """Reads the tasks of a data file in chunks, with their arrival time.
+    Only one chunk of rows is in memory at a time, so the file can be much larger than
+    the memory, see `online_offloading`.
+
+    Args:
+        path (str): path of a CSV file with the columns of the tasks and an ARRIVAL column,
+            sorted by arrival time.
+        chunksize (int): number of rows read at a time.
+
+    Yields:
+        Task: the tasks, in the order of the file.
+    """
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        for row in chunk.itertuples(index=False):
+            task = Task(
+                ID=row.ID,
+                LENGTH=row.LENGTH,
+                FILE_SIZE=row.FILE_SIZE,
+                TYPE=row.TYPE,
+                X=row.X,
+                Y=row.Y,
+            )
+            task.ARRIVAL = row.ARRIVAL
+            yield task
 
 
 def populate_rsus(data: pd.DataFrame) -> list:
@@ -96,17 +158,7 @@ def populate_rsus(data: pd.DataFrame) -> list:
     Args:
         data (pd.DataFrame): dataframe containing the RSUs.
     """
-    rsus = []
-    for i in range(len(data)):
-        rsu = RSU(
-            ID=data["ID"][i],
-            X=data["X"][i],
-            Y=data["Y"][i],
-            DTR=data["DTR"][i],
-        )
-        rsus.append(rsu)
-
-    return rsus
+    return from_columns(RSU, {field: data[field].to_numpy() for field in RSU_FIELDS})
 
 
 def populate_ess(data: pd.DataFrame) -> list:
@@ -115,41 +167,376 @@ def populate_ess(data: pd.DataFrame) -> list:
     Args:
         data (pd.DataFrame): dataframe containing the ESs.
     """
-    ess = []
-    for i in range(len(data)):
-        es = ES(
-            ID=data["ID"][i],
-            VM_NB=data["VM_NB"][i],
-            VM_CP=data["VM_CP"][i],
+    return from_columns(ES, {field: data[field].to_numpy() for field in ES_FIELDS})
+
+
+# fields of the objects, in the order of their constructor
+TASK_FIELDS = ("ID", "LENGTH", "FILE_SIZE", "TYPE", "X", "Y")
+RSU_FIELDS = ("ID", "X", "Y", "DTR")
+ES_FIELDS = ("ID", "VM_NB", "VM_CP")
+
+# dtypes of the columns of the data files, the task types are few distinct strings
+TASK_DTYPES = {
+    "ID": np.int64,
+    "LENGTH": np.int64,
+    "FILE_SIZE": np.int64,
+    "TYPE": "category",
+    "X": np.int64,
+    "Y": np.int64,
+}
+RSU_DTYPES = {"ID": np.int64, "X": np.int64, "Y": np.int64, "DTR": np.int64}
+ES_DTYPES = {"ID": np.int64, "VM_NB": np.int64, "VM_CP": np.int64}
+
+
+def read_columns(path: str, dtypes: dict, chunksize: int = None) -> dict:
+    """Reads the columns of a data file straight into NumPy arrays, with explicit dtypes.
+    With a chunk size, the file is parsed a chunk of rows at a time, so that only the
+    arrays, and not a dataframe of the whole file, are held in memory.
+
+    Args:
+        path (str): path of the CSV file.
+        dtypes (dict): dtype of each column read, see `TASK_DTYPES`.
+        chunksize (int): number of rows parsed at a time, the whole file at once if None.
+
+    Returns:
+        dict: one array per column, the categorical columns being object arrays.
+    """
+    reader = pd.read_csv(path, usecols=list(dtypes), dtype=dtypes, chunksize=chunksize)
+    chunks = [reader] if chunksize is None else reader
+
+    parts = {field: [] for field in dtypes}
+    for chunk in chunks:
+        for field in dtypes:
+            column = chunk[field]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                column = column.astype(object)
+            parts[field].append(column.to_numpy())
+
+    return {
+        field: np.concatenate(arrays) if len(arrays) > 1 else arrays[0]
+        for field, arrays in parts.items()
+    }
+
+
+def load_tasks(path: str, chunksize: int = None) -> list:
+    """Loads the tasks of a data file, see `read_columns`.
+
+    Args:
+        path (str): path of the tasks CSV file.
+        chunksize (int): number of rows parsed at a time, the whole file at once if None.
+
+    Returns:
+        list: list of tasks.
+    """
+    return from_columns(Task, read_columns(path, TASK_DTYPES, chunksize))
+
+
+def load_rsus(path: str, chunksize: int = None) -> list:
+    """Loads the RSUs of a data file, see `read_columns`.
+
+    Args:
+        path (str): path of the RSUs CSV file.
+        chunksize (int): number of rows parsed at a time, the whole file at once if None.
+
+    Returns:
+        list: list of RSUs.
+    """
+    return from_columns(RSU, read_columns(path, RSU_DTYPES, chunksize))
+
+
+def load_ess(path: str, chunksize: int = None) -> list:
+    """Loads the ESs of a data file, see `read_columns`.
+
+    Args:
+        path (str): path of the ESs CSV file.
+        chunksize (int): number of rows parsed at a time, the whole file at once if None.
+
+    Returns:
+        list: list of ESs.
+    """
+    return from_columns(ES, read_columns(path, ES_DTYPES, chunksize))
+
+
+def to_columns(objects: list, fields: tuple) -> dict:
+    """Packs the fields of a list of objects into NumPy columns.
+
+    Args:
+        objects (list): list of objects.
+        fields (tuple): names of the fields to pack.
+
+    Returns:
+        dict: one array per field.
+    """
+    return {field: np.array([getattr(x, field) for x in objects]) for field in fields}
+
+
+def from_columns(cls, columns: dict) -> list:
+    """Creates objects from NumPy columns, see `to_columns`.
+
+    Args:
+        cls (type): class of the objects, whose constructor takes the fields as arguments.
+        columns (dict): one array per field.
+
+    Returns:
+        list: list of objects.
+    """
+    fields = list(columns)
+    # the columns are iterated as Python values, much faster than NumPy scalars
+    rows = zip(*(np.asarray(column).tolist() for column in columns.values()))
+    return [cls(**dict(zip(fields, values))) for values in rows]
+
+
+class Scenario:
+    """Problem instance: the banks of tasks, RSUs and ESs.
+    The banks are stored as read-only NumPy columns, and the scenario cannot be modified.
+    Every evaluation creates its own objects from it, so evaluations never share any state.
+
+    The columns which are already read-only, such as the memory-mapped columns of
+    `load_scenario`, are shared instead of copied.
+
+    Attributes:
+        tasks (Mapping): columns of the tasks bank, see TASK_FIELDS.
+        rsus (Mapping): columns of the RSU bank, see RSU_FIELDS.
+        ess (Mapping): columns of the ES bank, see ES_FIELDS.
+        source (str): directory the scenario was memory-mapped from, or None.
+    """
+
+    __slots__ = ("tasks", "rsus", "ess", "source")
+
+    # banks of the scenario
+    BANKS = ("tasks", "rsus", "ess")
+
+    def __init__(self, tasks: dict, rsus: dict, ess: dict, source: str = None):
+        for name, columns in zip(self.BANKS, (tasks, rsus, ess)):
+            frozen = {}
+            for field, column in columns.items():
+                column = np.asarray(column)
+                column = column.copy() if column.flags.writeable else column.view()
+                column.setflags(write=False)
+                frozen[field] = column
+            object.__setattr__(self, name, MappingProxyType(frozen))
+        object.__setattr__(self, "source", source)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Scenario objects cannot be modified")
+
+    def __reduce__(self):
+        # a memory-mapped scenario is mapped again, so processes share its pages
+        if self.source is not None:
+            return (load_scenario, (self.source,))
+
+        return (self.__class__, (dict(self.tasks), dict(self.rsus), dict(self.ess)))
+
+    @classmethod
+    def from_banks(cls, tasks_bank: list, rsu_bank: list, es_bank: list):
+        """Creates a scenario from lists of objects.
+
+        Args:
+            tasks_bank (list): list of tasks.
+            rsu_bank (list): list of RSUs.
+            es_bank (list): list of ESs.
+
+        Returns:
+            Scenario: the scenario.
+        """
+        tasks = to_columns(tasks_bank, TASK_FIELDS)
+        # the tasks move during the offloading, keep their initial position
+        tasks["X"] = np.array([task.ORIGIN_X for task in tasks_bank])
+        tasks["Y"] = np.array([task.ORIGIN_Y for task in tasks_bank])
+
+        return cls(tasks, to_columns(rsu_bank, RSU_FIELDS), to_columns(es_bank, ES_FIELDS))
+
+    @classmethod
+    def from_dataframes(cls, tasks: pd.DataFrame, rsu: pd.DataFrame, es: pd.DataFrame):
+        """Creates a scenario from the dataframes of the data files.
+
+        Args:
+            tasks (pd.DataFrame): dataframe containing the tasks.
+            rsu (pd.DataFrame): dataframe containing the RSUs.
+            es (pd.DataFrame): dataframe containing the ESs.
+
+        Returns:
+            Scenario: the scenario.
+        """
+        return cls(
+            {field: tasks[field].to_numpy() for field in TASK_FIELDS},
+            {field: rsu[field].to_numpy() for field in RSU_FIELDS},
+            {field: es[field].to_numpy() for field in ES_FIELDS},
         )
-        ess.append(es)
 
-    return ess
+    @classmethod
+    def from_csv(
+        cls, tasks_path: str, rsu_path: str, es_path: str, chunksize: int = None
+    ):
+        """Creates a scenario from the data files, see `read_columns`.
+
+        Args:
+            tasks_path (str): path of the tasks CSV file.
+            rsu_path (str): path of the RSUs CSV file.
+            es_path (str): path of the ESs CSV file.
+            chunksize (int): number of rows parsed at a time, the whole file at once if None.
+
+        Returns:
+            Scenario: the scenario.
+        """
+        return cls(
+            read_columns(tasks_path, TASK_DTYPES, chunksize),
+            read_columns(rsu_path, RSU_DTYPES, chunksize),
+            read_columns(es_path, ES_DTYPES, chunksize),
+        )
+
+    @property
+    def n_tasks(self) -> int:
+        """Number of tasks of the scenario."""
+        return len(self.tasks["ID"])
+
+    @property
+    def n_rsus(self) -> int:
+        """Number of RSUs of the scenario."""
+        return len(self.rsus["ID"])
+
+    @property
+    def n_ess(self) -> int:
+        """Number of ESs of the scenario."""
+        return len(self.ess["ID"])
+
+    def fingerprint(self) -> str:
+        """Returns a hash of the content of the scenario.
+
+        Returns:
+            str: hexadecimal digest, equal for scenarios with the same banks.
+        """
+        digest = hashlib.sha1()
+        for name in self.BANKS:
+            for field, column in getattr(self, name).items():
+                # the strings hash the same whether they are objects or fixed width
+                dtype = np.dtype(object) if column.dtype.kind == "U" else column.dtype
+                digest.update(f"{name}.{field}:{dtype.str}:".encode())
+                if column.dtype.kind in "OU":
+                    digest.update(repr(column.tolist()).encode())
+                else:
+                    digest.update(np.ascontiguousarray(column).tobytes())
+
+        return digest.hexdigest()
+
+    def new_tasks(self) -> list:
+        """Creates a fresh list of tasks from the scenario.
+
+        Returns:
+            list: list of tasks.
+        """
+        return from_columns(Task, self.tasks)
+
+    def new_rsus(self) -> list:
+        """Creates a fresh list of RSUs from the scenario.
+
+        Returns:
+            list: list of RSUs.
+        """
+        return from_columns(RSU, self.rsus)
+
+    def new_ess(self) -> list:
+        """Creates a fresh list of ESs from the scenario.
 
+        Returns:
+            list: list of ESs.
+        """
+        return from_columns(ES, self.ess)
 
-def get_network(rsu: list, es: list) -> list:
+
+# fields of each bank of a scenario
+SCENARIO_FIELDS = {"tasks": TASK_FIELDS, "rsus": RSU_FIELDS, "ess": ES_FIELDS}
+
+
+def save_scenario(scenario: Scenario, path: str):
+    """Writes a scenario to a directory, as one NumPy file per column, see `load_scenario`.
+    The strings are stored with a fixed width, so that every column can be memory-mapped.
+
+    Args:
+        scenario (Scenario): scenario to be written.
+        path (str): directory of the scenario, created if needed.
+    """
+    os.makedirs(path, exist_ok=True)
+    for name in Scenario.BANKS:
+        for field, column in getattr(scenario, name).items():
+            if column.dtype.kind == "O":
+                column = column.astype(str)
+            np.save(os.path.join(path, f"{name}.{field}.npy"), column)
+
+
+def load_scenario(path: str, mmap: bool = True) -> Scenario:
+    """Loads a scenario written by `save_scenario`.
+    The columns are memory-mapped by default: loading does not read the files, and all
+    the processes which load the same scenario share one physical copy of its columns.
+    Such a scenario is sent to the worker processes as its path only.
+
+    Args:
+        path (str): directory of the scenario.
+        mmap (bool): False to read the columns into memory.
+
+    Returns:
+        Scenario: the scenario.
+    """
+    mmap_mode = "r" if mmap else None
+    banks = [
+        {
+            field: np.load(os.path.join(path, f"{name}.{field}.npy"), mmap_mode=mmap_mode)
+            for field in SCENARIO_FIELDS[name]
+        }
+        for name in Scenario.BANKS
+    ]
+
+    return Scenario(*banks, source=os.path.abspath(path) if mmap else None)
+
+
+def convert_scenario(
+    tasks_path: str, rsu_path: str, es_path: str, path: str, chunksize: int = None
+):
+    """Converts the data files written by `datagen.ipynb` to a scenario directory.
+
+    Args:
+        tasks_path (str): path of the tasks CSV file.
+        rsu_path (str): path of the RSUs CSV file.
+        es_path (str): path of the ESs CSV file.
+        path (str): directory of the scenario, see `save_scenario`.
+        chunksize (int): number of rows parsed at a time, the whole file at once if None.
+    """
+    save_scenario(Scenario.from_csv(tasks_path, rsu_path, es_path, chunksize), path)
+
+
+def random_integer(rng: np.random.Generator, low: int, high: int) -> int:
+    """Draws an integer in [low, high), from the global NumPy generator if rng is None."""
+    if rng is None:
+        return np.random.randint(low, high)
+    return int(rng.integers(low, high))
+
+
+def get_network(rsu: list, es: list, rng: np.random.Generator = None) -> list:
     """Generates a network of RSUs and ESs from the RSU and ES lists.
 
     Args:
         rsu (list): list of RSUs.
         es (list): list of ESs.
+        rng (np.random.Generator): random generator, the global one if None.
 
     Returns:
         list: list of RSUs with ESs assigned to them.
     """
+    random = np.random if rng is None else rng
+
     # choose a random number of RSUs M
-    M = np.random.randint(2, len(rsu))
+    M = random_integer(rng, 2, len(rsu))
     # choose a random number of ESs W, with W < M
-    W = np.random.randint(1, M)
+    W = random_integer(rng, 1, M)
 
     # choose M RSUs from the RSU bank
-    rsu_list = np.random.choice(rsu, M, replace=False)
+    rsu_list = random.choice(rsu, M, replace=False)
     # choose W ESs from the ES bank
-    es_list = np.random.choice(es, W, replace=False)
+    es_list = random.choice(es, W, replace=False)
 
     # shuffle the RSU list and the ES list
-    np.random.shuffle(rsu_list)
-    np.random.shuffle(es_list)
+    random.shuffle(rsu_list)
+    random.shuffle(es_list)
 
     # for each es, choose an rsu to connect to
     for i, es in enumerate(es_list):
@@ -161,29 +548,34 @@ def get_network(rsu: list, es: list) -> list:
             rsu.ES = "AP"
 
     # shuffle the RSU list again
-    np.random.shuffle(rsu_list)
+    random.shuffle(rsu_list)
 
     return rsu_list
 
 
-def get_random_network(rsu_list: list, es_list: list) -> list:
+def get_random_network(
+    rsu_list: list, es_list: list, rng: np.random.Generator = None
+) -> list:
     """Generates a random network of RSUs and ESs from the RSU and ES lists.
 
     Args:
         rsu_list (list): list of RSUs.
         es_list (list): list of ESs.
+        rng (np.random.Generator): random generator, the global one if None.
 
     Returns:
         list: list of RSUs with ESs assigned to them, all of them with random coordinates.
     """
+    random = np.random if rng is None else rng
+
     # shuffle the RSU list and the ES list
-    np.random.shuffle(rsu_list)
-    np.random.shuffle(es_list)
+    random.shuffle(rsu_list)
+    random.shuffle(es_list)
 
     # for each RSU, generate random coordinates
     for rsu in rsu_list:
-        rsu.X = np.random.randint(0, 100)
-        rsu.Y = np.random.randint(0, 100)
+        rsu.X = random_integer(rng, 0, 100)
+        rsu.Y = random_integer(rng, 0, 100)
 
     # reset the ES of the RSUs
     for rsu in rsu_list:
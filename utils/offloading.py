@@ -1,6 +1,11 @@
+import heapq
+import math
+
 import numpy as np
 
 from .main import (
+    RSUIndex,
+    SERVER_MODELS,
     get_closest_rsu,
     is_server_free,
     compatible,
@@ -8,116 +13,862 @@ from .main import (
     data_transfer_time,
     migration_time,
     distance,
+    occupy_server,
+    release_server,
+    server_capacity,
+    service_time,
 )
+from .compiled import compiled_offloading
+from .metrics import OffloadingStats
+from .objects import RSU
+from .policies import AlwaysMigrate, get_policy, predicted_wait
+from .state import NetworkArrays, TaskArrays, COMPUTATION, DATA_TRANSFER
+
+
+def offload_task(
+    task,
+    network: list,
+    current_time: int,
+    index: RSUIndex = None,
+    visited: set = None,
+    servers: str = "single",
+    policy: AlwaysMigrate = None,
+):
+    """Offloads a single task at the current time.
+    The task is computed by the RSU it is assigned to if that RSU is free and compatible,
+    otherwise it is migrated to the closest RSU it has not visited yet, or it waits in the
+    queue of its RSU if the migration policy decides so.
+
+    Args:
+        task (Task): task to be offloaded.
+        network (list): list of RSUs.
+        current_time (int): current time of the offloading process.
+        index (RSUIndex): spatial index of the network, if None the closest RSUs
+            are searched with `get_closest_rsu`.
+        visited (set): positions in the index of the RSUs in the history of the task,
+            kept up to date with the history.
+        servers (str): server model of the RSUs, see `SERVER_MODELS`.
+        policy (AlwaysMigrate): migration policy, see `utils.policies`,
+            the task always migrates if None.
+
+    Returns:
+        RSU: the RSU computing the task, or None if the task is being migrated or waits.
+    """
+    if index is not None and visited is None:
+        visited = index.positions(task.RSU_HISTORY)
+
+    # if the task was not being migrated, fin the closest rsu to the task
+    if task.RSU_HISTORY == []:
+        # get the closest rsu to the task
+        closest_rsu = _closest_rsu(network, task, index, visited)
+
+        task.RSU_HISTORY.append(closest_rsu)
+
+        # suppose the task is assigned at that rsu directly
+        task.X = closest_rsu.X
+        task.Y = closest_rsu.Y
+    else:
+        # get the last rsu the task was assigned to
+        closest_rsu = task.RSU_HISTORY[-1]
+
+    # if the rsu is free and compatible with the task, compute the task
+    if is_server_free(closest_rsu) and compatible(closest_rsu, task):
+        _start_task(task, closest_rsu, current_time, servers)
+
+        computing_rsu = closest_rsu
+
+    # if the rsu is busy or incompatible with the task, migrate the task
+    else:
+        # find the closest rsu to the task
+        next_rsu = _closest_rsu(network, task, index, visited, record=False)
+
+        # compute the migration time
+        t_migration = migration_time(
+            file_size=task.FILE_SIZE,
+            distance=distance(task, next_rsu),
+            dtr=next_rsu.DTR,
+        )
+
+        # a task on a busy but compatible rsu may rather wait in its queue
+        if (
+            policy is not None
+            and len(closest_rsu.QUEUE) < policy.queue_size
+            and compatible(closest_rsu, task)
+        ):
+            t_wait = predicted_wait(closest_rsu, task, current_time, servers)
+            if policy.wait(task, closest_rsu, t_wait, t_migration):
+                task.WAITING = True
+                closest_rsu.QUEUE.append(task)
+                return None
+
+        closest_rsu = next_rsu
+        if visited is not None:
+            visited.add(index.position[id(closest_rsu)])
+
+        # add the closest rsu to the history of the task
+        task.RSU_HISTORY.append(closest_rsu)
+
+        # update the migration time of the task
+        task.MIGRATION_TIME = t_migration
+        # keep a record of the total migration time of the task
+        task.MIGRATION_HISTORY += t_migration
+        task.MIGRATIONS += 1
+
+        # update the coordinates of the task for when it will be migrated
+        task.X = closest_rsu.X
+        task.Y = closest_rsu.Y
+
+        computing_rsu = None
+
+    # if the task has gone through all the RSU, reset its history
+    if len(task.RSU_HISTORY) == len(network):
+        task.RSU_HISTORY = []
+        if visited is not None:
+            visited.clear()
+
+    return computing_rsu
+
+
+def _closest_rsu(network: list, task, index: RSUIndex, visited: set, record=True):
+    """Returns the closest RSU to a task which is not in its history, and records it as visited.
+
+    Args:
+        network (list): list of RSUs.
+        task (Task): task to which the closest RSU is to be found.
+        index (RSUIndex): spatial index of the network, or None.
+        visited (set): positions in the index of the RSUs in the history of the task.
+        record (bool): False to leave the visited positions untouched.
+
+    Returns:
+        RSU: closest RSU to the task.
+    """
+    if index is None:
+        return get_closest_rsu(network, task, task.RSU_HISTORY)
+
+    closest = index.closest_position(task.X, task.Y, visited)
+    if record:
+        visited.add(closest)
+
+    return index.rsus[closest]
+
+
+def _start_task(task, rsu: RSU, start_time: int, servers: str = "single"):
+    """Starts the computation of a task on a free slot of an RSU.
+
+    Args:
+        task (Task): task to be computed.
+        rsu (RSU): free RSU, compatible with the task.
+        start_time (int): time at which the computation starts.
+        servers (str): server model of the RSUs, see `SERVER_MODELS`.
+    """
+    task.COMPLETED = True
+    task.WAITING = False
+    task.START_TIME = start_time
+    task.RSU = rsu
+    task.COMPUTATION_HISTORY = service_time(rsu, task, servers)
+
+    # the task takes one of the slots of the rsu until it ends
+    occupy_server(
+        rsu, start_time + task.COMPUTATION_HISTORY, server_capacity(rsu, servers)
+    )
+
+
+def _start_queued_tasks(rsu: RSU, start_time: int, servers: str = "single") -> list:
+    """Starts the tasks waiting in the queue of an RSU, in order, while it has free slots.
+
+    Args:
+        rsu (RSU): RSU whose slots were freed.
+        start_time (int): time at which the computations start.
+        servers (str): server model of the RSUs, see `SERVER_MODELS`.
+
+    Returns:
+        list: the tasks started.
+    """
+    started = []
+    while rsu.QUEUE and is_server_free(rsu):
+        task = rsu.QUEUE.popleft()
+        _start_task(task, rsu, start_time, servers)
+        started.append(task)
+
+    return started
+
+
+def _ready_tasks(tasks_bank: list) -> list:
+    """Returns the positions of the tasks which are neither completed nor migrating.
+
+    Args:
+        tasks_bank (list): list of tasks.
+
+    Returns:
+        list: positions of the ready tasks in the tasks bank.
+    """
+    return [
+        i
+        for i, task in enumerate(tasks_bank)
+        if not task.COMPLETED and task.MIGRATION_TIME == 0
+    ]
+
+
+def _pop_ready_task(ready: list, rng: np.random.Generator = None) -> int:
+    """Draws a task uniformly among the ready tasks, and removes it from them in O(1):
+    the drawn task is swapped with the last ready task before being popped.
+
+    Args:
+        ready (list): positions of the ready tasks, updated in place.
+        rng (np.random.Generator): random generator, the global one if None.
+
+    Returns:
+        int: position of the drawn task.
+    """
+    if rng is None:
+        k = np.random.randint(len(ready))
+    else:
+        k = int(rng.integers(len(ready)))
+    ready[k], ready[-1] = ready[-1], ready[k]
+
+    return ready.pop()
+
+
+# number of offloading processes run in this process, and of time units they simulated
+SIMULATION_COUNTERS = {"simulations": 0, "ticks": 0}
+
+
+def count_simulations(simulations: int, ticks: int):
+    """Adds offloading processes to `SIMULATION_COUNTERS`, for those run in other processes.
+
+    Args:
+        simulations (int): number of offloading processes.
+        ticks (int): number of time units they simulated.
+    """
+    SIMULATION_COUNTERS["simulations"] += simulations
+    SIMULATION_COUNTERS["ticks"] += ticks
+
+
+def simulated_ticks(tasks_bank: list) -> int:
+    """Returns the number of time units simulated by an offloading process,
+    up to the start of the last computation.
+
+    Args:
+        tasks_bank (list): list of tasks, after `task_offloading`.
+
+    Returns:
+        int: number of time units.
+    """
+    start_times = (task.START_TIME for task in tasks_bank if task.START_TIME is not None)
+    return max(start_times, default=-1) + 1
 
 
 def task_offloading(
     tasks_bank: list,
     network: list,
+    backend: str = "tick",
+    servers: str = "single",
+    policy="migrate",
+    rng: np.random.Generator = None,
+    stats: OffloadingStats = None,
 ) -> list:
     """Offloading process of the tasks.
     The tasks are offloaded to the closest RSU to them, which has not been visited before.
-    In the end, the tasks have a history of computation times and migration times.
+    At each time unit, a task is drawn uniformly among the ready tasks (neither completed
+    nor migrating), which are kept in a list updated as the tasks complete and migrate.
+    In the end, the tasks have a history of computation times and migration times,
+    and the time at which their computation started.
 
     Args:
         tasks_bank (list): list of tasks.
         network (list): list of RSUs.
+        backend (str): "tick" to advance the time one unit at a time,
+            "event" to jump from event to event (see `event_offloading`),
+            "vectorized" to run on NumPy arrays (see `vectorized_offloading`),
+            "compiled" to run in a compiled kernel (see `compiled_offloading`).
+        servers (str): "single" for RSUs computing one task at a time, on all the VMs
+            of their ES, "multi" for RSUs computing one task per VM of their ES at the
+            same time, each VM being freed at the end of its own task.
+        policy: migration policy of the tasks whose RSU is busy, "migrate" to always
+            migrate, "queue" to wait in a bounded queue when it is faster than migrating,
+            or a policy object (see `utils.policies`).
+        rng (np.random.Generator): random generator of the draws of the ready tasks.
+            If None, the global NumPy generator is used, as before there was a choice.
+            Every backend gives the same histories for the same generator.
+        stats (OffloadingStats): statistics updated with the tasks computed by the
+            process, so that its metrics need no other pass over the tasks, or None.
 
     Returns:
         list: list of tasks with their history.
     """
+    if servers not in SERVER_MODELS:
+        raise ValueError(f"Unknown server model: {servers}")
+
+    policy = get_policy(policy)
+    if policy.queue_size > 0 and backend in ("vectorized", "compiled"):
+        raise ValueError(f"The {backend} backend only supports the always migrate policy")
+
+    if backend == "tick":
+        tasks_bank = _tick_offloading(tasks_bank, network, servers, policy, rng, stats)
+    elif backend == "event":
+        tasks_bank = event_offloading(tasks_bank, network, servers, policy, rng, stats)
+    elif backend == "vectorized":
+        tasks_bank = vectorized_offloading(tasks_bank, network, servers, rng, stats)
+    elif backend == "compiled":
+        tasks_bank = compiled_offloading(tasks_bank, network, servers, rng, stats)
+    else:
+        raise ValueError(f"Unknown offloading backend: {backend}")
+
+    count_simulations(1, simulated_ticks(tasks_bank))
+
+    return tasks_bank
+
+
+def _tick_offloading(
+    tasks_bank: list,
+    network: list,
+    servers: str,
+    policy: AlwaysMigrate,
+    rng: np.random.Generator = None,
+    stats: OffloadingStats = None,
+) -> list:
+    """Tick loop of `task_offloading`, advancing the time one unit at a time.
+
+    Args:
+        tasks_bank (list): list of tasks.
+        network (list): list of RSUs.
+        servers (str): server model of the RSUs, see `task_offloading`.
+        policy (AlwaysMigrate): migration policy, see `task_offloading`.
+        rng (np.random.Generator): random generator, see `task_offloading`.
+        stats (OffloadingStats): statistics, see `task_offloading`.
+
+    Returns:
+        list: list of tasks with their history.
+    """
+    # spatial index of the network, and positions of the RSUs visited by each task
+    index = RSUIndex(network)
+    visited = {id(task): index.positions(task.RSU_HISTORY) for task in tasks_bank}
+
+    # positions of the tasks which are neither completed nor migrating
+    ready = _ready_tasks(tasks_bank)
+    completed = sum(task.COMPLETED for task in tasks_bank)
+
     current_time = 0
 
     # while there are still tasks to be completed
-    while not all(task.COMPLETED for task in tasks_bank):
+    while completed < len(tasks_bank):
 
         # check if any task is not completed and is not migrating
-        if any(not task.COMPLETED and task.MIGRATION_TIME == 0 for task in tasks_bank):
-            # shuffle the tasks bank
-            np.random.shuffle(tasks_bank)
-            task = next(
-                task
-                for task in tasks_bank
-                if not task.COMPLETED and task.MIGRATION_TIME == 0
+        if ready:
+            i = _pop_ready_task(ready, rng)
+            task = tasks_bank[i]
+
+            computing_rsu = offload_task(
+                task, network, current_time, index, visited[id(task)], servers, policy
             )
+            if computing_rsu is not None:
+                completed += 1
+                if stats is not None:
+                    stats.add(task)
+            # a migration shorter than a time unit leaves the task ready
+            elif task.MIGRATION_TIME == 0 and not task.WAITING:
+                ready.append(i)
+
+        # check if any rsu should turn free at the current time
+        for rsu in network:
+            # the freed slots go to the tasks waiting in the queue of the rsu
+            if release_server(rsu, current_time) and rsu.QUEUE:
+                for started in _start_queued_tasks(rsu, current_time + 1, servers):
+                    completed += 1
+                    if stats is not None:
+                        stats.add(started)
+
+        # remove a time unit from the migration time of each task if the migration time is greater than 0
+        for i, task in enumerate(tasks_bank):
+            if task.MIGRATION_TIME > 0:
+                task.MIGRATION_TIME -= 1
+                if task.MIGRATION_TIME == 0:
+                    ready.append(i)
+
+        # update the current time
+        current_time += 1
+
+    return tasks_bank
 
-            # if the task was not being migrated, fin the closest rsu to the task
-            if task.RSU_HISTORY == []:
-                # get the closest rsu to the task
-                closest_rsu = get_closest_rsu(network, task, task.RSU_HISTORY)
 
-                task.RSU_HISTORY.append(closest_rsu)
+def offloading_metrics(
+    tasks_bank: list, network: list = None, servers: str = "single"
+) -> dict:
+    """Computes the metrics of an offloading process, in a single pass over the tasks.
+    The queueing delay of a task is the time it waited for a free server, that is the time
+    between its arrival and the start of its computation, minus the time it spent migrating.
 
-                # suppose the task is assigned at that rsu directly
-                task.X = closest_rsu.X
-                task.Y = closest_rsu.Y
+    Args:
+        tasks_bank (list): list of tasks, after `task_offloading`.
+        network (list): list of RSUs, the RSUs computing a task if None.
+        servers (str): server model of the RSUs, see `task_offloading`.
+
+    Returns:
+        dict: max computation time, max migration time, makespan (end time of the last task),
+            max and mean queueing delay, and the other metrics of `OffloadingStats`.
+    """
+    if network is None:
+        computing_rsus = {id(task.RSU): task.RSU for task in tasks_bank if task.RSU}
+        network = list(computing_rsus.values())
+
+    stats = OffloadingStats(network, servers)
+    for task in tasks_bank:
+        stats.add(task)
+
+    return stats.metrics()
+
+
+def event_offloading(
+    tasks_bank: list,
+    network: list,
+    servers: str = "single",
+    policy: AlwaysMigrate = None,
+    rng: np.random.Generator = None,
+    stats: OffloadingStats = None,
+) -> list:
+    """Event-driven offloading process of the tasks.
+    Same process as the tick loop of `task_offloading`, but the events (an RSU turning free,
+    a task arriving after its migration) are kept in a priority queue. When no task can be
+    offloaded, the time jumps straight to the next event instead of advancing one unit at a time.
+    The random draws are the same as the tick loop, so for a given seed both give the same histories.
+
+    Args:
+        tasks_bank (list): list of tasks.
+        network (list): list of RSUs.
+        servers (str): server model of the RSUs, see `task_offloading`.
+        policy (AlwaysMigrate): migration policy, see `task_offloading`.
+        rng (np.random.Generator): random generator, see `task_offloading`.
+        stats (OffloadingStats): statistics, see `task_offloading`.
+
+    Returns:
+        list: list of tasks with their history.
+    """
+    # spatial index of the network, and positions of the RSUs visited by each task
+    index = RSUIndex(network)
+    visited = {id(task): index.positions(task.RSU_HISTORY) for task in tasks_bank}
+
+    # priority queue of (time, sequence, object) events
+    # an RSU event frees the slots of the RSU, a task event (the position of the task in the tasks bank)
+    # ends the migration of the task
+    events = []
+    sequence = 0
+
+    # positions of the tasks which are neither completed nor migrating
+    ready = _ready_tasks(tasks_bank)
+    completed = 0
+    for i, task in enumerate(tasks_bank):
+        if task.COMPLETED:
+            completed += 1
+        elif task.MIGRATION_TIME > 0:
+            heapq.heappush(events, (task.MIGRATION_TIME, sequence, i))
+            sequence += 1
+
+    # the slots which are still busy turn free the time unit after their end time
+    for rsu in network:
+        for end_time in rsu.SLOTS:
+            heapq.heappush(events, (end_time + 1, sequence, rsu))
+            sequence += 1
+
+    current_time = 0
+
+    # while there are still tasks to be completed
+    while completed < len(tasks_bank):
+
+        # handle every event that happened before the current time
+        arrived = []
+        while events and events[0][0] <= current_time:
+            event_time, _, item = heapq.heappop(events)
+            if isinstance(item, RSU):
+                # the freed slots go to the tasks waiting in the queue of the rsu
+                if release_server(item, event_time - 1) and item.QUEUE:
+                    for started in _start_queued_tasks(item, event_time, servers):
+                        end_time = event_time + started.COMPUTATION_HISTORY
+                        heapq.heappush(events, (end_time + 1, sequence, item))
+                        sequence += 1
+                        completed += 1
+                        if stats is not None:
+                            stats.add(started)
             else:
-                # get the last rsu the task was assigned to
-                closest_rsu = task.RSU_HISTORY[-1]
-
-            # if the rsu is free and compatible with the task, compute the task
-            if is_server_free(closest_rsu) and compatible(closest_rsu, task):
-                closest_rsu.STATE = "BUSY"
-                task.COMPLETED = True
-                # if the task is of type 'COMPUTATION', compute the computation time
-                if task.TYPE == "COMPUTATION":
-                    t_computation = computation_time(
-                        task_length=task.LENGTH,
-                        vm_nb=closest_rsu.ES.VM_NB,
-                        vm_cpu=closest_rsu.ES.VM_CP,
-                    )
-                    closest_rsu.END_TIME = current_time + t_computation
-
-                    task.COMPUTATION_HISTORY = t_computation
-                # else (if the task is of type 'DATA TRANSFER'), compute the transfer time
-                elif task.TYPE == "DATA TRANSFER":
-                    t_data_transfer = data_transfer_time(
-                        file_size=task.FILE_SIZE, dtr=closest_rsu.DTR
-                    )
-                    closest_rsu.END_TIME = current_time + t_data_transfer
-                    task.COMPUTATION_HISTORY = t_data_transfer
-
-            # if the rsu is busy or incompatible with the task, migrate the task
+                tasks_bank[item].MIGRATION_TIME = 0
+                arrived.append(item)
+        # the tick loop finds the arrived tasks in the order of the tasks bank
+        ready += sorted(arrived)
+
+        # the last tasks may have been started from a queue
+        if completed == len(tasks_bank):
+            break
+
+        # if no task can be offloaded, jump to the next event
+        if not ready:
+            current_time = events[0][0]
+            continue
+
+        i = _pop_ready_task(ready, rng)
+        task = tasks_bank[i]
+
+        computing_rsu = offload_task(
+            task, network, current_time, index, visited[id(task)], servers, policy
+        )
+
+        if computing_rsu is not None:
+            completed += 1
+            if stats is not None:
+                stats.add(task)
+            end_time = current_time + task.COMPUTATION_HISTORY
+            heapq.heappush(events, (end_time + 1, sequence, computing_rsu))
+            sequence += 1
+        # a waiting task is started when a slot of its rsu is freed
+        elif task.WAITING:
+            pass
+        # a migration shorter than a time unit leaves the task ready
+        elif task.MIGRATION_TIME == 0:
+            ready.append(i)
+        else:
+            heapq.heappush(events, (current_time + task.MIGRATION_TIME, sequence, i))
+            sequence += 1
+
+        # update the current time
+        current_time += 1
+
+    # free the slots whose end time was reached during the last time unit
+    while events and events[0][0] <= current_time:
+        event_time, _, item = heapq.heappop(events)
+        release_server(item, event_time - 1)
+
+    return tasks_bank
+
+
+def online_offloading(
+    tasks,
+    network: list,
+    servers: str = "single",
+    policy="migrate",
+    stats: OffloadingStats = None,
+    rng: np.random.Generator = None,
+):
+    """Online offloading process of a stream of tasks.
+    Same process as `event_offloading`, but the tasks are read from an iterator as time
+    goes on: a task joins the ready tasks at its arrival time, and is forgotten once its
+    computation starts, only its record being kept until the computation ends. Only the
+    tasks in flight (arrived and not computed yet) and the records of the running
+    computations are kept, so a trace of any length can be replayed, for instance with
+    `stream_tasks`. When all the tasks arrive at time 0, the histories are the ones of
+    `event_offloading`.
+
+    Args:
+        tasks (iterable): tasks sorted by ARRIVAL, a task arriving late arrives
+            at the current time.
+        network (list): list of RSUs.
+        servers (str): server model of the RSUs, see `task_offloading`.
+        policy: migration policy of the tasks, see `task_offloading`.
+        stats (OffloadingStats): statistics updated as the computations start, or None.
+        rng (np.random.Generator): random generator, see `task_offloading`.
+
+    Yields:
+        dict: record of each task when its computation ends, in order of end time,
+            see `_task_record`.
+    """
+    if servers not in SERVER_MODELS:
+        raise ValueError(f"Unknown server model: {servers}")
+    policy = get_policy(policy)
+
+    # spatial index of the network
+    index = RSUIndex(network)
+
+    tasks = iter(tasks)
+    next_task = next(tasks, None)
+
+    # tasks in flight and positions of the RSUs they visited, by order of arrival
+    in_flight = {}
+    visited = {}
+    numbers = {}
+    number = 0
+
+    # priority queue of (time, sequence, object) events
+    # an RSU event frees the slots of the RSU, a task event (the order of arrival of the task)
+    # ends the migration of the task, a completion event (the record of a task) yields it
+    events = []
+    sequence = 0
+
+    # the slots which are still busy turn free the time unit after their end time
+    for rsu in network:
+        for end_time in rsu.SLOTS:
+            heapq.heappush(events, (end_time + 1, sequence, rsu))
+            sequence += 1
+
+    # orders of arrival of the tasks which are neither computed nor migrating
+    ready = []
+    current_time = 0
+
+    while True:
+
+        # handle every event that happened before the current time
+        arrived = []
+        while events and events[0][0] <= current_time:
+            event_time, _, item = heapq.heappop(events)
+            if isinstance(item, RSU):
+                # the freed slots go to the tasks waiting in the queue of the rsu
+                if release_server(item, event_time - 1) and item.QUEUE:
+                    for started in _start_queued_tasks(item, event_time, servers):
+                        end_time = event_time + started.COMPUTATION_HISTORY
+                        heapq.heappush(events, (end_time + 1, sequence, item))
+                        sequence += 1
+                        started_number = numbers.pop(id(started))
+                        del in_flight[started_number], visited[started_number]
+                        if stats is not None:
+                            stats.add(started)
+                        heapq.heappush(
+                            events, (end_time, sequence, _task_record(started, item))
+                        )
+                        sequence += 1
+            elif isinstance(item, dict):
+                yield item
             else:
-                # find the closest rsu to the task
-                closest_rsu = get_closest_rsu(network, task, task.RSU_HISTORY)
+                in_flight[item].MIGRATION_TIME = 0
+                arrived.append(item)
+        # the migrated tasks are ready in their order of arrival
+        ready += sorted(arrived)
 
-                # add the closest rsu to the history of the task
-                task.RSU_HISTORY.append(closest_rsu)
+        # the tasks created before the current time arrive
+        while next_task is not None and next_task.ARRIVAL <= current_time:
+            in_flight[number] = next_task
+            visited[number] = set()
+            numbers[id(next_task)] = number
+            ready.append(number)
+            number += 1
+            next_task = next(tasks, None)
 
-                # compute the migration time
-                t_migration = migration_time(
-                    file_size=task.FILE_SIZE,
-                    distance=distance(task, closest_rsu),
-                    dtr=closest_rsu.DTR,
-                )
+        # stop when all the tasks arrived and were computed
+        if not in_flight and next_task is None:
+            break
 
-                # update the migration time of the task
-                task.MIGRATION_TIME = t_migration
-                # keep a record of the total migration time of the task
-                task.MIGRATION_HISTORY += t_migration
+        # if no task can be offloaded, jump to the next event or arrival
+        if not ready:
+            next_times = [events[0][0]] if events else []
+            if next_task is not None:
+                next_times.append(next_task.ARRIVAL)
+            current_time = max(current_time + 1, min(next_times))
+            continue
 
-                # update the coordinates of the task for when it will be migrated
-                task.X = closest_rsu.X
-                task.Y = closest_rsu.Y
+        i = _pop_ready_task(ready, rng)
+        task = in_flight[i]
 
-        # check if any rsu should turn free at the current time
-        for rsu in network:
-            if rsu.STATE == "BUSY" and rsu.END_TIME == current_time:
-                rsu.STATE = "IDLE"
-                rsu.END_TIME = 0
+        computing_rsu = offload_task(
+            task, network, current_time, index, visited[i], servers, policy
+        )
 
-        # remove a time unit from the migration time of each task if the migration time is greater than 0
-        for task in tasks_bank:
-            if task.MIGRATION_TIME > 0:
-                task.MIGRATION_TIME -= 1
+        if computing_rsu is not None:
+            end_time = current_time + task.COMPUTATION_HISTORY
+            heapq.heappush(events, (end_time + 1, sequence, computing_rsu))
+            sequence += 1
+            del in_flight[i], visited[i], numbers[id(task)]
+            if stats is not None:
+                stats.add(task)
+            heapq.heappush(
+                events, (end_time, sequence, _task_record(task, computing_rsu))
+            )
+            sequence += 1
+        # a waiting task is started when a slot of its rsu is freed
+        elif task.WAITING:
+            pass
+        # a migration shorter than a time unit leaves the task ready
+        elif task.MIGRATION_TIME == 0:
+            ready.append(i)
+        else:
+            heapq.heappush(events, (current_time + task.MIGRATION_TIME, sequence, i))
+            sequence += 1
+
+        # update the current time
+        current_time += 1
 
-        # if a task has gone through all the RSU, reset its history
-        for task in tasks_bank:
-            if len(task.RSU_HISTORY) == len(network):
-                task.RSU_HISTORY = []
+    # the computations still running end in order of end time
+    while events:
+        _, _, item = heapq.heappop(events)
+        if isinstance(item, dict):
+            yield item
+
+
+def _task_record(task, rsu: RSU) -> dict:
+    """Returns the record of a task whose computation started.
+
+    Args:
+        task (Task): task being computed.
+        rsu (RSU): RSU computing the task.
+
+    Returns:
+        dict: ID, ARRIVAL, START_TIME and END_TIME of the task, its COMPUTATION_HISTORY
+            and MIGRATION_HISTORY, and the ID of the RSU computing it.
+    """
+    return {
+        "ID": task.ID,
+        "ARRIVAL": task.ARRIVAL,
+        "START_TIME": task.START_TIME,
+        "END_TIME": task.START_TIME + task.COMPUTATION_HISTORY,
+        "COMPUTATION_HISTORY": task.COMPUTATION_HISTORY,
+        "MIGRATION_HISTORY": task.MIGRATION_HISTORY,
+        "RSU": rsu.ID,
+    }
+
+
+def _closest_rsu_index(network: NetworkArrays, x, y, visited: np.ndarray) -> tuple:
+    """Returns the index of the closest RSU to a point, among the RSUs not visited.
+
+    Args:
+        network (NetworkArrays): network of RSUs.
+        x: X coordinate of the point.
+        y: Y coordinate of the point.
+        visited (np.ndarray): mask of the RSUs to be excluded from the search.
+
+    Returns:
+        tuple: index of the closest RSU and its distance to the point.
+    """
+    distances = np.sqrt((network.X - x) ** 2 + (network.Y - y) ** 2)
+    distances[visited] = math.inf
+    # argmin keeps the first RSU of the network in case of a tie, like get_closest_rsu
+    closest = int(np.argmin(distances))
+
+    return closest, distances[closest]
+
+
+def _offload_task_arrays(
+    i: int, tasks: TaskArrays, network: NetworkArrays, current_time: int
+):
+    """Offloads the task i at the current time, see `offload_task`.
+
+    Args:
+        i (int): index of the task in the task arrays.
+        tasks (TaskArrays): state of the tasks.
+        network (NetworkArrays): state of the network.
+        current_time (int): current time of the offloading process.
+    """
+    # if the task was not being migrated, find the closest rsu to the task
+    if tasks.HOPS[i] == 0:
+        j, _ = _closest_rsu_index(network, tasks.X[i], tasks.Y[i], tasks.VISITED[i])
+        tasks.RSU_HISTORY[i, 0] = j
+        tasks.VISITED[i, j] = True
+        tasks.HOPS[i] = 1
+
+        # suppose the task is assigned at that rsu directly
+        tasks.X[i] = network.X[j]
+        tasks.Y[i] = network.Y[j]
+    else:
+        # get the last rsu the task was assigned to
+        j = tasks.RSU_HISTORY[i, tasks.HOPS[i] - 1]
+
+    is_compatible = (network.HAS_ES[j] and tasks.TYPE[i] == COMPUTATION) or (
+        not network.HAS_ES[j] and tasks.TYPE[i] == DATA_TRANSFER
+    )
+
+    # if the rsu is free and compatible with the task, compute the task
+    if not network.BUSY[j] and is_compatible:
+        tasks.COMPLETED[i] = True
+        tasks.START_TIME[i] = current_time
+        tasks.RSU[i] = j
+        if tasks.TYPE[i] == COMPUTATION:
+            t_computation = computation_time(
+                task_length=tasks.LENGTH[i],
+                vm_nb=network.TASK_VMS[j],
+                vm_cpu=network.VM_CP[j],
+            )
+        else:
+            t_computation = data_transfer_time(
+                file_size=tasks.FILE_SIZE[i], dtr=network.DTR[j]
+            )
+        network.occupy(j, current_time + t_computation)
+        tasks.COMPUTATION_HISTORY[i] = t_computation
+
+    # if the rsu is busy or incompatible with the task, migrate the task
+    else:
+        k, distance_to_rsu = _closest_rsu_index(
+            network, tasks.X[i], tasks.Y[i], tasks.VISITED[i]
+        )
+        tasks.RSU_HISTORY[i, tasks.HOPS[i]] = k
+        tasks.VISITED[i, k] = True
+        tasks.HOPS[i] += 1
+
+        t_migration = migration_time(
+            file_size=tasks.FILE_SIZE[i],
+            distance=distance_to_rsu,
+            dtr=network.DTR[k],
+        )
+        tasks.MIGRATION_TIME[i] = t_migration
+        tasks.MIGRATION_HISTORY[i] += t_migration
+        tasks.MIGRATIONS[i] += 1
+
+        # update the coordinates of the task for when it will be migrated
+        tasks.X[i] = network.X[k]
+        tasks.Y[i] = network.Y[k]
+
+    # if the task has gone through all the RSU, reset its history
+    if tasks.HOPS[i] == len(network):
+        tasks.HOPS[i] = 0
+        tasks.VISITED[i] = False
+
+
+def vectorized_offloading(
+    tasks_bank: list,
+    network: list,
+    servers: str = "single",
+    rng: np.random.Generator = None,
+    stats: OffloadingStats = None,
+) -> list:
+    """Offloading process of the tasks on NumPy arrays.
+    Same process as the tick loop of `task_offloading`, but the state of the tasks and RSUs
+    is kept in struct-of-arrays form (see `utils.state`), so the per tick updates
+    are single array operations. The random draws are the same as the tick loop, so for a
+    given seed both give the same histories. The state is copied back to the objects at the end.
+
+    Args:
+        tasks_bank (list): list of tasks.
+        network (list): list of RSUs.
+        servers (str): server model of the RSUs, see `task_offloading`.
+        rng (np.random.Generator): random generator, see `task_offloading`.
+        stats (OffloadingStats): statistics, updated as the state is copied back, see
+            `task_offloading`.
+
+    Returns:
+        list: list of tasks with their history.
+    """
+    rsus = NetworkArrays(network, servers)
+    tasks = TaskArrays(tasks_bank, rsus)
+
+    # indices of the tasks which are neither completed nor migrating
+    ready = np.flatnonzero(~tasks.COMPLETED & (tasks.MIGRATION_TIME == 0)).tolist()
+    completed = int(tasks.COMPLETED.sum())
+
+    current_time = 0
+
+    # while there are still tasks to be completed
+    while completed < len(tasks):
+
+        # check if any task is not completed and is not migrating
+        if ready:
+            i = _pop_ready_task(ready, rng)
+
+            _offload_task_arrays(i, tasks, rsus, current_time)
+            if tasks.COMPLETED[i]:
+                completed += 1
+            # a migration shorter than a time unit leaves the task ready
+            elif tasks.MIGRATION_TIME[i] == 0:
+                ready.append(i)
+
+        # free the slots whose end time is the current time
+        rsus.release(current_time)
+
+        # remove a time unit from the migration time of the migrating tasks
+        arrived = np.flatnonzero(tasks.MIGRATION_TIME == 1)
+        np.subtract(
+            tasks.MIGRATION_TIME,
+            1,
+            out=tasks.MIGRATION_TIME,
+            where=tasks.MIGRATION_TIME > 0,
+        )
+        ready += arrived.tolist()
 
         # update the current time
         current_time += 1
 
+    rsus.write_back()
+    tasks_bank[:] = tasks.write_back(rsus, stats)
+
     return tasks_bank
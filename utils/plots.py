@@ -1,7 +1,18 @@
+import itertools
+import math
+
 import matplotlib.pyplot as plt
 import pandas as pd
 
-from utils.nsgaii import chromosome_to_network
+from utils.nsgaii import (
+    OBJECTIVES,
+    chromosome_to_network,
+    objective_name,
+    parse_objectives,
+)
+
+# labels of the axes of the metrics
+LABELS = {"computation": "Max Computation Time", "migration": "Max Migration Time"}
 
 
 def plot_network(network: list, tasks: list):
@@ -37,9 +48,9 @@ def plot_network(network: list, tasks: list):
     return plt.show()
 
 
-def plot_solution(solution, tasks: list):
+def plot_solution(solution, tasks: list, scenario):
 
-    network = chromosome_to_network(solution.chromosome)
+    network = chromosome_to_network(solution.chromosome, scenario)
 
     # make the plot bigger
     plt.figure(figsize=(6, 6))
@@ -80,28 +91,58 @@ def plot_pareto(
     TOURNAMENT_SIZE,
     CROSSOVER_PROBABILITY,
     MUTATION_PROBABILITY,
+    objectives=OBJECTIVES,
+    labels=None,
 ):
-    # make the plot bigger
-    plt.figure(figsize=(5, 5))
-
-    # plot the fitness values of the final population
-    # change the color for each rank value
-    for individual in population:
-        if individual.rank != 1:
-            plt.scatter(individual.fitness[0], individual.fitness[1], color="orange")
+    # names of the objectives, the fitness values are in the same order, the functions
+    # are named after their code unless they are given a label
+    metrics, _ = parse_objectives(objectives)
+    if labels is None:
+        labels = [objective_name(metric) for metric in metrics]
+        labels = [LABELS.get(label, label) for label in labels]
+    elif len(labels) != len(metrics):
+        raise ValueError(f"Expected {len(metrics)} labels, got {len(labels)}")
+
+    # one plot for each pair of objectives
+    if len(metrics) < 2:
+        raise ValueError("A Pareto front needs at least two objectives")
+    pairs = list(itertools.combinations(range(len(metrics)), 2))
+    columns = min(len(pairs), 3)
+    rows = math.ceil(len(pairs) / columns)
 
-    for individual in population:
-        if individual.rank == 1:
-            plt.scatter(individual.fitness[0], individual.fitness[1], color="green")
+    # make the plot bigger
+    figure, axes = plt.subplots(
+        rows, columns, figsize=(5 * columns, 5 * rows), squeeze=False
+    )
 
-    # label the axes
-    plt.xlabel("Max Computation Time")
-    plt.ylabel("Max Migration Time")
+    for (first, second), ax in zip(pairs, axes.flat):
+        # plot the fitness values of the final population
+        # change the color for each rank value
+        for individual in population:
+            if individual.rank != 1:
+                ax.scatter(
+                    individual.fitness[first], individual.fitness[second], color="orange"
+                )
+
+        for individual in population:
+            if individual.rank == 1:
+                ax.scatter(
+                    individual.fitness[first], individual.fitness[second], color="green"
+                )
+
+        # label the axes
+        ax.set_xlabel(labels[first])
+        ax.set_ylabel(labels[second])
+
+    # hide the unused plots
+    for ax in axes.flat[len(pairs) :]:
+        ax.set_visible(False)
 
     # title the plot
-    plt.title(
+    figure.suptitle(
         f"Pareto front with:\nPOPULATION={POPULATION_SIZE}, GENERATIONS={MAX_GENERATIONS}, TOURNAMENT={TOURNAMENT_SIZE}\nCROSSOVER={CROSSOVER_PROBABILITY}, MUTATION={MUTATION_PROBABILITY}"
     )
+    figure.tight_layout()
 
     # show the plot
     return plt.show()
@@ -0,0 +1,98 @@
+import heapq
+
+from .main import server_capacity, service_time
+
+
+class AlwaysMigrate:
+    """Migration policy of the original offloading process: a task whose RSU is busy
+    always migrates to the closest RSU it has not visited yet. The RSUs have no queue.
+
+    Attributes:
+        queue_size (int): maximum number of tasks waiting at an RSU.
+    """
+
+    queue_size = 0
+
+    def wait(self, task, rsu, wait_time: int, migration_time: int) -> bool:
+        """Decides if a task waits in the queue of its busy RSU instead of migrating.
+
+        Args:
+            task (Task): task which cannot be computed right away.
+            rsu (RSU): busy RSU the task is on, compatible with the task.
+            wait_time (int): predicted time until the task is computed by the RSU.
+            migration_time (int): predicted time of the migration to the next RSU.
+
+        Returns:
+            bool: True to wait in the queue of the RSU, False to migrate.
+        """
+        return False
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+
+class WaitIfFaster(AlwaysMigrate):
+    """Migration policy with bounded FIFO queues: a task whose RSU is busy waits in the
+    queue of the RSU if its predicted wait is not longer than the predicted migration,
+    and if the queue is not full.
+
+    Attributes:
+        queue_size (int): maximum number of tasks waiting at an RSU.
+    """
+
+    def __init__(self, queue_size: int = 4):
+        self.queue_size = queue_size
+
+    def wait(self, task, rsu, wait_time: int, migration_time: int) -> bool:
+        return wait_time <= migration_time
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(queue_size={self.queue_size})"
+
+
+# migration policies, by name
+POLICIES = {"migrate": AlwaysMigrate, "queue": WaitIfFaster}
+
+
+def get_policy(policy):
+    """Returns a migration policy from its name, see `POLICIES`.
+
+    Args:
+        policy: name of the policy, or a policy object, returned as is.
+
+    Returns:
+        AlwaysMigrate: the policy.
+    """
+    if not isinstance(policy, str):
+        return policy
+
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown migration policy: {policy}")
+
+    return POLICIES[policy]()
+
+
+def predicted_wait(rsu, task, current_time: int, servers: str = "single") -> int:
+    """Predicts how long a task would wait at the end of the queue of a busy RSU.
+    The slots of the RSU are freed at the end of their tasks, and given to the tasks
+    of the queue in order, so the prediction is exact as long as the tasks keep their place.
+
+    Args:
+        rsu (RSU): busy RSU.
+        task (Task): task to be queued.
+        current_time (int): current time of the offloading process.
+        servers (str): server model of the RSUs, see `task_offloading`.
+
+    Returns:
+        int: time between the current time and the start of the computation of the task.
+    """
+    # times at which the slots can take a new task, the time unit after their end
+    free_times = [end_time + 1 for end_time in rsu.SLOTS]
+    free_times += [current_time] * (server_capacity(rsu, servers) - len(free_times))
+    heapq.heapify(free_times)
+
+    for queued_task in rsu.QUEUE:
+        start_time = heapq.heappop(free_times)
+        heapq.heappush(free_times, start_time + service_time(rsu, queued_task, servers) + 1)
+
+    return max(free_times[0], current_time) - current_time
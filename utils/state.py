@@ -0,0 +1,232 @@
+import numpy as np
+
+from .main import server_capacity, task_vms
+from .metrics import OffloadingStats
+
+
+# codes of the task types in the task arrays
+DATA_TRANSFER = 0
+COMPUTATION = 1
+TASK_TYPES = {"DATA TRANSFER": DATA_TRANSFER, "COMPUTATION": COMPUTATION}
+
+
+class NetworkArrays:
+    """Struct-of-arrays state of a network of RSUs.
+
+    Attributes:
+        X (np.ndarray): X coordinate of each RSU.
+        Y (np.ndarray): Y coordinate of each RSU.
+        DTR (np.ndarray): data transfer rate of each RSU.
+        HAS_ES (np.ndarray): True if the RSU is connected to an ES, False if it is an AP.
+        VM_NB (np.ndarray): number of VMs of the ES of each RSU, 0 for APs.
+        VM_CP (np.ndarray): CPU capacity of the VMs of the ES of each RSU, 0 for APs.
+        TASK_VMS (np.ndarray): number of VMs computing a single task on each RSU, 0 for APs.
+        CAPACITY (np.ndarray): number of tasks each RSU can compute at the same time.
+        SLOTS (np.ndarray): (M, max CAPACITY) end times of the tasks computed by each RSU,
+            -1 for the free slots.
+        BUSY (np.ndarray): True if all the slots of the RSU are busy.
+        END_TIME (np.ndarray): time at which all the slots of each RSU turn free,
+            -1 if it never was busy.
+    """
+
+    def __init__(self, network: list, servers: str = "single"):
+        self.rsus = list(network)
+        self.X = np.array([rsu.X for rsu in network])
+        self.Y = np.array([rsu.Y for rsu in network])
+        self.DTR = np.array([rsu.DTR for rsu in network])
+        self.HAS_ES = np.array([rsu.ES != "AP" for rsu in network], dtype=bool)
+        self.VM_NB = np.array(
+            [rsu.ES.VM_NB if rsu.ES != "AP" else 0 for rsu in network], dtype=np.int64
+        )
+        self.VM_CP = np.array(
+            [rsu.ES.VM_CP if rsu.ES != "AP" else 0 for rsu in network], dtype=np.int64
+        )
+        self.TASK_VMS = np.array(
+            [task_vms(rsu, servers) if rsu.ES != "AP" else 0 for rsu in network],
+            dtype=np.int64,
+        )
+        self.CAPACITY = np.array(
+            [server_capacity(rsu, servers) for rsu in network], dtype=np.int64
+        )
+        self.SLOTS = np.full(
+            (len(network), max(self.CAPACITY, default=1)), -1, dtype=np.int64
+        )
+        for j, rsu in enumerate(network):
+            self.SLOTS[j, : len(rsu.SLOTS)] = rsu.SLOTS
+        self.BUSY = np.array([rsu.STATE == "BUSY" for rsu in network], dtype=bool)
+        self.END_TIME = np.array(
+            [-1 if rsu.END_TIME is None else rsu.END_TIME for rsu in network],
+            dtype=np.int64,
+        )
+
+    def __len__(self) -> int:
+        return len(self.rsus)
+
+    def occupy(self, j: int, end_time: int):
+        """Starts a task on a free slot of an RSU, see `occupy_server`.
+
+        Args:
+            j (int): index of the RSU.
+            end_time (int): time at which the task ends.
+        """
+        # the busy slots of an RSU are always among its first CAPACITY slots
+        self.SLOTS[j, np.argmax(self.SLOTS[j] < 0)] = end_time
+        self.END_TIME[j] = max(self.END_TIME[j], end_time)
+        if (self.SLOTS[j] >= 0).sum() >= self.CAPACITY[j]:
+            self.BUSY[j] = True
+
+    def release(self, current_time: int):
+        """Frees the slots whose task ends at or before the current time, see `release_server`.
+
+        Args:
+            current_time (int): current time of the offloading process.
+        """
+        released = (self.SLOTS >= 0) & (self.SLOTS <= current_time)
+        if not released.any():
+            return
+
+        self.SLOTS[released] = -1
+        rsus = released.any(axis=1)
+        self.BUSY[rsus] = False
+        self.END_TIME[rsus & (self.SLOTS < 0).all(axis=1)] = 0
+
+    def write_back(self):
+        """Copies the state of the arrays back to the RSU objects."""
+        # converting whole arrays to lists is much cheaper than indexing them per RSU
+        for rsu, busy, end_time, slots in zip(
+            self.rsus, self.BUSY.tolist(), self.END_TIME.tolist(), self.SLOTS.tolist()
+        ):
+            rsu.STATE = "BUSY" if busy else "IDLE"
+            rsu.END_TIME = None if end_time == -1 else end_time
+            rsu.SLOTS = sorted(slot for slot in slots if slot >= 0)
+
+
+class TaskArrays:
+    """Struct-of-arrays state of a bank of tasks offloaded on a network.
+
+    Attributes:
+        LENGTH (np.ndarray): length of each task in MI.
+        FILE_SIZE (np.ndarray): file size of each task in megabytes.
+        TYPE (np.ndarray): type code of each task, see `TASK_TYPES`.
+        X (np.ndarray): current X coordinate of each task.
+        Y (np.ndarray): current Y coordinate of each task.
+        COMPLETED (np.ndarray): True if the task is completed.
+        MIGRATION_TIME (np.ndarray): remaining migration time of each task.
+        MIGRATION_HISTORY (np.ndarray): total migration time of each task.
+        MIGRATIONS (np.ndarray): number of migrations of each task.
+        COMPUTATION_HISTORY (np.ndarray): computation time of each task.
+        START_TIME (np.ndarray): time at which each task started to be computed,
+            -1 if it was not.
+        RSU (np.ndarray): index of the RSU computing each task, -1 if there is none.
+        RSU_HISTORY (np.ndarray): (N, M) indices of the RSUs visited by each task, in order.
+        HOPS (np.ndarray): number of valid entries of each row of RSU_HISTORY.
+        VISITED (np.ndarray): (N, M) mask of the RSUs visited by each task.
+    """
+
+    def __init__(self, tasks_bank: list, network: NetworkArrays):
+        self.tasks = list(tasks_bank)
+        n, m = len(tasks_bank), len(network)
+        position = {id(rsu): j for j, rsu in enumerate(network.rsus)}
+
+        self.LENGTH = np.array([task.LENGTH for task in tasks_bank])
+        self.FILE_SIZE = np.array([task.FILE_SIZE for task in tasks_bank])
+        self.TYPE = np.array(
+            [TASK_TYPES.get(task.TYPE, -1) for task in tasks_bank], dtype=np.int8
+        )
+        self.X = np.array([task.X for task in tasks_bank])
+        self.Y = np.array([task.Y for task in tasks_bank])
+        # the tasks move to the coordinates of the RSUs, so both share a dtype
+        coordinates_dtype = np.result_type(self.X, self.Y, network.X, network.Y)
+        self.X = self.X.astype(coordinates_dtype)
+        self.Y = self.Y.astype(coordinates_dtype)
+        self.COMPLETED = np.array([task.COMPLETED for task in tasks_bank], dtype=bool)
+        self.MIGRATION_TIME = np.array(
+            [task.MIGRATION_TIME for task in tasks_bank], dtype=np.int64
+        )
+        self.MIGRATION_HISTORY = np.array(
+            [task.MIGRATION_HISTORY for task in tasks_bank], dtype=np.int64
+        )
+        self.COMPUTATION_HISTORY = np.array(
+            [task.COMPUTATION_HISTORY for task in tasks_bank], dtype=np.int64
+        )
+        self.MIGRATIONS = np.array(
+            [task.MIGRATIONS for task in tasks_bank], dtype=np.int64
+        )
+
+        self.START_TIME = np.array(
+            [-1 if task.START_TIME is None else task.START_TIME for task in tasks_bank],
+            dtype=np.int64,
+        )
+        self.RSU = np.array(
+            [-1 if task.RSU is None else position[id(task.RSU)] for task in tasks_bank],
+            dtype=np.int64,
+        )
+
+        self.RSU_HISTORY = np.zeros((n, m), dtype=np.int64)
+        self.HOPS = np.zeros(n, dtype=np.int64)
+        self.VISITED = np.zeros((n, m), dtype=bool)
+        for i, task in enumerate(tasks_bank):
+            for rsu in task.RSU_HISTORY:
+                self.RSU_HISTORY[i, self.HOPS[i]] = position[id(rsu)]
+                self.VISITED[i, position[id(rsu)]] = True
+                self.HOPS[i] += 1
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def write_back(self, network: NetworkArrays, stats: OffloadingStats = None) -> list:
+        """Copies the state of the arrays back to the Task objects.
+
+        Args:
+            network (NetworkArrays): network the tasks were offloaded on.
+            stats (OffloadingStats): statistics updated with the tasks which were not
+                completed before the arrays were built, or None.
+
+        Returns:
+            list: list of tasks.
+        """
+        rsus = network.rsus
+        # converting whole arrays to lists is much cheaper than indexing them per task
+        for (
+            task,
+            x,
+            y,
+            completed,
+            migration_time,
+            migration_history,
+            computation_history,
+            migrations,
+            start_time,
+            rsu,
+            history,
+            hops,
+        ) in zip(
+            self.tasks,
+            self.X.tolist(),
+            self.Y.tolist(),
+            self.COMPLETED.tolist(),
+            self.MIGRATION_TIME.tolist(),
+            self.MIGRATION_HISTORY.tolist(),
+            self.COMPUTATION_HISTORY.tolist(),
+            self.MIGRATIONS.tolist(),
+            self.START_TIME.tolist(),
+            self.RSU.tolist(),
+            self.RSU_HISTORY.tolist(),
+            self.HOPS.tolist(),
+        ):
+            # the objects still hold the state from before the offloading
+            started = completed and not task.COMPLETED
+            task.X = x
+            task.Y = y
+            task.COMPLETED = completed
+            task.MIGRATION_TIME = migration_time
+            task.MIGRATION_HISTORY = migration_history
+            task.COMPUTATION_HISTORY = computation_history
+            task.MIGRATIONS = migrations
+            task.START_TIME = None if start_time == -1 else start_time
+            task.RSU = None if rsu == -1 else rsus[rsu]
+            task.RSU_HISTORY = [rsus[j] for j in history[:hops]]
+            if started and stats is not None:
+                stats.add(task)
+
+        return list(self.tasks)